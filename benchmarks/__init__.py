@@ -0,0 +1 @@
+"""Performance benchmarks for ipyannotations, run with airspeed velocity."""
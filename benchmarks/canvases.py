@@ -0,0 +1,123 @@
+"""Benchmarks for drawing, hit-testing and data handling on the canvases."""
+from ipyannotations.images.canvases import (
+    BoundingBoxAnnotationCanvas,
+    PointAnnotationCanvas,
+    PolygonAnnotationCanvas,
+)
+from ipyannotations.images.canvases.recording import CanvasRecorder
+
+from . import common
+
+N_SHAPES = [10, 100, 1000, 10000]
+
+CANVASES = {
+    "polygon": (PolygonAnnotationCanvas, common.polygon_data),
+    "box": (BoundingBoxAnnotationCanvas, common.box_data),
+    "point": (PointAnnotationCanvas, common.point_data),
+}
+
+
+class _CanvasBenchmark:
+
+    params = (list(CANVASES), N_SHAPES)
+    param_names = ["canvas", "n_shapes"]
+    timeout = 300
+
+    def setup(self, canvas_type, n_shapes):
+        canvas_class, make_data = CANVASES[canvas_type]
+        self.canvas = canvas_class(classes=["a"])
+        self.canvas.load_image(common.image_widget(0.35))
+        self.serialised_data = make_data(n_shapes)
+        self.canvas.data = self.serialised_data
+
+
+class ReDraw(_CanvasBenchmark):
+    """Time re-drawing all annotations, and count the commands it sends."""
+
+    def time_re_draw(self, canvas_type, n_shapes):
+        self.canvas.re_draw()
+
+    def time_toggle_editing(self, canvas_type, n_shapes):
+        # toggling editing mode re-draws the annotations with their handles
+        self.canvas.editing = not self.canvas.editing
+
+    def track_re_draw_commands(self, canvas_type, n_shapes):
+        with CanvasRecorder(self.canvas) as recording:
+            self.canvas.re_draw()
+        return recording.n_commands
+
+    track_re_draw_commands.unit = "commands"
+
+    def track_re_draw_bytes(self, canvas_type, n_shapes):
+        with CanvasRecorder(self.canvas) as recording:
+            self.canvas.re_draw()
+        return recording.nbytes
+
+    track_re_draw_bytes.unit = "bytes"
+
+
+class HitTest(_CanvasBenchmark):
+    """Time clicks in editing mode, which look for a point to drag."""
+
+    def setup(self, canvas_type, n_shapes):
+        super().setup(canvas_type, n_shapes)
+        self.canvas.editing = True
+        # the bottom right of the canvas is outside all generated shapes:
+        self.miss = (self.canvas.image_extent[2], self.canvas.image_extent[3])
+
+    def time_click_miss(self, canvas_type, n_shapes):
+        self.canvas.on_click(*self.miss)
+        self.canvas.on_release(*self.miss)
+
+    def time_click_drag_release(self, canvas_type, n_shapes):
+        x, y = self.canvas.image_to_canvas_coordinates(
+            _first_point(self.serialised_data[-1])
+        )
+        self.canvas.on_click(x, y)
+        self.canvas.on_drag(x + 1, y + 1)
+        self.canvas.on_release(x + 1, y + 1)
+
+
+class InteractionPayload(_CanvasBenchmark):
+    """Track what a single click sends to the frontend."""
+
+    def track_click_commands(self, canvas_type, n_shapes):
+        with CanvasRecorder(self.canvas) as recording:
+            self._click()
+        return recording.n_commands
+
+    track_click_commands.unit = "commands"
+
+    def track_click_bytes(self, canvas_type, n_shapes):
+        with CanvasRecorder(self.canvas) as recording:
+            self._click()
+        return recording.nbytes
+
+    track_click_bytes.unit = "bytes"
+
+    def _click(self):
+        x, y = self.canvas.image_to_canvas_coordinates((10, 10))
+        self.canvas.on_click(x, y)
+        self.canvas.on_release(x, y)
+
+
+class DataRoundTrip(_CanvasBenchmark):
+    """Time getting and setting the annotation data."""
+
+    def time_get_data(self, canvas_type, n_shapes):
+        self.canvas.data
+
+    def time_set_data(self, canvas_type, n_shapes):
+        self.canvas.data = self.serialised_data
+
+    def time_round_trip(self, canvas_type, n_shapes):
+        self.canvas.data = self.canvas.data
+
+
+def _first_point(annotation: dict):
+    if annotation["type"] == "polygon":
+        return annotation["points"][0]
+    elif annotation["type"] == "box":
+        return annotation["xyxy"][:2]
+    else:
+        return annotation["coordinates"]
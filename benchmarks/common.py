@@ -0,0 +1,93 @@
+"""Synthetic datasets and helpers shared by the benchmarks."""
+import io
+from typing import List
+
+import ipywidgets as widgets
+import numpy as np
+from PIL import Image
+
+#: The random seed used for all synthetic data, so runs are comparable.
+SEED = 42
+
+#: The aspect ratio (width / height) of synthetic images.
+ASPECT_RATIO = 4 / 3
+
+
+def image_shape(megapixels: float) -> tuple:
+    """The (height, width, 3) shape of an image with a given pixel count."""
+    height = int((megapixels * 1e6 / ASPECT_RATIO) ** 0.5)
+    width = int(height * ASPECT_RATIO)
+    return (height, width, 3)
+
+
+def image_array(megapixels: float) -> np.ndarray:
+    """A smooth image with some noise, which compresses like a photo."""
+    height, width, _ = image_shape(megapixels)
+    rng = np.random.default_rng(SEED)
+    gradient = np.add.outer(
+        np.linspace(0, 127, height, dtype=np.float32),
+        np.linspace(0, 127, width, dtype=np.float32),
+    )
+    array = np.empty((height, width, 3), dtype=np.uint8)
+    for channel in range(3):
+        noise = rng.integers(0, 16, size=(height, width), dtype=np.uint8)
+        array[..., channel] = gradient.astype(np.uint8) + noise
+    return array
+
+
+def jpeg_bytes(megapixels: float) -> bytes:
+    """A JPEG encoded synthetic image."""
+    buffer = io.BytesIO()
+    Image.fromarray(image_array(megapixels)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def image_widget(megapixels: float) -> widgets.Image:
+    """A synthetic image, as an image widget."""
+    return widgets.Image(value=jpeg_bytes(megapixels), format="jpg")
+
+
+def polygon_data(
+    n_shapes: int, points_per_shape: int = 8, size=(700, 500)
+) -> List[dict]:
+    """Closed polygons scattered over an image of a given size."""
+    rng = np.random.default_rng(SEED)
+    centres = rng.uniform((0, 0), size, size=(n_shapes, 2))
+    angles = np.linspace(0, 2 * np.pi, points_per_shape, endpoint=False)
+    radii = rng.uniform(5, 30, size=(n_shapes, 1))
+    xs = np.clip(centres[:, :1] + radii * np.cos(angles), 0, size[0])
+    ys = np.clip(centres[:, 1:] + radii * np.sin(angles), 0, size[1])
+    data = []
+    for x, y in zip(xs.round().astype(int), ys.round().astype(int)):
+        points = list(zip(x.tolist(), y.tolist()))
+        data.append(
+            {
+                "type": "polygon",
+                "label": "a",
+                "points": points + [points[0]],
+            }
+        )
+    return data
+
+
+def box_data(n_shapes: int, size=(700, 500)) -> List[dict]:
+    """Bounding boxes scattered over an image of a given size."""
+    rng = np.random.default_rng(SEED)
+    x0y0 = rng.uniform((0, 0), size, size=(n_shapes, 2))
+    wh = rng.uniform(5, 50, size=(n_shapes, 2))
+    x1y1 = np.minimum(x0y0 + wh, size)
+    xyxy = np.concatenate([x0y0, x1y1], axis=1).round().astype(int)
+    return [
+        {"type": "box", "label": "a", "xyxy": tuple(row)}
+        for row in xyxy.tolist()
+    ]
+
+
+def point_data(n_shapes: int, size=(700, 500)) -> List[dict]:
+    """A dense point cloud over an image of a given size."""
+    rng = np.random.default_rng(SEED)
+    coordinates = rng.uniform((0, 0), size, size=(n_shapes, 2))
+    return [
+        {"type": "point", "label": "a", "coordinates": tuple(xy)}
+        for xy in coordinates.round().astype(int).tolist()
+    ]
@@ -0,0 +1,79 @@
+"""Benchmarks for loading, adjusting and fitting images."""
+import pathlib
+import tempfile
+
+from ipycanvas import Canvas
+from PIL import Image
+
+from ipyannotations.images.canvases.image_utils import (
+    adjust,
+    fit_image,
+    load_img,
+)
+
+from . import common
+
+MEGAPIXELS = [1, 10, 100]
+
+
+class LoadImage:
+    """Time ``load_img`` for every type of input it accepts."""
+
+    params = (MEGAPIXELS, ["bytes", "path", "str", "ndarray", "pillow"])
+    param_names = ["megapixels", "input_type"]
+    timeout = 300
+
+    def setup_cache(self):
+        directory = pathlib.Path(tempfile.mkdtemp())
+        paths = {}
+        for megapixels in MEGAPIXELS:
+            path = directory / f"{megapixels}mp.jpg"
+            path.write_bytes(common.jpeg_bytes(megapixels))
+            paths[megapixels] = str(path)
+        return paths
+
+    def setup(self, paths, megapixels, input_type):
+        path = paths[megapixels]
+        if input_type == "bytes":
+            self.image = pathlib.Path(path).read_bytes()
+        elif input_type == "path":
+            self.image = pathlib.Path(path)
+        elif input_type == "str":
+            self.image = path
+        elif input_type == "ndarray":
+            self.image = common.image_array(megapixels)
+        elif input_type == "pillow":
+            self.image = Image.open(path)
+            self.image.load()
+
+    def time_load_img(self, paths, megapixels, input_type):
+        load_img(self.image)
+
+
+class AdjustImage:
+    """Time brightness & contrast adjustments of a loaded image."""
+
+    params = MEGAPIXELS
+    param_names = ["megapixels"]
+    timeout = 300
+
+    def setup(self, megapixels):
+        self.image = common.image_widget(megapixels)
+
+    def time_adjust(self, megapixels):
+        adjust(self.image, contrast_factor=1.5, brightness_factor=0.8)
+
+
+class FitImage:
+    """Time fitting a loaded image into the canvas."""
+
+    params = MEGAPIXELS
+    param_names = ["megapixels"]
+    timeout = 300
+
+    def setup(self, megapixels):
+        self.image = common.image_widget(megapixels)
+        self.canvas = Canvas(width=700, height=500)
+
+    def time_fit_image(self, megapixels):
+        fit_image(self.image, self.canvas)
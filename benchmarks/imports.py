@@ -0,0 +1,24 @@
+"""Benchmarks for the time it takes to import the subpackages."""
+
+
+class ImportTime:
+    """Time importing each subpackage in a fresh interpreter."""
+
+    params = [
+        "ipyannotations",
+        "ipyannotations.generic",
+        "ipyannotations.text",
+        "ipyannotations.images",
+        "ipyannotations.images.canvases",
+    ]
+    param_names = ["module"]
+
+    def timeraw_import(self, module):
+        return "import {}".format(module)
+
+
+class FirstUse:
+    """Time importing a widget, which loads the heavy dependencies."""
+
+    def timeraw_import_polygon_annotator(self):
+        return "from ipyannotations.images import PolygonAnnotator"
@@ -0,0 +1,65 @@
+"""Track the comm traffic caused by common interactions."""
+from ipyannotations.generic import ClassLabeller
+from ipyannotations.images import BoxAnnotator
+from ipyannotations.text import TextTagger
+from ipyannotations.traffic import CommTrafficMonitor
+
+from . import common
+
+
+class ClassLabellerOptions:
+    """Traffic when a new option is added through the free-text field."""
+
+    params = [5, 50, 500]
+    param_names = ["n_options"]
+
+    def setup(self, n_options):
+        self.widget = ClassLabeller(
+            options=[str(i) for i in range(n_options)], max_buttons=1000
+        )
+
+    def track_add_option_bytes(self, n_options):
+        with CommTrafficMonitor() as monitor:
+            self.widget.freetext_widget.value = "new option"
+            self.widget.submit(self.widget.freetext_widget)
+        return monitor.total().nbytes
+
+    track_add_option_bytes.unit = "bytes"
+
+
+class TextTaggerSpans:
+    """Traffic when a span is added to a document with many spans."""
+
+    params = [10, 1000]
+    param_names = ["n_spans"]
+
+    def setup(self, n_spans):
+        text = "word " * (n_spans + 1)
+        self.widget = TextTagger(text=text)
+        self.widget.data = [(5 * i, 5 * i + 4, "MISC") for i in range(n_spans)]
+        self.new_span = (5 * n_spans, 5 * n_spans + 4, "PER")
+
+    def track_add_span_bytes(self, n_spans):
+        with CommTrafficMonitor() as monitor:
+            self.widget.data = self.widget.data + [self.new_span]
+        return monitor.total().nbytes
+
+    track_add_span_bytes.unit = "bytes"
+
+
+class AnnotatorDisplay:
+    """Traffic when an image is displayed in an annotator."""
+
+    params = [0.35, 1]
+    param_names = ["megapixels"]
+
+    def setup(self, megapixels):
+        self.widget = BoxAnnotator(options=["a"])
+        self.image = common.image_array(megapixels)
+
+    def track_display_bytes(self, megapixels):
+        with CommTrafficMonitor() as monitor:
+            self.widget.display(self.image)
+        return monitor.total().nbytes
+
+    track_display_bytes.unit = "bytes"
@@ -4,11 +4,20 @@ from typing import Callable, List, Optional, Any
 import ipyevents
 import ipywidgets as widgets
 
+from .history import DEFAULT_DEPTH, DEFAULT_MEMORY, UndoHistory
+
 CallbackList = List[Callable]
 
 
 class LabellingWidgetMixin:
-    def __init__(self, *args, track_keystrokes=True, **kwargs):  # noqa: D001
+    def __init__(  # noqa: D001
+        self,
+        *args,
+        track_keystrokes=True,
+        undo_depth: Optional[int] = DEFAULT_DEPTH,
+        undo_memory: Optional[int] = DEFAULT_MEMORY,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
         button_layout = widgets.Layout(
             # width="auto",
@@ -30,7 +39,7 @@ class LabellingWidgetMixin:
             layout=button_layout,
         )
         self.undo_fns: CallbackList = []
-        self._undo_queue: CallbackList = []
+        self._undo_queue = UndoHistory(undo_depth, undo_memory)
         self.undo_button.on_click(self.undo)
 
         self.submit_button = widgets.Button(
@@ -39,7 +48,7 @@ class LabellingWidgetMixin:
             button_style="success",
             layout=button_layout,
         )
-        self.submission_functions = []
+        self.submission_functions: CallbackList = []
         self.submit_button.on_click(self.submit)
 
         self.event_watcher = ipyevents.Event(
@@ -49,7 +58,10 @@ class LabellingWidgetMixin:
             wait=10,
         )
         self.event_watcher.on_dom_event(self._handle_keystroke)
-        self.children = self.children + (self.event_watcher,)
+        # the mixin is used with box widgets, which have children:
+        self.children = self.children + (  # type: ignore[has-type]
+            self.event_watcher,
+        )
 
     def on_submit(self, callback: Callable):
         """
@@ -115,6 +127,17 @@ class LabellingWidgetMixin:
             for callback in self.undo_fns:
                 callback()
 
+    def redo(self, sender=None):
+        """
+        Redo the last change that was undone.
+
+        Parameters
+        ----------
+        sender : Optional
+            The "sender" that invoked this callback. This is ignored.
+        """
+        self._undo_queue.redo()
+
     def skip(self, sender: Optional[widgets.Button] = None):
         """
         Skip a data point.
@@ -137,5 +160,7 @@ class LabellingWidgetMixin:
             return
         if event["key"] == "Enter":
             self.submit()
+        elif event["key"] == "Backspace" and event.get("shiftKey"):
+            self.redo()
         elif event["key"] == "Backspace":
             self.undo()
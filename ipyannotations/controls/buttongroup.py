@@ -4,6 +4,8 @@ from typing import Callable, Dict, List, Optional, Text, Union
 import ipywidgets as widgets
 import traitlets
 
+from .options import OrderedOptions
+
 
 class ButtonGroup(widgets.HBox):
     """A group of buttons with output widgets underneath.
@@ -37,6 +39,14 @@ class ButtonGroup(widgets.HBox):
 
         super().__init__(children=[], **kwargs)
 
+        self.buttons: Dict[str, ButtonWithHint] = {}
+        self.hints = self.buttons
+        self._options = OrderedOptions()
+        # all buttons share a layout, so resizing them is a single update
+        self._button_layout = widgets.Layout()
+
+        # without an explicit width, it is re-calculated when options change
+        self._automatic_width = button_width is None
         if button_width is None and len(options) > 0:
             self.button_width = max(1 / len(options), 0.1)
         else:
@@ -55,15 +65,43 @@ class ButtonGroup(widgets.HBox):
 
         """
 
-        self.buttons = self.hints = {
-            option: ButtonWithHint(option, self.button_width)
-            for option in self.options
-        }
+        if self._automatic_width and len(self.options) > 0:
+            self.button_width = max(1 / len(self.options), 0.1)
+
+        appended = self._options.update(self.options)
+        if appended is not None:
+            # options were only added, so the existing buttons stay in place
+            new_buttons = [self._make_button(option) for option in appended]
+            self.buttons.update(zip(appended, new_buttons))
+            if new_buttons:
+                self.children = self.children + tuple(new_buttons)
+            return
+
+        # buttons are kept for options that remain, so that only new options
+        # create widgets in the frontend:
+        buttons: Dict[str, ButtonWithHint] = {}
+        for option in self._options:
+            button = self.buttons.pop(option, None)
+            if button is None:
+                button = self._make_button(option)
+            buttons[option] = button
 
         for button in self.buttons.values():
-            button.on_click(self._handle_click)
+            button.close()
+
+        self.buttons = self.hints = buttons
+        self.children = list(buttons.values())
 
-        self.children = [self.buttons[option] for option in self.options]
+    def _make_button(self, option: str) -> "ButtonWithHint":
+        button = ButtonWithHint(
+            option, self.button_width, layout=self._button_layout
+        )
+        button.on_click(self._handle_click)
+        return button
+
+    @traitlets.observe("button_width")
+    def _resize_buttons(self, change):
+        self._button_layout.width = self.button_width
 
     def on_click(self, func: Callable) -> None:
         """Add a function to the list of calls made after a click.
@@ -140,6 +178,12 @@ class ButtonWithHint(widgets.VBox):
         """
         self.button.on_click(func)
 
+    def close(self):
+        """Close this widget, and the button and hint it contains."""
+        self.button.close()
+        self.hint.close()
+        super().close()
+
     def __enter__(self):
         return self.hint.__enter__()
 
@@ -4,6 +4,8 @@ from typing import Callable, DefaultDict, Sequence
 import ipywidgets as widgets
 import traitlets
 
+from .options import OrderedOptions
+
 
 class DropdownButton(widgets.VBox):
 
@@ -25,6 +27,7 @@ class DropdownButton(widgets.VBox):
 
         super().__init__(*args, **kwargs)
 
+        self._options = OrderedOptions()
         self.options = options
 
         self.dropdown = widgets.Dropdown(
@@ -45,10 +48,8 @@ class DropdownButton(widgets.VBox):
             widgets.Output
         )
 
-        self.children = [
-            widgets.HBox([self.dropdown, self.button]),
-            self.hints[self.dropdown.value],
-        ]
+        self._controls = widgets.HBox([self.dropdown, self.button])
+        self.children = [self._controls, self.hints[self.dropdown.value]]
 
     def on_click(self, func: Callable) -> None:
         """Add a function to the list of calls made after a click.
@@ -78,12 +79,9 @@ class DropdownButton(widgets.VBox):
             self.button.description = "Submit."
             self.button.disabled = True
 
-        self.children = [
-            widgets.HBox([self.dropdown, self.button]),
-            self.hints[self.dropdown.value],
-        ]
+        self.children = [self._controls, self.hints[self.dropdown.value]]
 
     @traitlets.validate("options")
     def _check_options(self, proposal):
-        seen = set()
-        return [x for x in proposal["value"] if not (x in seen or seen.add(x))]
+        self._options.update(proposal["value"])
+        return list(self._options)
@@ -0,0 +1,66 @@
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class OrderedOptions:
+    """An ordered set of options, with constant-time membership tests.
+
+    Widgets keep their options in a list trait, so users can assign any list.
+    This keeps a de-duplicated copy next to it, and tells widgets when new
+    options were only appended to the end (the common case when free text is
+    allowed), so they can update just the new options.
+
+    Parameters
+    ----------
+    options : Iterable[str], optional
+        The initial options. Duplicates are dropped.
+    """
+
+    def __init__(self, options: Iterable[str] = ()):
+        self._positions: Dict[str, int] = {}
+        self.update(options)
+
+    def __contains__(self, option) -> bool:
+        return option in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def index(self, option: str) -> int:
+        """The position of an option.
+
+        Raises
+        ------
+        KeyError
+            If the option isn't one of the options.
+        """
+        return self._positions[option]
+
+    def update(self, options: Iterable[str]) -> Optional[List[str]]:
+        """Replace the options.
+
+        Parameters
+        ----------
+        options : Iterable[str]
+            The new options. Duplicates are dropped.
+
+        Returns
+        -------
+        Optional[List[str]]
+            If the new options are the old ones with some options appended,
+            the appended options (which may be empty). Otherwise, None.
+        """
+        new_options = dict.fromkeys(options)
+        n_old = len(self._positions)
+        if len(new_options) >= n_old and list(
+            islice(new_options, n_old)
+        ) == list(self._positions):
+            appended = list(islice(new_options, n_old, None))
+            for position, option in enumerate(appended, start=n_old):
+                self._positions[option] = position
+            return appended
+        self._positions = dict(zip(new_options, range(len(new_options))))
+        return None
@@ -4,6 +4,8 @@ from typing import Dict, List, Optional, Text, Union
 import ipywidgets as widgets
 import traitlets
 
+from .options import OrderedOptions
+
 
 class ToggleButtonGroup(widgets.HBox):
     """A group of buttons with output widgets underneath.
@@ -40,6 +42,13 @@ class ToggleButtonGroup(widgets.HBox):
 
         super().__init__(children=[], **kwargs)
 
+        self.buttons: List[ToggleButtonWithHint] = []
+        self._options = OrderedOptions()
+        # all buttons share a layout, so resizing them is a single update
+        self._button_layout = widgets.Layout()
+
+        # without an explicit width, it is re-calculated when options change
+        self._automatic_width = button_width is None
         if button_width is None and len(options) > 0:
             self.button_width = max(1 / len(options), 0.1)
         else:
@@ -56,21 +65,53 @@ class ToggleButtonGroup(widgets.HBox):
         change : Any
             Any ol' change.
         """
-        self.buttons = [
-            ToggleButtonWithHint(option, self.button_width)
-            for option in self.options
-        ]
-        for button in self.buttons:
-            button.observe(self.update_value)
-
+        if self._automatic_width and len(self.options) > 0:
+            self.button_width = max(1 / len(self.options), 0.1)
+
+        appended = self._options.update(self.options)
+        if appended is not None:
+            # options were only added, so the existing buttons stay in place,
+            # and the new buttons aren't toggled
+            new_buttons = [self._make_button(option) for option in appended]
+            if new_buttons:
+                self.buttons = self.buttons + new_buttons
+                self.children = self.buttons
+            return
+
+        # buttons are kept for options that remain, so that only new options
+        # create widgets in the frontend:
+        existing = {button.description: button for button in self.buttons}
+        buttons = []
+        for option in self._options:
+            button = existing.pop(option, None)
+            if button is None:
+                button = self._make_button(option)
+            buttons.append(button)
+
+        for button in existing.values():
+            button.close()
+
+        self.buttons = buttons
         self.children = self.buttons
         self.update_value()
 
+    def _make_button(self, option: str) -> "ToggleButtonWithHint":
+        button = ToggleButtonWithHint(
+            option, self.button_width, layout=self._button_layout
+        )
+        button.observe(self.update_value, "value")
+        return button
+
+    @traitlets.observe("button_width")
+    def _resize_buttons(self, change):
+        self._button_layout.width = self.button_width
+
     @traitlets.observe("value")
     def update_toggles(self, change):  # noqa: D001
+        selected = set(change["new"])
         with self.hold_trait_notifications():
             for button in self.buttons:
-                button.value = button.description in change["new"]
+                button.value = button.description in selected
 
     def update_value(self, *args):
         self.value = [
@@ -78,7 +119,7 @@ class ToggleButtonGroup(widgets.HBox):
         ]
 
     def _toggle(self, option: str):
-        idx = self.options.index(option)
+        idx = self._options.index(option)
         self.buttons[idx].value = not self.buttons[idx].value
 
     def _reset(self):
@@ -131,6 +172,12 @@ class ToggleButtonWithHint(widgets.VBox):
         self.description = label
         widgets.link((self, "description"), (self.button, "description"))
 
+    def close(self):
+        """Close this widget, and the button and hint it contains."""
+        self.button.close()
+        self.hint.close()
+        super().close()
+
     def __enter__(self):
         return self.hint.__enter__()
 
@@ -0,0 +1,223 @@
+import bisect
+import heapq
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, DefaultDict, Dict, Iterable, List, Set, Tuple
+
+import ipywidgets as widgets
+import traitlets
+
+from .buttongroup import ButtonGroup
+
+
+class OptionIndex:
+    """An index of options that finds the best matches for a search query.
+
+    Options match a query if one of their words starts with the query, or if
+    they share most of the query's trigrams (which tolerates typos). Options
+    whose words start with the query are ranked first; within each group,
+    options that have been used more often come first.
+
+    Parameters
+    ----------
+    options : Iterable[str], optional
+        The options to index.
+    """
+
+    def __init__(self, options: Iterable[str] = ()):
+        self.counts: Counter = Counter()
+        self._rank: Dict[str, int] = {}
+        self._prefixes: List[Tuple[str, str]] = []
+        self._trigrams: DefaultDict[str, Set[str]] = defaultdict(set)
+        self.update(options)
+
+    def __len__(self):
+        return len(self._rank)
+
+    def __contains__(self, option):
+        return option in self._rank
+
+    def update(self, options: Iterable[str]):
+        """Change the indexed options.
+
+        Only the options that were added or removed are re-indexed.
+
+        Parameters
+        ----------
+        options : Iterable[str]
+            The new options, in the order used to break ties.
+        """
+        new_options = dict.fromkeys(options)
+        for option in self._rank.keys() - new_options.keys():
+            self._remove(option)
+        added = new_options.keys() - self._rank.keys()
+        for option in added:
+            self._add(option)
+        if added:
+            # sorting is linear when a few options were appended
+            self._prefixes.sort()
+        self._rank = {option: i for i, option in enumerate(new_options)}
+
+    def record_use(self, option: str):
+        """Count a use of an option, so it ranks higher in the future."""
+        self.counts[option] += 1
+
+    def search(self, query: str, k: int = 8) -> List[str]:
+        """Find the best matches for a query.
+
+        Parameters
+        ----------
+        query : str
+            The search query. Matching is not case sensitive.
+        k : int, optional
+            The maximum number of matches to return, by default 8.
+
+        Returns
+        -------
+        List[str]
+            The best matches, best first. For an empty query, these are the
+            most frequently used options.
+        """
+        query = query.strip().lower()
+        if not query:
+            return heapq.nsmallest(k, self._rank, key=self._popularity)
+
+        prefix_matches = set()
+        start = bisect.bisect_left(self._prefixes, (query, ""))
+        # the index is walked from the first match, rather than copied:
+        for index in range(start, len(self._prefixes)):
+            key, option = self._prefixes[index]
+            if not key.startswith(query):
+                break
+            prefix_matches.add(option)
+        matches = heapq.nsmallest(k, prefix_matches, key=self._popularity)
+        if len(matches) == k:
+            return matches
+
+        query_trigrams = _trigrams(query)
+        hits: Counter = Counter()
+        for trigram in query_trigrams:
+            hits.update(self._trigrams.get(trigram, ()))
+        threshold = len(query_trigrams) / 2
+        fuzzy_matches = (
+            option
+            for option, n_hits in hits.items()
+            if n_hits >= threshold and option not in prefix_matches
+        )
+        return matches + heapq.nsmallest(
+            k - len(matches),
+            fuzzy_matches,
+            key=lambda option: (-hits[option],) + self._popularity(option),
+        )
+
+    def _popularity(self, option: str) -> Tuple[int, int]:
+        return (-self.counts[option], self._rank[option])
+
+    def _add(self, option: str):
+        self._prefixes.extend((key, option) for key in _prefix_keys(option))
+        for trigram in _trigrams(option.lower()):
+            self._trigrams[trigram].add(option)
+
+    def _remove(self, option: str):
+        for key in _prefix_keys(option):
+            index = bisect.bisect_left(self._prefixes, (key, option))
+            del self._prefixes[index]
+        for trigram in _trigrams(option.lower()):
+            self._trigrams[trigram].discard(option)
+            if not self._trigrams[trigram]:
+                del self._trigrams[trigram]
+        del self._rank[option]
+
+
+def _prefix_keys(option: str) -> Set[str]:
+    """The lower-case option, starting at each of its words."""
+    lower = option.lower()
+    words = re.finditer(r"\w+", lower)
+    return {lower} | {lower[word.start() :] for word in words}
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TypeaheadButton(widgets.VBox):
+    """A search box that shows buttons for the best matching options.
+
+    Only the best matches are sent to the browser, which makes this work
+    for thousands of options. The text box filters the options as you type,
+    and pressing enter picks the top match.
+
+    Parameters
+    ----------
+    options : Sequence[str]
+        The options to choose from.
+    n_matches : int, optional
+        The number of matching options to display, by default 8.
+    """
+
+    options = traitlets.List(
+        trait=traitlets.Unicode(), default_value=list(), allow_none=True
+    )
+    n_matches = traitlets.Integer(8)
+    submission_functions: "traitlets.List[Callable[[Any], None]]" = (
+        traitlets.List(default_value=list(), allow_none=True)
+    )
+
+    def __init__(
+        self, options: Iterable[str], n_matches: int = 8, *args, **kwargs
+    ):
+
+        super().__init__(*args, **kwargs)
+
+        self.index = OptionIndex()
+        self.search_box = widgets.Text(
+            description="Label:",
+            placeholder="Type to search.",
+            continuous_update=True,
+        )
+        self.search_box.observe(self._search, "value")
+        self.search_box.on_submit(self._submit_top_match)
+        self.matches = ButtonGroup([])
+        self.matches.on_click(self._handle_click)
+
+        self.n_matches = n_matches
+        self.options = list(options)
+        self.children = [self.search_box, self.matches]
+
+    def on_click(self, func: Callable) -> None:
+        """Add a function to the list of calls made after a click.
+
+        Parameters
+        ----------
+        func : Callable
+            The function to call when the button is clicked.
+        """
+        if not callable(func):
+            raise ValueError(
+                "You need to provide a callable object, but you provided "
+                + str(func)
+                + "."
+            )
+        self.submission_functions.append(func)
+
+    @traitlets.observe("options")
+    def _update_index(self, change):
+        self.index.update(self.options or [])
+        self._search()
+
+    @traitlets.observe("n_matches")
+    def _search(self, change=None):
+        self.matches.options = self.index.search(
+            self.search_box.value, self.n_matches
+        )
+
+    def _handle_click(self, owner: widgets.Button) -> None:
+        self.index.record_use(owner.description)
+        for func in self.submission_functions:
+            func(owner)
+        self.search_box.value = ""
+
+    def _submit_top_match(self, sender=None):
+        if self.matches.options:
+            top_match = self.matches.buttons[self.matches.options[0]]
+            self._handle_click(top_match.button)
@@ -1,8 +1,10 @@
+from .batch_classification import BatchClassLabeller
 from .classification import ClassLabeller
 from .freetext import FreetextAnnotator
 from .multiclassification import MulticlassLabeller
 
 __all__ = [
+    "BatchClassLabeller",
     "ClassLabeller",
     "FreetextAnnotator",
     "MulticlassLabeller",
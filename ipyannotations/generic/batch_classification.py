@@ -0,0 +1,240 @@
+"""A widget to assign classes to a whole page of data points at once."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+import ipywidgets as widgets
+import traitlets
+
+from ..base import LabellingWidgetMixin
+from .generic_mixin import default_display_function
+
+
+class BatchClassLabeller(LabellingWidgetMixin, widgets.VBox):
+    """
+    A classification widget that shows a page of data points at a time.
+
+    Each data point on the page is shown in a grid, with a class already
+    chosen for it: either a prediction you provide, or a default class. You
+    only need to correct the ones that are wrong, and then submit the whole
+    page by clicking "Submit" or pressing "Enter". The submission functions
+    receive a list with one class per data point on the page.
+
+    If you pass a ``preprocess_function`` (for example, one that loads and
+    shrinks images), it is run in a pool of background threads, and you can
+    call `preload` with the next page so it is ready when you display it.
+    """
+
+    options = traitlets.List(
+        trait=traitlets.Unicode(), default_value=list(), allow_none=True
+    )
+
+    def __init__(
+        self,
+        options: Sequence[str] = (),
+        page_size: int = 12,
+        n_columns: int = 4,
+        default_option: Optional[str] = None,
+        display_function: Callable = default_display_function,
+        preprocess_function: Optional[Callable] = None,
+        max_workers: Optional[int] = None,
+        *args,
+        **kwargs,
+    ):
+        """Create a widget for labelling a page of data points at once.
+
+        Parameters
+        ----------
+        options : Sequence[str], optional
+            The classes, by default ()
+        page_size : int, optional
+            The largest number of data points on a page, by default 12
+        n_columns : int, optional
+            The number of columns in the grid, by default 4
+        default_option : str, optional
+            The class chosen for data points without a prediction, by default
+            the first option. It has to be one of the options.
+        display_function : callable, optional
+            The function called to display a data point, by
+            default default_display_function
+        preprocess_function : callable, optional
+            A function that is applied to each data point in a background
+            thread, before its result is passed to the display function. By
+            default, data points are passed to the display function as-is.
+        max_workers : int, optional
+            The number of background threads for the preprocess function, by
+            default chosen by `concurrent.futures.ThreadPoolExecutor`.
+
+        Raises
+        ------
+        ValueError
+            If the default option isn't one of the options.
+        """
+        if default_option is not None and default_option not in options:
+            raise ValueError(
+                "The default option {!r} isn't one of the options {}.".format(
+                    default_option, list(options)
+                )
+            )
+        super().__init__(*args, **kwargs)
+        self.display_function = display_function
+        self.preprocess_function = preprocess_function
+        self.default_option = default_option
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = max_workers
+        self._preloaded_items: Optional[Sequence[Any]] = None
+        self._preloaded_futures: List[Future] = []
+
+        self.cells = [_Cell() for _ in range(page_size)]
+        self.grid = widgets.GridBox(
+            self.cells,
+            layout=widgets.Layout(
+                grid_template_columns="repeat({}, 1fr)".format(n_columns),
+                grid_gap="5px",
+                padding="2.5% 0",
+            ),
+        )
+        self.n_items = 0
+        self.options = [str(option) for option in options]
+
+        self.children = [
+            self.grid,
+            widgets.HBox(
+                [self.skip_button, self.undo_button, self.submit_button],
+                layout=widgets.Layout(justify_content="flex-end"),
+            ),
+            self.event_watcher,
+        ]
+
+    @property
+    def data(self) -> List[str]:
+        """The classes chosen for the data points on the current page."""
+        return [cell.dropdown.value for cell in self.cells[: self.n_items]]
+
+    def display(
+        self, items: Sequence[Any], predictions: Optional[Sequence] = None
+    ):
+        """Display a page of data points.
+
+        Parameters
+        ----------
+        items : Sequence[Any]
+            The data points. There can be at most ``page_size`` of them.
+        predictions : Sequence[str], optional
+            A predicted class for each data point, which is chosen for it
+            initially. Predictions that are None, or not one of the options,
+            fall back to the default option.
+        """
+        if len(items) > len(self.cells):
+            raise ValueError(
+                "You passed {} data points, but the page only has space for "
+                "{}.".format(len(items), len(self.cells))
+            )
+        if predictions is None:
+            predictions = [None] * len(items)
+
+        if self._preloaded_items is items:
+            futures = self._preloaded_futures
+        else:
+            futures = self._preprocess(items)
+        self._preloaded_items, self._preloaded_futures = None, []
+
+        self.n_items = len(items)
+        for cell, future, prediction in zip(self.cells, futures, predictions):
+            cell.show(
+                self.display_function,
+                future.result(),
+                self._initial_option(prediction),
+            )
+        for cell in self.cells[self.n_items :]:
+            cell.hide()
+
+    def preload(self, items: Sequence[Any]):
+        """Start preprocessing the next page of data points in the background.
+
+        If the next call to `display` is with the same sequence of data
+        points, the preprocessed results are used.
+
+        Parameters
+        ----------
+        items : Sequence[Any]
+            The data points on the next page.
+        """
+        self._preloaded_items = items
+        self._preloaded_futures = self._preprocess(items)
+
+    def clear(self):
+        """Reset each data point on the page to its initial class."""
+        for cell in self.cells[: self.n_items]:
+            cell.reset()
+
+    def close(self):
+        """Close the widget, and stop its background threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        super().close()
+
+    def _initial_option(self, prediction: Optional[str]) -> Optional[str]:
+        if prediction is not None and prediction in self.options:
+            return prediction
+        if self.default_option in self.options:
+            return self.default_option
+        return self.options[0] if self.options else None
+
+    def _preprocess(self, items: Sequence[Any]) -> List[Future]:
+        if self.preprocess_function is None:
+            futures = []
+            for item in items:
+                future: Future = Future()
+                future.set_result(item)
+                futures.append(future)
+            return futures
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._max_workers)
+        return [
+            self._executor.submit(self.preprocess_function, item)
+            for item in items
+        ]
+
+    @traitlets.observe("options")
+    def _update_options(self, change):
+        for cell in self.cells:
+            cell.dropdown.options = self.options
+
+
+class _Cell(widgets.VBox):
+    """One data point on a page, and the class chosen for it."""
+
+    def __init__(self):
+        self.output = widgets.Output()
+        self.dropdown = widgets.Dropdown(layout=widgets.Layout(width="auto"))
+        self.dropdown.observe(self._highlight_change, "value")
+        self.initial_value: Optional[str] = None
+        super().__init__(
+            [self.output, self.dropdown],
+            layout=widgets.Layout(display="none", border="2px solid white"),
+        )
+
+    def show(self, display_function: Callable, item: Any, value):
+        self.output.clear_output(wait=True)
+        with self.output:
+            display_function(item)
+        self.initial_value = value
+        self.reset()
+        self.layout.display = None
+
+    def hide(self):
+        self.output.clear_output()
+        self.layout.display = "none"
+
+    def reset(self):
+        self.dropdown.value = self.initial_value
+        self._highlight_change()
+
+    def _highlight_change(self, change=None):
+        # corrected classes are outlined, so they stand out on the page
+        if self.dropdown.value == self.initial_value:
+            self.layout.border = "2px solid white"
+        else:
+            self.layout.border = "2px solid orange"
@@ -1,6 +1,6 @@
 """A widget to assign a single class to each data point."""
 
-from typing import Sequence, Union
+from typing import Dict, Sequence, Union
 
 import ipywidgets as widgets
 import traitlets
@@ -8,6 +8,8 @@ import traitlets
 from ..base import LabellingWidgetMixin
 from ..controls.buttongroup import ButtonGroup
 from ..controls.dropdownbutton import DropdownButton
+from ..controls.options import OrderedOptions
+from ..controls.typeahead import TypeaheadButton
 from .generic_mixin import GenericWidgetMixin, default_display_function
 
 
@@ -19,12 +21,14 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
     point. Choose a class by clicking the corresponding button, the value in
     the corresponding dropdown (if there isn't space for all buttons), or by
     using the hotkeys 1-0. Hotkeys are mapped in the order in which the classes
-    appear.
+    appear. For very many classes, a search box that shows the best matching
+    classes as you type is displayed instead of the dropdown.
     """
 
     allow_freetext = traitlets.Bool(True)
     options = traitlets.List(list(), allow_none=True)
     max_buttons = traitlets.Integer(12)
+    max_dropdown_options = traitlets.Integer(100)
     data: str
 
     def __init__(
@@ -33,6 +37,7 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
         max_buttons: int = 12,
         allow_freetext: bool = True,
         display_function=default_display_function,
+        max_dropdown_options: int = 100,
         *args,
         **kwargs,
     ):
@@ -50,6 +55,9 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
         display_function : callable, optional
             The function called to display a data point, by
             default default_display_function
+        max_dropdown_options : int, optional
+            The number of classes to allow in a dropdown menu, before
+            switching to a search box, by default 100
         """
         super().__init__(
             allow_freetext=allow_freetext,
@@ -63,9 +71,33 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
         )
         self.sort_button.on_click(self._sort_options)
 
+        # the containers and control elements are created once, and re-used
+        # whenever the options change:
+        self._control_pool: Dict[type, widgets.Box] = {}
+        self._option_set = OrderedOptions()
+        self._display_box = widgets.Box(
+            (self._display_buffer_box,),
+            layout=widgets.Layout(
+                justify_content="center",
+                padding="2.5% 0",
+                display="flex",
+                width="100%",
+            ),
+        )
+        self._toolbar = widgets.HBox(
+            [
+                self.freetext_widget,
+                widgets.HBox(
+                    [self.sort_button, self.skip_button, self.undo_button]
+                ),
+            ],
+            layout=widgets.Layout(justify_content="space-between"),
+        )
+
+        self.max_buttons = max_buttons
+        self.max_dropdown_options = max_dropdown_options
         self.options = [str(option) for option in options]
         self._fixed_options = [option for option in self.options]
-        self.max_buttons = max_buttons
         self._compose()
 
     def _sort_options(self, change=None):
@@ -84,7 +116,7 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
         if isinstance(sender, widgets.Text) and sender.value:
             value = sender.value
             # check if this is a new option:
-            if value not in self.options:
+            if value not in self._option_set:
                 self.options = self.options + [value]
             sender.value = ""
         else:
@@ -92,36 +124,31 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
         self.data = value
         super().submit()
 
-    @traitlets.observe("options", "max_buttons")
+    @traitlets.observe("options", "max_buttons", "max_dropdown_options")
     def _compose(self, change=None):
 
+        self._option_set.update(self.options)
+
         if len(self.options) <= self.max_buttons:
-            self.control_elements = ButtonGroup(self.options)
+            control_class = ButtonGroup
+        elif len(self.options) <= self.max_dropdown_options:
+            control_class = DropdownButton
         else:
-            self.control_elements = DropdownButton(self.options)
+            control_class = TypeaheadButton
 
-        self.control_elements.on_click(self.submit)
+        control_elements = self._control_pool.get(control_class)
+        if control_elements is None:
+            control_elements = control_class(self.options)
+            control_elements.on_click(self.submit)
+            self._control_pool[control_class] = control_elements
+        else:
+            control_elements.options = self.options
+        self.control_elements = control_elements
 
         self.children = [
-            widgets.Box(
-                (self.display_widget,),
-                layout=widgets.Layout(
-                    justify_content="center",
-                    padding="2.5% 0",
-                    display="flex",
-                    width="100%",
-                ),
-            ),
+            self._display_box,
             self.control_elements,
-            widgets.HBox(
-                [
-                    self.freetext_widget,
-                    widgets.HBox(
-                        [self.sort_button, self.skip_button, self.undo_button]
-                    ),
-                ],
-                layout=widgets.Layout(justify_content="space-between"),
-            ),
+            self._toolbar,
         ]
 
     def _handle_keystroke(self, event):
@@ -130,6 +157,7 @@ class ClassLabeller(GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox):
             return
         super()._handle_keystroke(event)
         keys = [str(i) for i in range(1, 10)] + ["0"]
-        for key, btn in zip(keys, self.control_elements.buttons.values()):
+        buttons = getattr(self.control_elements, "buttons", {})
+        for key, btn in zip(keys, buttons.values()):
             if event.get("key") == key:
                 self.submit(btn)
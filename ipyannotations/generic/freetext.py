@@ -53,7 +53,7 @@ class FreetextAnnotator(
         widgets.link((self, "data"), (self.freetext_widget, "value"))
 
         self.children = [
-            self.display_widget,
+            self._display_buffer_box,
             widgets.HBox(
                 [
                     self.freetext_widget,
@@ -4,6 +4,8 @@ from typing import Any
 import IPython.display
 import ipywidgets as widgets
 
+_NO_ITEM = object()
+
 
 def default_display_function(feature):
     """
@@ -34,8 +36,16 @@ class GenericWidgetMixin:
     ):
 
         super().__init__(*args, **kwargs)
-        self.display_widget = widgets.Output(
-            layout=widgets.Layout(margin="auto", min_height="50px")
+        # two outputs take turns: one shows the current item, while the next
+        # item can be rendered into the other, hidden one ahead of time
+        self._display_buffers = (
+            widgets.Output(),
+            widgets.Output(layout=widgets.Layout(display="none")),
+        )
+        self._preloaded_item: Any = _NO_ITEM
+        self._display_buffer_box = widgets.Box(
+            self._display_buffers,
+            layout=widgets.Layout(margin="auto", min_height="50px"),
         )
         if allow_freetext:
             self.freetext_widget = widgets.Text(
@@ -48,19 +58,53 @@ class GenericWidgetMixin:
             self.freetext_widget = widgets.HBox([])
         self.display_function = display_function
 
+    @property
+    def display_widget(self) -> widgets.Output:
+        """The output that shows the current data point."""
+        return self._display_buffers[0]
+
     def display(self, item: Any):
         """Display a data point.
 
         This function calles the display function provided to the widget,
         and wraps it in a ipywidgets.Output widget to present the display in
-        the right location.
+        the right location. The previous data point stays on screen until
+        the new one is ready, and if the data point was passed to `preload`,
+        it is shown immediately. The widget doesn't know which data point
+        comes next, so you need to call `preload` yourself.
 
         Parameters
         ----------
         item : any
             The data point.
         """
-        self.display_widget.clear_output(wait=True)
-        with self.display_widget:
-            self.display_function(item)
+        if self._preloaded_item is not item:
+            self._render(item)
+        front, back = self._display_buffers
+        back.layout.display = None
+        front.layout.display = "none"
+        self._display_buffers = (back, front)
+        self._preloaded_item = _NO_ITEM
         self.clear()  # type: ignore
+
+    def preload(self, item: Any):
+        """Render a data point ahead of time, without showing it yet.
+
+        The widget doesn't call this itself, as it doesn't know which data
+        point comes next. Call it with the next data point after calling
+        `display`, and the next call to `display` with that data point swaps
+        it in immediately.
+
+        Parameters
+        ----------
+        item : any
+            The next data point.
+        """
+        self._render(item)
+
+    def _render(self, item: Any):
+        hidden_buffer = self._display_buffers[1]
+        hidden_buffer.clear_output()
+        with hidden_buffer:
+            self.display_function(item)
+        self._preloaded_item = item
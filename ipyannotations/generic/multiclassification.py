@@ -7,6 +7,7 @@ import ipywidgets as widgets
 import traitlets
 
 from ..base import LabellingWidgetMixin
+from ..controls.options import OrderedOptions
 from ..controls.togglebuttongroup import ToggleButtonGroup
 from .generic_mixin import GenericWidgetMixin, default_display_function
 
@@ -60,6 +61,7 @@ class MulticlassLabeller(
             *args,
             **kwargs,
         )  # type: ignore
+        self._option_set = OrderedOptions()
         self.options = [str(option) for option in options]
         self.class_selector = ToggleButtonGroup(options=self.options)
         traitlets.link((self, "data"), (self.class_selector, "value"))
@@ -70,7 +72,7 @@ class MulticlassLabeller(
 
         self.children = [
             widgets.Box(
-                (self.display_widget,),
+                (self._display_buffer_box,),
                 layout=widgets.Layout(
                     justify_content="center",
                     padding="2.5% 0",
@@ -95,6 +97,10 @@ class MulticlassLabeller(
             self.event_watcher,
         ]
 
+    @traitlets.observe("options")
+    def _update_option_set(self, change):
+        self._option_set.update(self.options)
+
     def _handle_keystroke(self, event):
         if event["key"] == "Enter":
             if self._freetext_timestamp > time.time() - 0.1:
@@ -119,7 +125,7 @@ class MulticlassLabeller(
         if sender is self.freetext_widget and sender.value:
             value = sender.value
             # check if this is a new option:
-            if value not in self.options:
+            if value not in self._option_set:
                 self.options = self.options + [value]
 
                 def _undo_callback():
@@ -127,7 +133,10 @@ class MulticlassLabeller(
                         opt for opt in self.options if opt != value
                     ]
 
-                self._undo_queue.append(_undo_callback)
+                def _redo_callback():
+                    self.options = self.options + [value]
+
+                self._undo_queue.append(_undo_callback, _redo_callback)
             if value not in self.data:
                 self.data = self.data + [value]
             sender.value = ""
@@ -0,0 +1,206 @@
+"""A bounded history of undoable changes, with redo.
+
+Each change is recorded as a pair of functions: one that undoes it, and
+(optionally) one that makes it again. The history has a maximum depth and a
+memory budget; once either is exceeded, the oldest changes are forgotten.
+
+Changes that are recorded with the same key one after the other, such as the
+steps of a drag, are merged into one change: undoing it undoes all steps.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Hashable, List, Optional
+
+#: The number of changes that can be undone, by default.
+DEFAULT_DEPTH = 100
+
+#: The memory that the recorded changes can use, by default, in bytes.
+DEFAULT_MEMORY = 64 * 2**20
+
+
+@dataclass
+class Change:
+    """A recorded change.
+
+    Attributes
+    ----------
+    undo : Callable[[], None]
+        Undoes the change.
+    redo : Optional[Callable[[], None]]
+        Makes the change again, after it was undone. If None, the change
+        can't be redone.
+    nbytes : int
+        The memory that the change holds on to, in bytes.
+    key : Optional[Hashable]
+        Changes with the same key that are recorded one after another are
+        merged.
+    """
+
+    undo: Callable[[], None]
+    redo: Optional[Callable[[], None]] = None
+    nbytes: int = 0
+    key: Optional[Hashable] = None
+
+
+class UndoHistory:
+    """A history of changes that can be undone and redone.
+
+    The history can be used like the list of undo functions it replaces:
+    functions can be appended, and ``history.pop()()`` undoes the last
+    change.
+
+    Parameters
+    ----------
+    max_depth : int, optional
+        The number of changes that are kept, by default `DEFAULT_DEPTH`. If
+        None, there is no limit.
+    max_bytes : int, optional
+        The memory the changes can hold on to, by default `DEFAULT_MEMORY`.
+        The last change is always kept. If None, there is no limit.
+    """
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = DEFAULT_DEPTH,
+        max_bytes: Optional[int] = DEFAULT_MEMORY,
+    ):
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self._undo: Deque[Change] = deque()
+        self._redo: List[Change] = []
+        self._open = False
+        self.nbytes = 0
+
+    def append(
+        self,
+        undo: Callable[[], None],
+        redo: Optional[Callable[[], None]] = None,
+        nbytes: int = 0,
+        key: Optional[Hashable] = None,
+    ):
+        """Record a change.
+
+        This forgets any changes that were undone, as they can't be redone
+        any more.
+
+        Parameters
+        ----------
+        undo : Callable[[], None]
+            Undoes the change.
+        redo : Callable[[], None], optional
+            Makes the change again. By default, the change can't be redone.
+        nbytes : int, optional
+            The memory that the functions hold on to, in bytes, for example
+            copies of data. By default 0.
+        key : Hashable, optional
+            If the last change has the same key, and wasn't sealed with
+            `seal`, the two are merged: undoing undoes both, and redoing
+            makes both again.
+        """
+        self._clear_redo()
+        last = self._undo[-1] if self._undo else None
+        if (
+            key is not None
+            and last is not None
+            and self._open
+            and last.key == key
+        ):
+            last.redo = redo
+            self.nbytes += max(nbytes - last.nbytes, 0)
+            last.nbytes = max(nbytes, last.nbytes)
+        else:
+            self._undo.append(Change(undo, redo, nbytes, key))
+            self.nbytes += nbytes
+        self._open = key is not None
+        self._trim()
+
+    def seal(self):
+        """Stop merging changes into the last one, for example after a drag."""
+        self._open = False
+
+    def pop(self) -> Callable[[], None]:
+        """Remove the last change, and return a function that undoes it.
+
+        Once the returned function has been called, the change can be
+        redone.
+
+        Returns
+        -------
+        Callable[[], None]
+        """
+        change = self._undo.pop()
+        self.nbytes -= change.nbytes
+        self._open = False
+
+        def undo():
+            change.undo()
+            if change.redo is None:
+                self._clear_redo()
+            else:
+                self._redo.append(change)
+                self.nbytes += change.nbytes
+                self._trim()
+
+        return undo
+
+    def undo(self) -> bool:
+        """Undo the last change.
+
+        Returns
+        -------
+        bool
+            Whether there was a change to undo.
+        """
+        if not self._undo:
+            return False
+        self.pop()()
+        return True
+
+    def redo(self) -> bool:
+        """Make the last undone change again.
+
+        Returns
+        -------
+        bool
+            Whether there was a change to redo.
+        """
+        if not self._redo:
+            return False
+        change = self._redo.pop()
+        # only changes that can be redone are kept for redoing:
+        assert change.redo is not None
+        change.redo()
+        self._undo.append(change)
+        self._open = False
+        return True
+
+    @property
+    def can_redo(self) -> bool:
+        """Whether there are undone changes that can be redone."""
+        return bool(self._redo)
+
+    def clear(self):
+        """Forget all changes."""
+        self._undo.clear()
+        self._redo.clear()
+        self._open = False
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._undo)
+
+    def _clear_redo(self):
+        self.nbytes -= sum(change.nbytes for change in self._redo)
+        self._redo.clear()
+
+    def _trim(self):
+        """Forget the oldest changes until the history is within its limits."""
+        while self.max_depth is not None and len(self._undo) > self.max_depth:
+            self.nbytes -= self._undo.popleft().nbytes
+        if self.max_bytes is None:
+            return
+        # changes that were undone are forgotten first, oldest first:
+        while self.nbytes > self.max_bytes and self._redo:
+            self.nbytes -= self._redo.pop(0).nbytes
+        while self.nbytes > self.max_bytes and len(self._undo) > 1:
+            self.nbytes -= self._undo.popleft().nbytes
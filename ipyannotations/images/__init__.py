@@ -1,14 +1,103 @@
-"""Image annotation widgets."""
+"""Image annotation widgets.
 
-from .annotator import BoxAnnotator, PointAnnotator, PolygonAnnotator
-from .freetext import FreetextAnnotator
-from .classification import ClassLabeller, MulticlassLabeller
+The widgets are imported lazily when they are first accessed, so that
+importing this module does not import numpy, Pillow or ipycanvas until they
+are needed.
+"""
+
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from .annotator import (
+        BoxAnnotator,
+        MaskAnnotator,
+        PointAnnotator,
+        PolygonAnnotator,
+    )
+    from .classification import (
+        BatchClassLabeller,
+        ClassLabeller,
+        MulticlassLabeller,
+    )
+    from .exporters import (
+        AnnotatedImage,
+        Journal,
+        export_coco,
+        export_voc,
+        export_yolo,
+    )
+    from .freetext import FreetextAnnotator
+    from .importers import (
+        import_boxes,
+        import_coco,
+        import_points,
+        import_polygons,
+        import_yolo,
+    )
+    from .sequence import (
+        BoxSequenceAnnotator,
+        FrameSequence,
+        PointSequenceAnnotator,
+    )
+
+_LAZY_ATTRIBUTES = {
+    "PolygonAnnotator": ".annotator",
+    "PointAnnotator": ".annotator",
+    "BoxAnnotator": ".annotator",
+    "MaskAnnotator": ".annotator",
+    "ClassLabeller": ".classification",
+    "MulticlassLabeller": ".classification",
+    "BatchClassLabeller": ".classification",
+    "FreetextAnnotator": ".freetext",
+    "BoxSequenceAnnotator": ".sequence",
+    "PointSequenceAnnotator": ".sequence",
+    "FrameSequence": ".sequence",
+    "AnnotatedImage": ".exporters",
+    "Journal": ".exporters",
+    "export_coco": ".exporters",
+    "export_voc": ".exporters",
+    "export_yolo": ".exporters",
+    "import_boxes": ".importers",
+    "import_points": ".importers",
+    "import_polygons": ".importers",
+    "import_coco": ".importers",
+    "import_yolo": ".importers",
+}
 
 __all__ = [
     "PolygonAnnotator",
     "PointAnnotator",
     "BoxAnnotator",
+    "MaskAnnotator",
     "ClassLabeller",
     "MulticlassLabeller",
+    "BatchClassLabeller",
     "FreetextAnnotator",
+    "BoxSequenceAnnotator",
+    "PointSequenceAnnotator",
+    "FrameSequence",
+    "AnnotatedImage",
+    "Journal",
+    "export_coco",
+    "export_voc",
+    "export_yolo",
+    "import_boxes",
+    "import_points",
+    "import_polygons",
+    "import_coco",
+    "import_yolo",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,5 +1,5 @@
 import pathlib
-from typing import Any, Callable, List, Optional, Sequence, Type, Union
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type, Union
 
 import ipywidgets as widgets
 import traitlets
@@ -7,6 +7,7 @@ import traitlets
 from ..base import LabellingWidgetMixin
 from .canvases.abstract_canvas import AbstractAnnotationCanvas
 from .canvases.box import BoundingBoxAnnotationCanvas
+from .canvases.mask import MaskAnnotationCanvas
 from .canvases.point import PointAnnotationCanvas
 from .canvases.polygon import PolygonAnnotationCanvas
 
@@ -48,12 +49,26 @@ class Annotator(LabellingWidgetMixin, widgets.VBox):
             The classes to be annotated, by default ()
         data_postprocessor : Optional[Callable[[List[dict]], Any]], optional
             A function to post-process the data, by default None.
+        undo_depth : int, optional
+            The number of changes that can be undone, by default 100.
+        undo_memory : int, optional
+            The memory the undo history can use, in bytes, by default 64 MiB.
         """
         layout = {"width": f"{canvas_size[0]}px"}
         layout.update(kwargs.pop("layout", {}))
-        super().__init__(layout=layout)
+        history_limits = {
+            name: kwargs.pop(name)
+            for name in ("undo_depth", "undo_memory")
+            if name in kwargs
+        }
+        super().__init__(layout=layout, **history_limits)
         self.canvas = self.CanvasClass(canvas_size, classes=options)
-        self.data_postprocessor = data_postprocessor
+        # the canvas records its changes in the annotator's history:
+        self.canvas._undo_queue = self._undo_queue
+        # subclasses post-process data in their own format:
+        self.data_postprocessor: Optional[Callable[[Any], Any]] = (
+            data_postprocessor
+        )
 
         # controls for the data entry:
         data_controls = []
@@ -85,6 +100,22 @@ class Annotator(LabellingWidgetMixin, widgets.VBox):
             )
             widgets.link((self.edit_button, "value"), (self.canvas, "editing"))
             extra_buttons.append(self.edit_button)
+        if hasattr(self.canvas, "assisting"):
+            self.assist_button = widgets.ToggleButton(
+                description="Assist", icon="magic", layout=button_layout
+            )
+            widgets.link(
+                (self.assist_button, "value"), (self.canvas, "assisting")
+            )
+            extra_buttons.append(self.assist_button)
+        if hasattr(self.canvas, "_selectable_shapes"):
+            self.delete_button = widgets.Button(
+                description="Delete", icon="trash", layout=button_layout
+            )
+            self.delete_button.on_click(
+                lambda _: self.canvas.delete_selected()
+            )
+            extra_buttons.append(self.delete_button)
 
         extra_buttons = widgets.HBox(
             extra_buttons,
@@ -170,7 +201,11 @@ class Annotator(LabellingWidgetMixin, widgets.VBox):
             self.canvas.error_output_widget,
         )
 
-    def display(self, image: Union[widgets.Image, pathlib.Path]):
+    def display(
+        self,
+        image: Union[widgets.Image, pathlib.Path],
+        percentiles: Optional[Tuple[float, float]] = None,
+    ):
         """Clear the annotations and display an image
 
 
@@ -178,9 +213,14 @@ class Annotator(LabellingWidgetMixin, widgets.VBox):
         ----------
         image : widgets.Image, pathlib.Path, np.ndarray
             The image, or the path to the image.
+        percentiles : tuple(float, float), optional
+            For arrays: the intensity window, as percentiles of the values in
+            the array, for example (1, 99) to ignore outliers. By default,
+            arrays that aren't 8-bit are scaled from their smallest to their
+            largest value.
         """
         self.canvas.clear()
-        self.canvas.load_image(image)
+        self.canvas.load_image(image, percentiles)
 
     @property
     def data(self):
@@ -199,6 +239,9 @@ class Annotator(LabellingWidgetMixin, widgets.VBox):
 
     def _handle_keystroke(self, event):
         super()._handle_keystroke(event)
+        if event.get("type") == "keyup" and event.get("key") == "Delete":
+            if hasattr(self.canvas, "_selectable_shapes"):
+                self.canvas.delete_selected()
         keys = [str(i) for i in range(1, 10)] + ["0"]
         for key, option in zip(keys, self.class_selector.options):
             if event.get("key") == key:
@@ -219,7 +262,15 @@ class PolygonAnnotator(Annotator):
 
     You can move, but not add / subtract polygon points, by clicking the "Edit"
     button. Simply drag a point you want to adjust. Again, if you have
-    difficulty aiming at the points, you can increase the point size.
+    difficulty aiming at the points, you can increase the point size. In this
+    mode, you can also click inside a polygon to select it, drag it to move
+    the whole polygon, and delete it with the "Delete" button or key.
+
+    For objects with clear edges, click the "Assist" button. Then either click
+    on the object, to outline the region of similar colour around that point,
+    or drag a box around the object, to outline what stands out from the
+    edges of the box. You can adjust the proposed polygon with the "Edit"
+    button, or undo it.
 
     You can increase or decrease the contrast and brightness  of the image
     using the sliders to make it easier to annotate. Sometimes you need to see
@@ -321,7 +372,9 @@ class BoxAnnotator(Annotator):
     To add a box, simply click on one of the corners, and drag the mouse to
     the corner opposite. The box will grow as you drag your mouse. To adjust
     the box after, you can click the "Edit" button and drag any of the corners
-    to where you want them.
+    to where you want them. In this mode, you can also click inside a box to
+    select it, drag it to move the whole box, and delete it with the "Delete"
+    button or key.
 
     You can increase or decrease the contrast and brightness  of the image
     using the sliders to make it easier to annotate. Sometimes you need to see
@@ -364,3 +417,82 @@ class BoxAnnotator(Annotator):
     @data.setter
     def data(self, value):  # noqa: D001
         self.canvas.data = value
+
+
+class MaskAnnotator(Annotator):
+    """An annotator for painting segmentation masks onto an image.
+
+    To paint, select the class using the dropdown menu, and click and drag
+    over the image. The brush size is set on screen, so zooming in on the
+    canvas paints finer details. To remove paint, toggle the "Erase" button.
+    Each brush stroke can be undone.
+
+    You can increase or decrease the contrast and brightness  of the image
+    using the sliders to make it easier to annotate. The "Opacity" slider
+    makes the mask more or less see-through.
+
+    You can select the class you are painting by choosing it from the
+    dropdown menu, or by using the hotkeys 1-0 (mapped in order in which the
+    classes appear in the dropdown).
+
+    Parameters
+    ----------
+    canvas_size : (int, int), optional
+        Size of the annotation canvas in pixels.
+    classes : List[str], optional
+        The list of classes you want to create annotations for, by default
+        None.
+    """
+
+    CanvasClass = MaskAnnotationCanvas
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.brush_size_slider = widgets.IntSlider(
+            description="Brush size", value=10, min=1, max=100, step=1
+        )
+        widgets.link(
+            (self.brush_size_slider, "value"), (self.canvas, "brush_size")
+        )
+        self.erase_button = widgets.ToggleButton(
+            description="Erase",
+            icon="eraser",
+            layout=self.undo_button.layout,
+        )
+        widgets.link((self.erase_button, "value"), (self.canvas, "erasing"))
+
+        header, classes, buttons, submit = self.data_controls.children
+        buttons.children = buttons.children + (self.erase_button,)
+        self.data_controls.children = (
+            header,
+            classes,
+            self.brush_size_slider,
+            buttons,
+            submit,
+        )
+
+    @property
+    def data(self):
+        """
+        The annotation data, as List[ Dict ].
+
+        There is one dictionary for each class that was painted, with the
+        following key / value combinations:
+
+        +------------------+---------------------------------------+
+        |``'type'``        | ``'mask'``                            |
+        +------------------+---------------------------------------+
+        |``'label'``       | ``<class label>``                     |
+        +------------------+---------------------------------------+
+        |``'rle'``         | ``<COCO-style uncompressed RLE>``     |
+        +------------------+---------------------------------------+
+
+        The run-length encoding is a dictionary with the ``'size'`` of the
+        image as [height, width], and the ``'counts'`` of alternating runs of
+        unpainted and painted pixels, in column-major order.
+        """
+        return super().data
+
+    @data.setter
+    def data(self, value):  # noqa: D001
+        self.canvas.data = value
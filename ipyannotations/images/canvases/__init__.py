@@ -2,14 +2,40 @@
 Different types of canvases for annotating images.
 
 All canvases should inherit from abstract_canvas.AbstractAnnotationCanvas.
+The canvases are imported lazily when they are first accessed.
 """
+import importlib
+import typing
 
-from .box import BoundingBoxAnnotationCanvas
-from .point import PointAnnotationCanvas
-from .polygon import PolygonAnnotationCanvas
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from .box import BoundingBoxAnnotationCanvas
+    from .mask import MaskAnnotationCanvas
+    from .point import PointAnnotationCanvas
+    from .polygon import PolygonAnnotationCanvas
+
+_LAZY_ATTRIBUTES = {
+    "PolygonAnnotationCanvas": ".polygon",
+    "PointAnnotationCanvas": ".point",
+    "BoundingBoxAnnotationCanvas": ".box",
+    "MaskAnnotationCanvas": ".mask",
+}
 
 __all__ = [
     "PolygonAnnotationCanvas",
     "PointAnnotationCanvas",
     "BoundingBoxAnnotationCanvas",
+    "MaskAnnotationCanvas",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
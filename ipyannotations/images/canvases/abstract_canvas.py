@@ -1,14 +1,27 @@
 import abc
+import copy
+import dataclasses
 import pathlib
-from collections import defaultdict, deque
-from typing import Callable, Deque, Optional, Sequence, Tuple, Union
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import ipywidgets as widgets
+import numpy as np
 from ipycanvas import MultiCanvas, hold_canvas
 from traitlets import Float, Integer, Unicode, observe
 
-from .color_utils import set_colors
-from .image_utils import adjust, fit_image, load_img
+from ...history import UndoHistory
+from .analytics import bounding_boxes, find_shape
+from .color_utils import rgba_to_html_string, set_colors
+from .image_utils import adjust, fit_image, load_img, trigger_redraw
 
 
 class AbstractAnnotationCanvas(MultiCanvas):
@@ -27,7 +40,7 @@ class AbstractAnnotationCanvas(MultiCanvas):
         **kwargs
     ):
         super().__init__(n_canvases=3, width=size[0], height=size[1], **kwargs)
-        self._undo_queue: Deque[Callable] = deque([])
+        self._undo_queue = UndoHistory()
         self.image_extent = (0, 0, *size)
 
         self.image_canvas = self[0]
@@ -40,6 +53,8 @@ class AbstractAnnotationCanvas(MultiCanvas):
 
         self.current_image: Optional[widgets.Image] = None
         self.dragging: Optional[Callable[[int, int], None]] = None
+        self.selected: Optional[Any] = None
+        self._translation: Optional[Tuple[int, int]] = None
         self.error_output_widget = widgets.Output()
 
         # register re_draw as handler for obacity changes
@@ -49,6 +64,8 @@ class AbstractAnnotationCanvas(MultiCanvas):
             lambda *x: self.re_draw(),
             names=["opacity", "editing", "point_size", "nothing"],
         )
+        # shapes are only selected while editing:
+        self.observe(self._clear_selection, names=["editing"])
 
         if classes is not None:
             self.colormap = {
@@ -59,15 +76,22 @@ class AbstractAnnotationCanvas(MultiCanvas):
 
         self.init_empty_data()
 
-    def load_image(self, image: Union[widgets.Image, str, pathlib.Path]):
+    def load_image(
+        self,
+        image: Union[widgets.Image, str, pathlib.Path],
+        percentiles: Optional[Tuple[float, float]] = None,
+    ):
         """Display an image on the annotation canvas.
 
         Parameters
         ----------
         image : Union[widgets.Image, str, pathlib.Path]
             The image, or the path to the image.
+        percentiles : tuple(float, float), optional
+            For arrays: the intensity window, as percentiles of the values in
+            the array (see `load_img`).
         """
-        image = load_img(image)
+        image = load_img(image, percentiles)
         self.current_image = image
         self._display_image()
         self.init_empty_data()
@@ -111,6 +135,132 @@ class AbstractAnnotationCanvas(MultiCanvas):
             "This canvas does not implement initialising the data."
         )
 
+    def _clear_selection(self, change=None):
+        self.selected = None
+        self._translation = None
+
+    # canvases whose shapes can be selected, moved and deleted as a whole
+    # implement a `_selectable_shapes` method, which returns the shapes.
+
+    def _select_shape(self, x: float, y: float) -> bool:
+        """Select the top shape at a point, and start dragging it.
+
+        Parameters
+        ----------
+        x : float
+        y : float
+
+        Returns
+        -------
+        bool
+            Whether there was a shape at the point.
+        """
+        shapes = self._selectable_shapes()
+        index = find_shape(shapes, (x, y))
+        self.selected = shapes[index] if index is not None else None
+        if self.selected is None:
+            return False
+        # the last position of the drag:
+        self._translation = (round(x), round(y))
+        self.dragging = self._translate_selected
+        return True
+
+    def _translate_selected(self, x: int, y: int):
+        if self.selected is None or self._translation is None:
+            return
+        last_x, last_y = self._translation
+        shape = self.selected
+        self._change_shape(
+            shape, lambda: shape.translate(x - last_x, y - last_y)
+        )
+        self._translation = (x, y)
+
+    def _finish_drag(self):
+        """Stop merging changes to shapes, so the next drag is undone alone."""
+        self._translation = None
+        self._undo_queue.seal()
+
+    def _change_shape(self, shape: Any, change: Callable[[], None]):
+        """Change a shape, so that the change can be undone and redone.
+
+        The changes to a shape during one drag are undone in one go.
+
+        Parameters
+        ----------
+        shape : Any
+            The shape, a dataclass.
+        change : Callable[[], None]
+            Changes the shape.
+        """
+        before = _shape_state(shape)
+        change()
+        after = _shape_state(shape)
+        if after != before:
+            self._undo_queue.append(
+                lambda: self._restore_shape(shape, before),
+                lambda: self._restore_shape(shape, after),
+                key=("change", id(shape)),
+            )
+
+    @trigger_redraw
+    def _restore_shape(self, shape: Any, state: Dict[str, Any]):
+        for name, value in state.items():
+            setattr(shape, name, copy.copy(value))
+
+    @trigger_redraw
+    def _redo_append(self, shapes: list, shape: Any):
+        shapes.append(shape)
+
+    def delete_selected(self):
+        """Delete the selected shape, if there is one."""
+        shapes = self._selectable_shapes()
+        # shapes can be equal without being the same:
+        index = next(
+            (
+                index
+                for index, shape in enumerate(shapes)
+                if shape is self.selected
+            ),
+            None,
+        )
+        if index is None:
+            return
+        shape = shapes.pop(index)
+        self.selected = None
+
+        def undo_delete():
+            shapes.insert(index, shape)
+            self.re_draw()
+
+        def redo_delete():
+            shapes.pop(index)
+            self.re_draw()
+
+        self._undo_queue.append(undo_delete, redo_delete)
+        self.re_draw()
+
+    def _draw_selection(self):
+        """Draw a dashed box around the selected shape."""
+        if self.selected is None or not getattr(self, "editing", True):
+            return
+        boxes = bounding_boxes([self.selected])
+        if np.isnan(boxes).any():
+            return
+        x0, y0, x1, y1 = boxes[0]
+        x0, y0 = self.image_to_canvas_coordinates((x0, y0))
+        x1, y1 = self.image_to_canvas_coordinates((x1, y1))
+        canvas = self.annotation_canvas
+        canvas.line_width = 1
+        canvas.set_line_dash([6, 3])
+        canvas.stroke_style = rgba_to_html_string((0, 0, 0, 1.0))
+        margin = self.point_size + 2
+        canvas.stroke_rect(
+            x0 - margin,
+            y0 - margin,
+            x1 - x0 + 2 * margin,
+            y1 - y0 + 2 * margin,
+        )
+
     def canvas_to_image_coordinates(
         self, point: Tuple[int, int]
     ) -> Tuple[int, int]:
@@ -191,3 +341,11 @@ class AbstractAnnotationCanvas(MultiCanvas):
         if name in ("caching", "width", "height"):
             return getattr(self._canvases[0], name)
         raise AttributeError(name)
+
+
+def _shape_state(shape: Any) -> Dict[str, Any]:
+    """Copies of the fields of a shape."""
+    return {
+        field.name: copy.copy(getattr(shape, field.name))
+        for field in dataclasses.fields(shape)
+    }
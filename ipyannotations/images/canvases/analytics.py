@@ -0,0 +1,338 @@
+"""Statistics and masks for collections of shapes, computed with arrays.
+
+Each function handles all of the shapes it is given at once: the points of
+all polygons are concatenated into one array, so that areas, masks and
+overlaps are computed with a few array operations rather than a loop over
+shapes.
+"""
+
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .shapes import BoundingBox, Polygon
+
+Shape = Union[Polygon, BoundingBox]
+Polygons = Sequence[Union[Polygon, np.ndarray]]
+Boxes = Union[Sequence[BoundingBox], np.ndarray]
+
+
+def polygon_areas(polygons: Polygons) -> np.ndarray:
+    """The area of each of a number of polygons, with the shoelace formula.
+
+    Parameters
+    ----------
+    polygons : Sequence[Polygon or np.ndarray]
+        The polygons, or (n_points, 2) arrays of their points. Whether the
+        last point repeats the first one doesn't matter.
+
+    Returns
+    -------
+    np.ndarray
+        The (n_polygons,) areas. Polygons with fewer than three points have
+        an area of 0.
+    """
+    points, starts, lengths = _concatenate(polygons)
+    areas = np.zeros(len(lengths))
+    if not len(points):
+        return areas
+    following = _following(starts, lengths)
+    x, y = points[:, 0], points[:, 1]
+    cross = x * y[following] - y * x[following]
+    nonempty = lengths > 0
+    areas[nonempty] = np.abs(np.add.reduceat(cross, starts[nonempty])) / 2
+    return areas
+
+
+def bounding_boxes(
+    polygons: Sequence[Union[Polygon, BoundingBox, np.ndarray]],
+) -> np.ndarray:
+    """The box around each of a number of polygons.
+
+    Parameters
+    ----------
+    polygons : Sequence[Polygon, BoundingBox or np.ndarray]
+        The polygons, or (n_points, 2) arrays of their points. Boxes are
+        returned as they are, with the smaller coordinates first.
+
+    Returns
+    -------
+    np.ndarray
+        A (n_polygons, 4) array of (x0, y0, x1, y1). It is NaN for polygons
+        without points.
+    """
+    points, starts, lengths = _concatenate(polygons)
+    boxes = np.full((len(lengths), 4), np.nan)
+    nonempty = lengths > 0
+    if nonempty.any():
+        boxes[nonempty, :2] = np.minimum.reduceat(
+            points, starts[nonempty], axis=0
+        )
+        boxes[nonempty, 2:] = np.maximum.reduceat(
+            points, starts[nonempty], axis=0
+        )
+    return boxes
+
+
+def box_areas(boxes: Boxes) -> np.ndarray:
+    """The area of each of a number of boxes.
+
+    Parameters
+    ----------
+    boxes : Sequence[BoundingBox] or np.ndarray
+        The boxes, or a (n_boxes, 4) array of (x0, y0, x1, y1).
+
+    Returns
+    -------
+    np.ndarray
+        The (n_boxes,) areas.
+    """
+    xyxy = _xyxy(boxes)
+    return (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+
+
+def box_iou(boxes: Boxes, other_boxes: Optional[Boxes] = None) -> np.ndarray:
+    """The intersection over union of each pair of boxes.
+
+    Parameters
+    ----------
+    boxes : Sequence[BoundingBox] or np.ndarray
+        The boxes, or a (n_boxes, 4) array of (x0, y0, x1, y1).
+    other_boxes : Sequence[BoundingBox] or np.ndarray, optional
+        The boxes to compare to. By default, the boxes are compared to each
+        other.
+
+    Returns
+    -------
+    np.ndarray
+        A (n_boxes, n_other_boxes) array. Pairs of boxes without any area
+        have an IoU of 0.
+    """
+    first = _xyxy(boxes)
+    second = first if other_boxes is None else _xyxy(other_boxes)
+    top_left = np.maximum(first[:, None, :2], second[None, :, :2])
+    bottom_right = np.minimum(first[:, None, 2:], second[None, :, 2:])
+    overlap = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    union = box_areas(first)[:, None] + box_areas(second)[None, :] - overlap
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(union > 0, overlap / union, 0.0)
+
+
+def points_in_polygon(
+    points: np.ndarray, polygon: Union[Polygon, np.ndarray]
+) -> np.ndarray:
+    """Whether each of a number of points is inside a polygon.
+
+    This uses the even-odd rule: a point is inside if a ray from it crosses
+    the edges of the polygon an odd number of times.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        A (n_points, 2) array of x and y coordinates.
+    polygon : Polygon or np.ndarray
+        The polygon, or a (n_vertices, 2) array of its points.
+
+    Returns
+    -------
+    np.ndarray
+        A (n_points,) boolean array.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    vertices, _, _ = _concatenate([polygon])
+    if len(vertices) < 3:
+        return np.zeros(len(points), dtype=bool)
+    start, end = vertices, np.roll(vertices, -1, axis=0)
+    x, y = points[:, None, 0], points[:, None, 1]
+    crosses = (start[:, 1] > y) != (end[:, 1] > y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_crossing = start[:, 0] + (y - start[:, 1]) * (
+            end[:, 0] - start[:, 0]
+        ) / (end[:, 1] - start[:, 1])
+    return np.count_nonzero(crosses & (x < x_crossing), axis=1) % 2 == 1
+
+
+def find_shape(
+    shapes: Sequence[Shape], point: Tuple[float, float]
+) -> Optional[int]:
+    """Find the top shape (the last one drawn) that contains a point.
+
+    Only the shapes whose bounding box contains the point are tested with
+    `points_in_polygon`, from the top one down.
+
+    Parameters
+    ----------
+    shapes : Sequence[Polygon or BoundingBox]
+        The shapes, in the order they are drawn in.
+    point : Tuple[float, float]
+        The x and y coordinates of the point.
+
+    Returns
+    -------
+    Optional[int]
+        The index of the shape, or None if no shape contains the point.
+    """
+    if not len(shapes):
+        return None
+    x, y = point
+    boxes = bounding_boxes(shapes)
+    candidates = np.flatnonzero(
+        (boxes[:, 0] <= x)
+        & (x <= boxes[:, 2])
+        & (boxes[:, 1] <= y)
+        & (y <= boxes[:, 3])
+    )
+    for index in candidates[::-1].tolist():
+        shape = shapes[index]
+        if (
+            isinstance(shape, BoundingBox)
+            or points_in_polygon(np.asarray([point]), shape).any()
+        ):
+            return index
+    return None
+
+
+def rasterize(
+    shapes: Sequence[Shape],
+    size: Tuple[int, int],
+    labels: Optional[Sequence[Optional[str]]] = None,
+) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Draw polygons and boxes into a mask of class indices.
+
+    Pixels are inside a shape if their centre is, and later shapes are drawn
+    over earlier ones. The rows of all shapes are filled at once: every edge
+    is intersected with the rows of pixels it crosses, and the pixels between
+    pairs of intersections (from left to right) are filled.
+
+    Parameters
+    ----------
+    shapes : Sequence[Polygon or BoundingBox]
+        The shapes to draw.
+    size : Tuple[int, int]
+        The (width, height) of the mask.
+    labels : Sequence[str], optional
+        The classes, in the order of their indices (starting at 1). Classes
+        that aren't in this list get the next indices, in the order they
+        appear in. By default, only classes of the shapes are used.
+
+    Returns
+    -------
+    mask : np.ndarray
+        A (height, width) uint8 array, which is 0 outside all shapes and the
+        index of the class of the top shape elsewhere.
+    labels : List[str]
+        The classes, in the order of their indices.
+    """
+    width, height = size
+    labels = list(labels) if labels is not None else []
+    for shape in shapes:
+        if shape.label not in labels:
+            labels.append(shape.label)
+    if len(labels) > np.iinfo(np.uint8).max:
+        raise ValueError("A mask can only have 255 classes.")
+    class_indices = np.array(
+        [0] + [labels.index(shape.label) + 1 for shape in shapes],
+        dtype=np.uint8,
+    )
+
+    points, starts, lengths = _concatenate(shapes)
+    if not len(points):
+        return np.zeros((height, width), dtype=np.uint8), labels
+    shape_ids = np.repeat(np.arange(len(lengths)), lengths)
+    start, end = points, points[_following(starts, lengths)]
+
+    # the rows of pixel centres (y + 0.5) that each edge crosses, which
+    # includes the lower end of the edge but not the upper one:
+    low, high = np.minimum(start[:, 1], end[:, 1]), np.maximum(
+        start[:, 1], end[:, 1]
+    )
+    first_row = np.clip(np.ceil(low - 0.5), 0, height).astype(int)
+    last_row = np.clip(np.ceil(high - 0.5), 0, height).astype(int)
+    n_rows = last_row - first_row
+    edges = np.repeat(np.arange(len(points)), n_rows)
+    rows = np.arange(len(edges)) - np.repeat(
+        np.cumsum(n_rows) - n_rows, n_rows
+    )
+    rows += first_row[edges]
+    centre = rows + 0.5
+    # computed as in points_in_polygon, so that centres on an edge round the
+    # same way:
+    crossings = start[edges, 0] + (centre - start[edges, 1]) * (
+        end[edges, 0] - start[edges, 0]
+    ) / (end[edges, 1] - start[edges, 1])
+
+    # pair up the crossings of each shape and row from left to right:
+    crossing_shapes = shape_ids[edges]
+    order = np.lexsort((crossings, rows, crossing_shapes))
+    crossings = crossings[order].reshape(-1, 2)
+    rows = rows[order][::2]
+    crossing_shapes = crossing_shapes[order][::2]
+    first_column = np.clip(np.ceil(crossings[:, 0] - 0.5), 0, width)
+    last_column = np.clip(np.ceil(crossings[:, 1] - 0.5), 0, width)
+    span_lengths = (last_column - first_column).astype(int)
+
+    pixels = np.repeat(
+        rows * width + first_column.astype(int), span_lengths
+    ) + (
+        np.arange(span_lengths.sum())
+        - np.repeat(np.cumsum(span_lengths) - span_lengths, span_lengths)
+    )
+    top_shape = np.zeros(height * width, dtype=int)
+    np.maximum.at(
+        top_shape, pixels, np.repeat(crossing_shapes + 1, span_lengths)
+    )
+    mask = class_indices[top_shape].reshape(height, width)
+    return mask, labels
+
+
+def _xyxy(boxes: Boxes) -> np.ndarray:
+    """Boxes as a (n_boxes, 4) array, with the smaller coordinates first."""
+    if len(boxes) and isinstance(boxes[0], BoundingBox):
+        corners: List[Tuple[int, int, int, int]] = [
+            box.xyxy for box in boxes
+        ]
+        boxes = np.asarray(corners)
+    xyxy = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    return np.hstack(
+        [
+            np.minimum(xyxy[:, :2], xyxy[:, 2:]),
+            np.maximum(xyxy[:, :2], xyxy[:, 2:]),
+        ]
+    )
+
+
+def _points(shape: Union[Shape, np.ndarray, list]) -> list:
+    """The points of a shape as a list, without a closing point."""
+    if isinstance(shape, Polygon):
+        points = shape.points
+    elif isinstance(shape, BoundingBox):
+        points = shape.corners
+    else:
+        points = np.reshape(shape, (-1, 2)).tolist()
+    if len(points) > 1 and tuple(points[0]) == tuple(points[-1]):
+        # the closing point repeats the first one
+        points = points[:-1]
+    return points
+
+
+def _concatenate(
+    shapes: Sequence[Union[Shape, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The points of all shapes, and where each shape starts, and its size."""
+    point_lists = [_points(shape) for shape in shapes]
+    lengths = np.fromiter(map(len, point_lists), int, len(point_lists))
+    starts = np.cumsum(lengths) - lengths
+    # one conversion for all coordinates is much faster than one per shape:
+    coordinates = chain.from_iterable(chain.from_iterable(point_lists))
+    points = np.fromiter(coordinates, float, 2 * lengths.sum())
+    return points.reshape(-1, 2), starts, lengths
+
+
+def _following(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """The index of the next point of the same shape, for each point."""
+    following = np.arange(lengths.sum()) + 1
+    nonempty = lengths > 0
+    # the last point of each shape is followed by its first point:
+    following[(starts + lengths - 1)[nonempty]] = starts[nonempty]
+    return following
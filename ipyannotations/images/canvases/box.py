@@ -1,11 +1,13 @@
 from math import pi
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import ipywidgets as widgets
+import numpy as np
 from ipycanvas import hold_canvas
-from traitlets import Bool, observe
+from traitlets import Bool, Float, observe
 
 from .abstract_canvas import AbstractAnnotationCanvas
+from .analytics import box_iou
 from .color_utils import hex_to_rgb, rgba_to_html_string
 from .image_utils import dist, only_inside_image, trigger_redraw
 from .shapes import BoundingBox
@@ -14,23 +16,112 @@ from .shapes import BoundingBox
 class BoundingBoxAnnotationCanvas(AbstractAnnotationCanvas):
 
     editing = Bool(default_value=False)
+    overlap_threshold = Float(
+        default_value=None, allow_none=True, min=0, max=1
+    )
     annotations: List[BoundingBox]
     _proposed_annotation: Optional[BoundingBox] = None
 
     debug_output = widgets.Output()
 
-    @observe("point_size", "editing")
+    @observe("point_size", "editing", "overlap_threshold")
     def re_draw(self, _=None):  # noqa: D001
 
         with hold_canvas(self):
             self.annotation_canvas.clear()
-            # draw all existing polygons:
-            for annotation in self.annotations:
-                self.draw_box(annotation)
+            # draw all existing boxes:
+            self.draw_boxes(self.annotations)
+            self._draw_overlap_warnings()
+            self._draw_selection()
             # draw the current box:
             if self._proposed_annotation is not None:
                 self.draw_box(self._proposed_annotation, proposed=True)
 
+    def draw_boxes(self, boxes: List[BoundingBox]):
+        """Draw many boxes onto the canvas, with one command for each class.
+
+        Parameters
+        ----------
+        boxes : List[BoundingBox]
+            The boxes to draw.
+        """
+        if not boxes:
+            return
+        by_label: Dict[str, List[Tuple[int, ...]]] = {}
+        for box in boxes:
+            by_label.setdefault(box.label, []).append(box.xyxy)
+        canvas = self[1]
+        canvas.line_width = 3
+        canvas.set_line_dash([])
+        for label, xyxy in by_label.items():
+            rgb = hex_to_rgb(self.colormap.get(label, "#000000"))
+            corners = self._to_canvas(np.array(xyxy))
+            canvas.stroke_style = rgba_to_html_string(rgb + (1.0,))
+            canvas.stroke_rects(
+                corners[:, 0],
+                corners[:, 1],
+                corners[:, 2] - corners[:, 0],
+                corners[:, 3] - corners[:, 1],
+            )
+            if self.editing:
+                canvas.fill_style = rgba_to_html_string(rgb + (1.0,))
+                canvas.fill_arcs(
+                    corners[:, [0, 0, 2, 2]].ravel(),
+                    corners[:, [1, 3, 1, 3]].ravel(),
+                    self.point_size,
+                    0,
+                    2 * pi,
+                )
+
+    @property
+    def overlapping_boxes(self) -> List[Tuple[int, int]]:
+        """The pairs of boxes that overlap more than the overlap threshold.
+
+        The overlap of two boxes is their intersection over union. If the
+        ``overlap_threshold`` is None, no boxes are reported.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The indices of the two boxes, in ``annotations``, of each pair.
+        """
+        if self.overlap_threshold is None or len(self.annotations) < 2:
+            return []
+        iou = box_iou(self.annotations)
+        first, second = np.nonzero(np.triu(iou > self.overlap_threshold, 1))
+        return list(zip(first.tolist(), second.tolist()))
+
+    def _draw_overlap_warnings(self):
+        """Outline the boxes that overlap too much with a dashed red line."""
+        overlapping = sorted(set(sum(self.overlapping_boxes, ())))
+        if not overlapping:
+            return
+        corners = self._to_canvas(
+            np.array([self.annotations[index].xyxy for index in overlapping])
+        )
+        canvas = self[1]
+        canvas.line_width = 2
+        canvas.set_line_dash([4, 4])
+        canvas.stroke_style = rgba_to_html_string((255, 0, 0, 1.0))
+        canvas.stroke_rects(
+            corners[:, 0] - 3,
+            corners[:, 1] - 3,
+            corners[:, 2] - corners[:, 0] + 6,
+            corners[:, 3] - corners[:, 1] + 6,
+        )
+
+    def _to_canvas(self, xyxy: np.ndarray) -> np.ndarray:
+        """Convert (n_boxes, 4) image coordinates to canvas coordinates."""
+        x0, y0, x1, y1 = self.image_extent
+        scale = np.array(
+            [
+                (x1 - x0) / self.original_width,
+                (y1 - y0) / self.original_height,
+            ]
+            * 2
+        )
+        return np.rint(xyxy * scale + np.array([x0, y0, x0, y0]))
+
     def draw_box(self, box: BoundingBox, proposed: bool = False):
         """Draw a box onto the canvas.
 
@@ -103,16 +194,12 @@ class BoundingBoxAnnotationCanvas(AbstractAnnotationCanvas):
             for box in self.annotations:
                 for index, point in enumerate(box.corners):
                     if dist(point, (x, y)) < self.point_size:
-                        self.dragging = lambda x, y: box.move_corner(
-                            index, x, y
+                        self.dragging = lambda x, y: self._change_shape(
+                            box, lambda: box.move_corner(index, x, y)
                         )
-
-                        def undo_move():
-                            box.move_corner(index, *point)
-                            self.re_draw()
-
-                        self._undo_queue.append(undo_move)
                         return
+            # otherwise, select the box the click is inside of:
+            self._select_shape(x, y)
 
     @trigger_redraw
     @only_inside_image
@@ -145,22 +232,31 @@ class BoundingBoxAnnotationCanvas(AbstractAnnotationCanvas):
         y : float
         """
 
+        self._finish_drag()
         self.dragging = None
-        if self._proposed_annotation is not None:
-            x0, y0, x1, y1 = self._proposed_annotation.xyxy
+        box = self._proposed_annotation
+        if box is not None:
+            x0, y0, x1, y1 = box.xyxy
 
             if not (x0 == x1 and y0 == y1):
-                self.annotations.append(self._proposed_annotation)
-                self._undo_queue.append(self._undo_new_box)
+                self.annotations.append(box)
+                self._undo_queue.append(
+                    self._undo_new_box,
+                    lambda: self._redo_append(self.annotations, box),
+                )
 
             self._proposed_annotation = None
 
+    def _selectable_shapes(self) -> List[BoundingBox]:
+        return self.annotations
+
     @trigger_redraw
     def _undo_new_box(self):
         self.annotations.pop()
 
     def init_empty_data(self):
         self.annotations: List[BoundingBox] = []
+        self._clear_selection()
         self._undo_queue.clear()
 
     @property
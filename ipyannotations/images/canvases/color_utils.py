@@ -1,7 +1,5 @@
 from typing import Iterator, Tuple
 
-from palettable.colorbrewer.qualitative import Set2_8
-
 
 def hex_to_rgb(value: str) -> Tuple[int, int, int]:
     """Turn a hex color code to RGB ints.
@@ -80,5 +78,8 @@ def set_colors() -> Iterator[str]:
     str
         A valid hex-string from the Set2 colors. 8 unique colors available.
     """
+    # palettable is slow to import, so only do so when colors are needed
+    from palettable.colorbrewer.qualitative import Set2_8
+
     while True:
         yield from Set2_8.hex_colors
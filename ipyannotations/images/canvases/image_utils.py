@@ -3,19 +3,34 @@ import pathlib
 import re
 import typing
 from dataclasses import dataclass
-from functools import singledispatch, wraps
-from typing import Any, Callable, Optional, Sequence, Tuple
+from functools import lru_cache, singledispatch, wraps
+from typing import Any, Callable, Optional, Tuple
 
 import ipywidgets as widgets
 import numpy as np
 from ipycanvas import Canvas
 from PIL import Image, ImageEnhance
 
-URL_REGEX = re.compile(
-    r"^(http:\/\/www\.|https:\/\/www\.|http:\/\/|https:\/\/)?"
-    + r"[a-z0-9]+([\-\.]{1}[a-z0-9]+)*\.[a-z]{2,5}(:[0-9]{1,5})"
-    + r"?(\/.*)?$"
-)
+from ..normalize import to_uint8
+from .shapes import dist  # noqa: F401
+
+
+@lru_cache(maxsize=None)
+def _url_regex() -> typing.Pattern:
+    # compiled on first use, rather than when the module is imported
+    return re.compile(
+        r"^(http:\/\/www\.|https:\/\/www\.|http:\/\/|https:\/\/)?"
+        + r"[a-z0-9]+([\-\.]{1}[a-z0-9]+)*\.[a-z]{2,5}(:[0-9]{1,5})"
+        + r"?(\/.*)?$"
+    )
+
+
+def __getattr__(name: str):
+    # URL_REGEX is still importable, but only compiled when it is used:
+    if name == "URL_REGEX":
+        value = globals()[name] = _url_regex()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass
@@ -23,7 +38,7 @@ class URL:
     value: str
 
     def __bool__(self):
-        return bool(URL_REGEX.match(self.value))
+        return bool(_url_regex().match(self.value))
 
 
 def adjust(
@@ -56,7 +71,9 @@ def adjust(
 
 
 @singledispatch
-def load_img(img: typing.Any):
+def load_img(
+    img: typing.Any, percentiles: Optional[Tuple[float, float]] = None
+):
     """
     Load an image, whether it's from a URL, a file, an array, or an already
     in-memory image.
@@ -64,28 +81,41 @@ def load_img(img: typing.Any):
     Parameters
     ----------
     img : widgets.Image
+    percentiles : tuple(float, float), optional
+        For arrays: the intensity window, as percentiles of the values in the
+        array, for example (1, 99) to ignore outliers (see `to_uint8`). By
+        default, arrays that aren't 8-bit are scaled from their smallest to
+        their largest value.
     """
     raise ValueError(f"Can not load object of type {type(img)} as image.")
 
 
 @load_img.register(widgets.Image)
-def _img_already_widget(img: widgets.Image):
+def _img_already_widget(
+    img: widgets.Image, percentiles: Optional[Tuple[float, float]] = None
+):
     return img
 
 
 @load_img.register(bytes)
-def _img_already_loaded(img: bytes):
+def _img_already_loaded(
+    img: bytes, percentiles: Optional[Tuple[float, float]] = None
+):
     return widgets.Image(value=img)
 
 
 @load_img.register(pathlib.Path)
-def _load_img_path(img: pathlib.Path):
+def _load_img_path(
+    img: pathlib.Path, percentiles: Optional[Tuple[float, float]] = None
+):
     """Read image from file"""
     return load_img(img.read_bytes())
 
 
 @load_img.register(str)
-def _load_img_string(img: str):
+def _load_img_string(
+    img: str, percentiles: Optional[Tuple[float, float]] = None
+):
     """Read image from file or from URL"""
     img_path = pathlib.Path(img)
     if img_path.is_file():
@@ -99,7 +129,7 @@ def _load_img_string(img: str):
 
 
 @load_img.register(URL)
-def _load_img_url(img: URL):
+def _load_img_url(img: URL, percentiles: Optional[Tuple[float, float]] = None):
     import requests  # noqa: F401
 
     response = requests.get(img.value)
@@ -108,14 +138,18 @@ def _load_img_url(img: URL):
 
 
 @load_img.register(np.ndarray)
-def _load_img_ndarray(img: np.ndarray):
+def _load_img_ndarray(
+    img: np.ndarray, percentiles: Optional[Tuple[float, float]] = None
+):
     """create image from array"""
-    img = Image.fromarray(img.astype(np.uint8))
+    img = Image.fromarray(to_uint8(img, percentiles))
     return load_img(img)
 
 
 @load_img.register(Image.Image)
-def _load_img_pillow(img: Image.Image):
+def _load_img_pillow(
+    img: Image.Image, percentiles: Optional[Tuple[float, float]] = None
+):
     """Encode image as bytes"""
     image_io = io.BytesIO()
     img.save(image_io, "JPEG")
@@ -159,24 +193,6 @@ def fit_image(
     return x, y, width, height, img_width, img_height
 
 
-def dist(q: Sequence[float], p: Sequence[float]) -> float:
-    """Euclidian distance between two points.
-
-    Parameters
-    ----------
-    q : Sequence[float]
-        Point q
-    p : Sequence[float]
-        Point p
-
-    Returns
-    -------
-    float
-        The distance between point q and p.
-    """
-    return (sum((px - qx) ** 2.0 for px, qx in zip(p, q))) ** 0.5
-
-
 def trigger_redraw(fn: Callable) -> Callable:
     """Method decorator for functions that need to trigger a re-draw.
 
@@ -0,0 +1,366 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from ipycanvas import hold_canvas
+from traitlets import Bool, Integer
+
+from .abstract_canvas import AbstractAnnotationCanvas
+from .color_utils import hex_to_rgb
+from .image_utils import only_inside_image, trigger_redraw
+
+#: The size of the square tiles that are re-drawn after a brush stroke, in
+#: canvas pixels.
+TILE_SIZE = 64
+
+
+class MaskAnnotationCanvas(AbstractAnnotationCanvas):
+    """A canvas to paint class masks onto an image with a brush.
+
+    The mask is stored as an array of class indices, at the resolution of the
+    image. While you paint, only the tiles of the overlay that the brush
+    touched are sent to the browser again.
+    """
+
+    brush_size = Integer(default_value=10, min=1, max=200)
+    erasing = Bool(default_value=False)
+
+    def init_empty_data(self):
+        self.labels: List[str] = []
+        if getattr(self, "original_width", None) is None:
+            self.mask: Optional[np.ndarray] = None
+        else:
+            self.mask = np.zeros(
+                (self.original_height, self.original_width), dtype=np.uint8
+            )
+        self._last_point: Optional[Tuple[int, int]] = None
+        self._stroke_backup: Dict[Tuple[int, int], np.ndarray] = {}
+        self._dirty_tiles: Set[Tuple[int, int]] = set()
+        self._undo_queue.clear()
+
+    def re_draw(self, *args):
+        """Re-draw the whole mask onto the canvas."""
+        with hold_canvas(self):
+            self.annotation_canvas.clear()
+            if self.mask is not None and self.mask.any():
+                x0, y0, x1, y1 = self.image_extent
+                self._draw_region(x0, y0, x1, y1)
+        self._dirty_tiles.clear()
+
+    @only_inside_image
+    def on_click(self, x: float, y: float):
+        """Start a brush stroke.
+
+        Parameters
+        ----------
+        x : float
+            The x coordinate, relative to the image.
+        y : float
+            The y coordinate, relative to the image.
+        """
+        if self.mask is None:
+            return
+        self._stroke_backup = {}
+        self._last_point = (int(x), int(y))
+        self.add_point(x, y)
+
+    @only_inside_image
+    def on_drag(self, x: float, y: float):
+        """Continue a brush stroke.
+
+        Parameters
+        ----------
+        x : float
+            The x coordinate, relative to the image.
+        y : float
+            The y coordinate, relative to the image.
+        """
+        if self._last_point is None:
+            return
+        self._paint_segment(self._last_point, (int(x), int(y)))
+        self._last_point = (int(x), int(y))
+        self._draw_dirty_tiles()
+
+    def on_release(self, x: float, y: float):
+        """Finish a brush stroke, so that it can be undone in one go.
+
+        Parameters
+        ----------
+        x : float
+        y : float
+        """
+        if self._last_point is None or self.mask is None:
+            return
+        self._last_point = None
+        if self._stroke_backup:
+            backup = self._stroke_backup
+            # the tiles after the stroke, to redo it:
+            painted = {
+                (row, column): self.mask[
+                    row * TILE_SIZE : (row + 1) * TILE_SIZE,
+                    column * TILE_SIZE : (column + 1) * TILE_SIZE,
+                ].copy()
+                for row, column in backup
+            }
+            self._undo_queue.append(
+                lambda: self._restore(backup),
+                lambda: self._restore(painted),
+                nbytes=2 * sum(tile.nbytes for tile in backup.values()),
+            )
+        self._stroke_backup = {}
+
+    def add_point(self, x: float, y: float):
+        """Paint a single dab of the brush.
+
+        Parameters
+        ----------
+        x : float
+            The x coordinate, relative to the image.
+        y : float
+            The y coordinate, relative to the image.
+        """
+        self._paint_segment((int(x), int(y)), (int(x), int(y)))
+        self._draw_dirty_tiles()
+
+    def set_class(self, class_name: str):  # noqa: D001
+        pass
+
+    @property
+    def data(self) -> List[dict]:
+        """
+        The annotation data, as List[ Dict ].
+
+        There is one dictionary for each class that was painted, with the
+        following key / value combinations:
+
+        +------------------+---------------------------------------+
+        |``'type'``        | ``'mask'``                            |
+        +------------------+---------------------------------------+
+        |``'label'``       | ``<class label>``                     |
+        +------------------+---------------------------------------+
+        |``'rle'``         | ``<COCO-style uncompressed RLE>``     |
+        +------------------+---------------------------------------+
+
+        The run-length encoding is a dictionary with the ``'size'`` of the
+        image as [height, width], and the ``'counts'`` of alternating runs of
+        unpainted and painted pixels, in column-major order (see
+        `mask_to_rle`).
+        """
+        if self.mask is None:
+            return []
+        present = np.bincount(
+            self.mask.ravel(), minlength=len(self.labels) + 1
+        )
+        return [
+            {
+                "type": "mask",
+                "label": label,
+                "rle": mask_to_rle(self.mask == index),
+            }
+            for index, label in enumerate(self.labels, start=1)
+            if present[index]
+        ]
+
+    @data.setter  # type: ignore
+    @trigger_redraw
+    def data(self, value: List[dict]):
+        """Set the annotation data on this canvas.
+
+        Parameters
+        ----------
+        value : List[dict]
+            List of dictionaries, with keys `type`, `label`, and `rle`.
+        """
+        self.init_empty_data()
+        for annotation in value:
+            binary_mask = rle_to_mask(annotation["rle"])
+            if self.mask is None:
+                self.mask = np.zeros(binary_mask.shape, dtype=np.uint8)
+            elif binary_mask.shape != self.mask.shape:
+                raise ValueError(
+                    "The mask has size {}, but the image has size {}.".format(
+                        binary_mask.shape, self.mask.shape
+                    )
+                )
+            self.mask[binary_mask] = self._label_index(annotation["label"])
+
+    def _label_index(self, label: str) -> int:
+        if label not in self.labels:
+            if len(self.labels) == np.iinfo(np.uint8).max:
+                raise ValueError("A mask can only have 255 classes.")
+            self.labels.append(label)
+        return self.labels.index(label) + 1
+
+    def _brush_radius(self) -> float:
+        """The brush radius in image pixels (the brush size is on screen)."""
+        displayed_width = self.image_extent[2] - self.image_extent[0]
+        scale = self.original_width / max(displayed_width, 1)
+        return max(0.5, self.brush_size * scale / 2)
+
+    def _paint_segment(self, start: Tuple[int, int], end: Tuple[int, int]):
+        """Paint a straight stroke of the brush between two points."""
+        if self.mask is None:
+            return
+        if self.erasing:
+            value = 0
+        elif self.current_class is not None:
+            value = self._label_index(self.current_class)
+        else:
+            # there is no class to paint with:
+            return
+        radius = self._brush_radius()
+        height, width = self.mask.shape
+        (x0, y0), (x1, y1) = start, end
+        left = max(int(min(x0, x1) - radius), 0)
+        top = max(int(min(y0, y1) - radius), 0)
+        right = min(int(max(x0, x1) + radius) + 1, width)
+        bottom = min(int(max(y0, y1) + radius) + 1, height)
+        if left >= right or top >= bottom:
+            return
+
+        # the distance of each pixel to the segment:
+        ys, xs = np.ogrid[top:bottom, left:right]
+        dx, dy = x1 - x0, y1 - y0
+        length = dx * dx + dy * dy
+        if length:
+            t = np.clip(((xs - x0) * dx + (ys - y0) * dy) / length, 0, 1)
+        else:
+            t = np.zeros((1, 1))
+        inside = (xs - x0 - t * dx) ** 2 + (ys - y0 - t * dy) ** 2 <= (
+            radius * radius
+        )
+
+        self._backup_region(left, top, right, bottom)
+        self.mask[top:bottom, left:right][inside] = value
+        self._mark_dirty(left, top, right, bottom)
+
+    def _backup_region(self, left: int, top: int, right: int, bottom: int):
+        """Keep a copy of the mask tiles a stroke changes, to undo it."""
+        if self.mask is None:
+            return
+        for row in range(top // TILE_SIZE, (bottom - 1) // TILE_SIZE + 1):
+            for column in range(
+                left // TILE_SIZE, (right - 1) // TILE_SIZE + 1
+            ):
+                if (row, column) not in self._stroke_backup:
+                    self._stroke_backup[(row, column)] = self.mask[
+                        row * TILE_SIZE : (row + 1) * TILE_SIZE,
+                        column * TILE_SIZE : (column + 1) * TILE_SIZE,
+                    ].copy()
+
+    def _restore(self, backup: Dict[Tuple[int, int], np.ndarray]):
+        if self.mask is None:
+            return
+        for (row, column), tile in backup.items():
+            top, left = row * TILE_SIZE, column * TILE_SIZE
+            self.mask[
+                top : top + tile.shape[0], left : left + tile.shape[1]
+            ] = tile
+        self.re_draw()
+
+    def _mark_dirty(self, left: int, top: int, right: int, bottom: int):
+        """Mark the canvas tiles that show a region of the image as dirty."""
+        canvas_left, canvas_top = self.image_to_canvas_coordinates((left, top))
+        canvas_right, canvas_bottom = self.image_to_canvas_coordinates(
+            (right, bottom)
+        )
+        x0, y0 = self.image_extent[:2]
+        for row in range(
+            (canvas_top - y0) // TILE_SIZE,
+            (canvas_bottom - y0) // TILE_SIZE + 1,
+        ):
+            for column in range(
+                (canvas_left - x0) // TILE_SIZE,
+                (canvas_right - x0) // TILE_SIZE + 1,
+            ):
+                self._dirty_tiles.add((row, column))
+
+    def _draw_dirty_tiles(self):
+        x0, y0, x1, y1 = self.image_extent
+        with hold_canvas(self):
+            for row, column in sorted(self._dirty_tiles):
+                left, top = x0 + column * TILE_SIZE, y0 + row * TILE_SIZE
+                right = min(left + TILE_SIZE, x1)
+                bottom = min(top + TILE_SIZE, y1)
+                if left < right and top < bottom:
+                    self.annotation_canvas.clear_rect(
+                        left, top, right - left, bottom - top
+                    )
+                    self._draw_region(left, top, right, bottom)
+        self._dirty_tiles.clear()
+
+    def _draw_region(self, left: int, top: int, right: int, bottom: int):
+        """Draw the mask in a region of the canvas, at canvas resolution."""
+        if self.mask is None:
+            return
+        x0, y0, x1, y1 = self.image_extent
+        rows = (
+            (np.arange(top, bottom) - y0)
+            * self.original_height
+            // max(y1 - y0, 1)
+        )
+        columns = (
+            (np.arange(left, right) - x0)
+            * self.original_width
+            // max(x1 - x0, 1)
+        )
+        labels = self.mask[np.ix_(rows, columns)]
+        if labels.any():
+            self.annotation_canvas.put_image_data(
+                self._palette()[labels], left, top
+            )
+
+    def _palette(self) -> np.ndarray:
+        """The RGBA colour of each class index; the background is clear."""
+        palette = np.zeros((len(self.labels) + 1, 4), dtype=np.uint8)
+        for index, label in enumerate(self.labels, start=1):
+            palette[index, :3] = hex_to_rgb(
+                self.colormap.get(label, "#000000")
+            )
+            palette[index, 3] = round(255 * self.opacity)
+        return palette
+
+
+def mask_to_rle(mask: np.ndarray) -> dict:
+    """Encode a binary mask as COCO-style uncompressed run-length encoding.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        A (height, width) boolean array.
+
+    Returns
+    -------
+    dict
+        A dictionary with the ``size`` of the mask as [height, width], and the
+        ``counts`` of alternating runs of False and True values, in column-
+        major order, starting with False.
+    """
+    pixels = np.asarray(mask, dtype=bool).ravel(order="F")
+    changes = np.flatnonzero(pixels[1:] != pixels[:-1]) + 1
+    boundaries = np.concatenate(([0], changes, [pixels.size]))
+    counts = np.diff(boundaries).tolist()
+    if pixels.size and pixels[0]:
+        counts = [0] + counts
+    return {"size": list(mask.shape), "counts": counts}
+
+
+def rle_to_mask(rle: dict) -> np.ndarray:
+    """Decode COCO-style uncompressed run-length encoding to a binary mask.
+
+    Parameters
+    ----------
+    rle : dict
+        A dictionary with the ``size`` of the mask as [height, width], and the
+        ``counts`` of alternating runs of False and True values, in column-
+        major order, starting with False.
+
+    Returns
+    -------
+    np.ndarray
+        A (height, width) boolean array.
+    """
+    height, width = rle["size"]
+    counts = np.asarray(rle["counts"], dtype=np.int64)
+    values = np.arange(len(counts)) % 2 == 1
+    pixels = np.repeat(values, counts)
+    return pixels.reshape((height, width), order="F")
@@ -33,22 +33,18 @@ class PointAnnotationCanvas(AbstractAnnotationCanvas):
         """
 
         if not self.editing:
-            self.points.append(
-                Point((round(x), round(y)), label=self.current_class)
+            point = Point((round(x), round(y)), label=self.current_class)
+            self.points.append(point)
+            self._undo_queue.append(
+                self._undo_new_point,
+                lambda: self._redo_append(self.points, point),
             )
-            self._undo_queue.append(self._undo_new_point)
         elif self.editing:
             for point in self.points:
                 if dist((x, y), point.coordinates) < self.point_size:
-                    self.dragging = point.move
-                    old_coordinates = point.coordinates
-
-                    def undo_move():
-                        point.move(*old_coordinates)
-                        self.re_draw()
-
-                    self._undo_queue.append(undo_move)
-
+                    self.dragging = lambda x, y: self._change_shape(
+                        point, lambda: point.move(x, y)
+                    )
                     return
 
     @trigger_redraw
@@ -85,6 +81,7 @@ class PointAnnotationCanvas(AbstractAnnotationCanvas):
             in pixels
         """
 
+        self._finish_drag()
         self.dragging = None
 
     @trigger_redraw
@@ -1,5 +1,6 @@
+import weakref
 from math import pi
-from typing import List
+from typing import List, Optional, Tuple
 
 from ipycanvas import hold_canvas
 from traitlets import Bool, observe
@@ -7,15 +8,24 @@ from traitlets import Bool, observe
 from .abstract_canvas import AbstractAnnotationCanvas
 from .color_utils import hex_to_rgb, rgba_to_html_string
 from .image_utils import dist, only_inside_image, trigger_redraw
+from .segmentation import SegmentationAssistant
 from .shapes import Polygon
 
 
 class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
 
     editing = Bool(default_value=False)
+    assisting = Bool(default_value=False)
 
     current_polygon: Polygon
     polygons: List[Polygon]
+    _assist_box: Optional[List[Tuple[int, int]]] = None
+
+    def __init__(self, *args, **kwargs):  # noqa: D001
+        super().__init__(*args, **kwargs)
+        self._assistants: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
 
     @trigger_redraw
     @only_inside_image
@@ -23,7 +33,9 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
         """Handle a click.
 
         Either adds a point to the current / new polygon, or set the
-        dragging handler if in editing mode.
+        dragging handler if in editing mode. In assisting mode, this starts a
+        box around an object, or (if the mouse isn't dragged) marks a point on
+        it.
 
         Parameters
         ----------
@@ -31,7 +43,12 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
         y : float
         """
 
-        if not self.editing:
+        if not self.editing and self.assisting:
+            # a click, or the start of a box, for an assisted polygon:
+            self._assist_box = [(round(x), round(y))] * 2
+            self.dragging = self._drag_assist_box
+
+        elif not self.editing:
 
             x, y = round(x), round(y)
             self.current_polygon.append((x, y))
@@ -43,26 +60,26 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
                 # make new
                 self.current_polygon = Polygon(label=self.current_class)
                 self._undo_queue.append(
-                    self._undo_new_polygon
+                    self._undo_new_polygon, self._redo_new_polygon
                 )  # allow undoing
             else:
-                self._undo_queue.append(self._undo_new_point)
+                self._undo_queue.append(
+                    self._undo_new_point,
+                    lambda: self._redo_new_point((x, y)),
+                )
 
         elif self.editing:
             # see if the x / y is near any points
             for polygon in self.polygons + [self.current_polygon]:
                 for index, point in enumerate(polygon.points):
                     if dist(point, (x, y)) < self.point_size:
-                        self.dragging = lambda x, y: polygon.move_point(
-                            index, (x, y)
+                        self.dragging = lambda x, y: self._change_shape(
+                            polygon,
+                            lambda: polygon.move_point(index, (x, y)),
                         )
-
-                        def undo_move():
-                            polygon.move_point(index, point)
-                            self.re_draw()
-
-                        self._undo_queue.append(undo_move)
                         return
+            # otherwise, select the polygon the click is inside of:
+            self._select_shape(x, y)
 
     @trigger_redraw
     @only_inside_image
@@ -83,9 +100,40 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
 
     @trigger_redraw
     def on_release(self, x: float, y: float):  # noqa: D001
-        """Reset the drag function."""
+        """Reset the drag function, and finish any assisted polygon."""
 
+        self._finish_drag()
         self.dragging = None
+        if self._assist_box is not None:
+            (x0, y0), (x1, y1) = self._assist_box
+            self._assist_box = None
+            assistant = self._segmentation_assistant()
+            if dist((x0, y0), (x1, y1)) < self.point_size:
+                points = assistant.from_click(x0, y0)
+            else:
+                points = assistant.from_box(x0, y0, x1, y1)
+            if points:
+                polygon = Polygon(points=points, label=self.current_class)
+                self.polygons.append(polygon)
+                self._undo_queue.append(
+                    self._undo_assisted_polygon,
+                    lambda: self._redo_append(self.polygons, polygon),
+                )
+
+    def _selectable_shapes(self) -> List[Polygon]:
+        return self.polygons
+
+    def _drag_assist_box(self, x: int, y: int):
+        if self._assist_box is not None:
+            self._assist_box[1] = (x, y)
+
+    def _segmentation_assistant(self) -> SegmentationAssistant:
+        """The assistant for the current image, which caches its results."""
+        if self.current_image not in self._assistants:
+            self._assistants[self.current_image] = SegmentationAssistant(
+                self.current_image
+            )
+        return self._assistants[self.current_image]
 
     @trigger_redraw
     def set_class(self, name: str):  # noqa: D001
@@ -96,11 +144,25 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
     def _undo_new_point(self):
         self.current_polygon.points.pop()
 
+    @trigger_redraw
+    def _undo_assisted_polygon(self):
+        self.polygons.pop()
+
+    @trigger_redraw
+    def _redo_new_point(self, point: Tuple[int, int]):
+        self.current_polygon.points.append(point)
+
     @trigger_redraw
     def _undo_new_polygon(self):
         self.current_polygon = self.polygons.pop(-1)
         self.current_polygon.points.pop(-1)
 
+    @trigger_redraw
+    def _redo_new_polygon(self):
+        self.current_polygon.points.append(self.current_polygon.points[0])
+        self.polygons.append(self.current_polygon)
+        self.current_polygon = Polygon(label=self.current_class)
+
     @observe("point_size", "editing")
     def re_draw(self, _=None):  # noqa: D001
 
@@ -109,8 +171,23 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
             # draw all existing polygons:
             for polygon in self.polygons:
                 self.draw_polygon(polygon)
+            self._draw_selection()
             # draw the current polygon:
             self.draw_polygon(self.current_polygon, tentative=True)
+            # draw the box around an object for an assisted polygon:
+            if self._assist_box is not None:
+                self.draw_polygon(
+                    Polygon(
+                        points=[
+                            self._assist_box[0],
+                            (self._assist_box[1][0], self._assist_box[0][1]),
+                            self._assist_box[1],
+                            (self._assist_box[0][0], self._assist_box[1][1]),
+                        ],
+                        label=self.current_class,
+                    ),
+                    tentative=True,
+                )
 
     @observe("point_size")
     def _update_polygon_closing_threshold(self, change):
@@ -212,3 +289,4 @@ class PolygonAnnotationCanvas(AbstractAnnotationCanvas):
     def init_empty_data(self):
         self.polygons: List[Polygon] = []
         self.current_polygon: Polygon = Polygon(label=self.current_class)
+        self._clear_selection()
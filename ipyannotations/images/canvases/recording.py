@@ -0,0 +1,169 @@
+"""Record the draw commands that canvases send to the frontend.
+
+This makes it possible to measure the cost of drawing without a browser: the
+recorder captures every command a canvas issues, and the size of the messages
+that ipycanvas would send over the comm for them.
+"""
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Union
+
+from ipycanvas import Canvas, MultiCanvas
+from ipycanvas.canvas import _CMD_LIST
+from ipycanvas.utils import commands_to_buffer
+
+_ATTR_NAMES = {index: name for name, index in Canvas.ATTRS.items()}
+
+
+@dataclass
+class DrawCommand:
+    """A single draw command sent to a canvas layer.
+
+    Attributes
+    ----------
+    layer : int
+        The index of the canvas layer the command was sent to.
+    name : str
+        The name of the command, e.g. ``"lineTo"``. Attribute changes are
+        named after the attribute, e.g. ``"set:fill_style"``.
+    args : list
+        The (serialised) arguments of the command.
+    nbytes : int
+        The size of the command when serialised on its own, in bytes,
+        including any binary buffers.
+    """
+
+    layer: int
+    name: str
+    args: List[Any]
+    nbytes: int
+
+
+@dataclass
+class CanvasRecording:
+    """The draw commands and comm messages recorded from a canvas."""
+
+    commands: List[DrawCommand] = field(default_factory=list)
+    message_sizes: List[int] = field(default_factory=list)
+
+    @property
+    def n_commands(self) -> int:
+        """The number of draw commands issued."""
+        return len(self.commands)
+
+    @property
+    def n_messages(self) -> int:
+        """The number of comm messages sent (held commands are batched)."""
+        return len(self.message_sizes)
+
+    @property
+    def nbytes(self) -> int:
+        """The total size of all comm messages sent, in bytes."""
+        return sum(self.message_sizes)
+
+    def counts(self) -> Counter:
+        """The number of times each command was issued."""
+        return Counter(command.name for command in self.commands)
+
+    def clear(self):
+        """Discard everything recorded so far."""
+        self.commands.clear()
+        self.message_sizes.clear()
+
+
+class CanvasRecorder:
+    """A context manager that records what a canvas sends to the frontend.
+
+    The canvas keeps working as usual while it is being recorded, so it can
+    be used in tests and benchmarks on a headless machine.
+
+    Parameters
+    ----------
+    canvas : MultiCanvas or Canvas
+        The canvas to record. For a multi-canvas (like all annotation
+        canvases), commands sent to any of its layers are recorded.
+    """
+
+    def __init__(self, canvas: Union[MultiCanvas, Canvas]):
+        if isinstance(canvas, MultiCanvas):
+            self.layers: Sequence[Canvas] = list(canvas._canvases)
+        else:
+            self.layers = [canvas]
+        self.recording = CanvasRecording()
+        self._manager = self.layers[0]._canvas_manager
+        self._patched: Optional[dict] = None
+        self._sending = False
+        self._held = False
+
+    def __enter__(self) -> CanvasRecording:
+        manager = self._manager
+        self._patched = {
+            name: manager.__dict__.get(name)
+            for name in ("send_command", "_send_custom")
+        }
+        send_command = manager.send_command
+        send_custom = manager._send_custom
+
+        def recording_send_command(canvas, command, buffers=[]):
+            if not any(canvas is layer for layer in self.layers):
+                return send_command(canvas, command, buffers)
+            self._record_command(canvas, command, buffers)
+            self._sending = True
+            try:
+                return send_command(canvas, command, buffers)
+            finally:
+                self._sending = False
+                # held commands are sent when the canvas is flushed:
+                self._held = self._held or manager._caching
+
+        def recording_send_custom(command, buffers=[]):
+            # only messages with commands for the recorded layers count:
+            if self._sending or self._held:
+                self.recording.message_sizes.append(
+                    _message_size(command, buffers)
+                )
+                if not self._sending:
+                    # the held commands were flushed:
+                    self._held = False
+            return send_custom(command, buffers)
+
+        manager.send_command = recording_send_command
+        manager._send_custom = recording_send_custom
+        return self.recording
+
+    def __exit__(self, *args):
+        if self._patched is None:  # pragma: no cover
+            return
+        for name, previous in self._patched.items():
+            if previous is None:
+                del self._manager.__dict__[name]
+            else:
+                setattr(self._manager, name, previous)
+        self._patched = None
+
+    def _record_command(self, canvas: Canvas, command: list, buffers: list):
+        layer = next(
+            index
+            for index, candidate in enumerate(self.layers)
+            if candidate is canvas
+        )
+        name = _CMD_LIST[command[0]]
+        args = list(command[1]) if len(command) > 1 else []
+        if name == "set":
+            name = "set:" + _ATTR_NAMES.get(args[0], str(args[0]))
+        self.recording.commands.append(
+            DrawCommand(
+                layer=layer,
+                name=name,
+                args=args,
+                nbytes=_message_size(command, buffers),
+            )
+        )
+
+
+def _message_size(command: list, buffers: list) -> int:
+    metadata, command_buffer = commands_to_buffer(command)
+    return len(json.dumps(metadata)) + sum(
+        memoryview(buffer).nbytes for buffer in [command_buffer, *buffers]
+    )
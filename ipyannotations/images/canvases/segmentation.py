@@ -0,0 +1,388 @@
+"""Propose polygons around objects from a click or a box.
+
+The segmentation runs on a small copy of the image (at most
+``PROXY_SIZE`` pixels on each side), so it stays fast for large images:
+
+- a click grows a region of similar colour around the clicked pixel;
+- a box separates the colours inside it from the colours at its border, and
+  keeps the connected region nearest to its centre.
+
+The outline of the region is traced and simplified, and scaled back to image
+coordinates.
+"""
+
+import bisect
+import io
+from collections import OrderedDict
+from typing import Hashable, List, Tuple
+
+import ipywidgets as widgets
+import numpy as np
+from PIL import Image
+
+#: The largest side of the copy of the image that is segmented, in pixels.
+PROXY_SIZE = 256
+
+#: The number of segmentations that are cached for each image.
+CACHE_SIZE = 64
+
+Points = List[Tuple[int, int]]
+
+
+class SegmentationAssistant:
+    """Segment objects in an image, with a cache of the results.
+
+    Parameters
+    ----------
+    image : widgets.Image
+        The image to segment.
+    tolerance : float, optional
+        How different (in RGB, from 0 to 1) the colours in a region grown from
+        a click can be, by default 0.12.
+    simplification : float, optional
+        How far (in pixels of the segmented copy of the image) the simplified
+        outline can be from the traced one, by default 1.0.
+    """
+
+    def __init__(
+        self,
+        image: widgets.Image,
+        tolerance: float = 0.12,
+        simplification: float = 1.0,
+    ):
+        pil_image = Image.open(io.BytesIO(image.value))
+        self.image_size = pil_image.size
+        pil_image.draft("RGB", (PROXY_SIZE, PROXY_SIZE))
+        rgb_image = pil_image.convert("RGB")
+        rgb_image.thumbnail((PROXY_SIZE, PROXY_SIZE))
+        self.proxy = _smooth(np.asarray(rgb_image, dtype=np.float32) / 255)
+        self.scale = (
+            self.image_size[0] / self.proxy.shape[1],
+            self.image_size[1] / self.proxy.shape[0],
+        )
+        self.tolerance = tolerance
+        self.simplification = simplification
+        self._results: "OrderedDict[Hashable, Points]" = OrderedDict()
+
+    def from_click(self, x: float, y: float) -> Points:
+        """Outline the region of similar colour around a point.
+
+        Parameters
+        ----------
+        x, y : float
+            The point, in image coordinates.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The closed outline, in image coordinates, or an empty list if no
+            region was found.
+        """
+        column, row = self._to_proxy(x, y)
+        return self._cached(
+            ("click", row, column, self.tolerance),
+            lambda: grow_region(self.proxy, (row, column), self.tolerance),
+        )
+
+    def from_box(self, x0: float, y0: float, x1: float, y1: float) -> Points:
+        """Outline the object inside a box.
+
+        Parameters
+        ----------
+        x0, y0, x1, y1 : float
+            Two opposite corners of the box, in image coordinates.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The closed outline, in image coordinates, or an empty list if no
+            object was found.
+        """
+        left, top = self._to_proxy(min(x0, x1), min(y0, y1))
+        right, bottom = self._to_proxy(max(x0, x1), max(y0, y1))
+        return self._cached(
+            ("box", top, left, bottom, right),
+            lambda: segment_box(self.proxy, (top, left, bottom, right)),
+        )
+
+    def _cached(self, key: Hashable, segment) -> Points:
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+        mask = segment()
+        outline = simplify(trace_outline(mask), self.simplification)
+        # from the centres of the pixels of the copy to the image:
+        points = [
+            (
+                round((column + 0.5) * self.scale[0]),
+                round((row + 0.5) * self.scale[1]),
+            )
+            for row, column in outline
+        ]
+        if len(points) > 2:
+            points.append(points[0])
+        else:
+            points = []
+        self._results[key] = points
+        if len(self._results) > CACHE_SIZE:
+            self._results.popitem(last=False)
+        return points
+
+    def _to_proxy(self, x: float, y: float) -> Tuple[int, int]:
+        height, width = self.proxy.shape[:2]
+        column = min(max(int(x / self.scale[0]), 0), width - 1)
+        row = min(max(int(y / self.scale[1]), 0), height - 1)
+        return column, row
+
+
+def grow_region(
+    image: np.ndarray, seed: Tuple[int, int], tolerance: float
+) -> np.ndarray:
+    """The connected region of pixels with a similar colour to a seed.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        A (height, width, channels) float array.
+    seed : Tuple[int, int]
+        The (row, column) of the seed pixel.
+    tolerance : float
+        The largest distance between a pixel's colour and the seed colour.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask of the region.
+    """
+    colour = image[seed]
+    similar = np.linalg.norm(image - colour, axis=-1) <= tolerance
+    return connected_region(similar, seed)
+
+
+def segment_box(
+    image: np.ndarray, box: Tuple[int, int, int, int], iterations: int = 5
+) -> np.ndarray:
+    """Separate the object inside a box from its background.
+
+    The pixels at the border of the box are assumed to be background, and the
+    pixels in its middle to be the object. Each pixel in the box is then
+    assigned to whichever of the two has the closer mean colour, and the means
+    are updated from the assignment, a few times.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        A (height, width, channels) float array.
+    box : Tuple[int, int, int, int]
+        The top, left, bottom and right edge of the box (inclusive).
+    iterations : int, optional
+        The number of times the mean colours are updated, by default 5.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean mask of the object, the size of the image.
+    """
+    top, left, bottom, right = box
+    mask = np.zeros(image.shape[:2], dtype=bool)
+    crop = image[top : bottom + 1, left : right + 1]
+    height, width = crop.shape[:2]
+    if height < 3 or width < 3:
+        return mask
+
+    border = np.zeros((height, width), dtype=bool)
+    border[[0, -1], :] = border[:, [0, -1]] = True
+    background_colour = crop[border].mean(axis=0)
+    rows, columns = np.ogrid[:height, :width]
+    centre = (abs(rows - height / 2) < height / 4) & (
+        abs(columns - width / 2) < width / 4
+    )
+    foreground = np.broadcast_to(centre, (height, width))
+    for _ in range(iterations):
+        if not foreground.any():
+            return mask
+        foreground_colour = crop[foreground].mean(axis=0)
+        foreground = np.linalg.norm(
+            crop - foreground_colour, axis=-1
+        ) < np.linalg.norm(crop - background_colour, axis=-1)
+        foreground &= ~border
+    if not foreground.any():
+        return mask
+
+    # keep the region nearest to the centre of the box:
+    candidates = np.argwhere(foreground)
+    distances = np.abs(candidates - [height / 2, width / 2]).sum(axis=1)
+    seed = tuple(candidates[np.argmin(distances)])
+    mask[top : bottom + 1, left : right + 1] = connected_region(
+        foreground, seed
+    )
+    return mask
+
+
+def connected_region(mask: np.ndarray, seed: Tuple[int, int]) -> np.ndarray:
+    """The 4-connected region of a mask that contains a seed pixel.
+
+    The mask is split into runs of set pixels along each row, and the region
+    is grown from run to run: two runs in neighbouring rows are connected if
+    their columns overlap. This visits each run once, however winding the
+    region is.
+    """
+    region = np.zeros(mask.shape, dtype=bool)
+    if not mask[seed]:
+        return region
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    # each run's row, first column, and the column after it, in row order:
+    run_rows, run_starts = np.nonzero(edges == 1)
+    first_run = np.searchsorted(run_rows, np.arange(height + 1)).tolist()
+    rows, starts = run_rows.tolist(), run_starts.tolist()
+    ends = np.nonzero(edges == -1)[1].tolist()
+
+    seed_row, seed_column = seed
+    seed_run = bisect.bisect_right(
+        ends, seed_column, first_run[seed_row], first_run[seed_row + 1]
+    )
+    visited = [False] * len(starts)
+    visited[seed_run] = True
+    stack = [seed_run]
+    while stack:
+        run = stack.pop()
+        row, start, end = rows[run], starts[run], ends[run]
+        region[row, start:end] = True
+        for neighbour_row in (row - 1, row + 1):
+            if not 0 <= neighbour_row < height:
+                continue
+            low, high = first_run[neighbour_row], first_run[neighbour_row + 1]
+            # the runs that end after this one starts, and start before it
+            # ends:
+            first = bisect.bisect_right(ends, start, low, high)
+            last = bisect.bisect_left(starts, end, low, high)
+            for other in range(first, last):
+                if not visited[other]:
+                    visited[other] = True
+                    stack.append(other)
+    return region
+
+
+# the 8 neighbours of a pixel, clockwise from the one to the left:
+_NEIGHBOURS = [
+    (0, -1),
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, 1),
+    (1, 1),
+    (1, 0),
+    (1, -1),
+]
+
+
+def trace_outline(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Trace the outer boundary of the region in a mask.
+
+    This follows the boundary clockwise from its top-left pixel (Moore
+    neighbour tracing). If the mask has several regions, only the outline of
+    the first one (in row-major order) is traced.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The (row, column) of each boundary pixel, in order.
+    """
+    if not mask.any():
+        return []
+    padded = np.pad(mask, 1)
+    start = tuple(np.argwhere(padded)[0].tolist())
+    outline = [start]
+    # the search for the next pixel starts from the last background pixel:
+    current, backtrack = start, 0
+    while True:
+        for turn in range(8):
+            index = (backtrack + turn) % 8
+            candidate = (
+                current[0] + _NEIGHBOURS[index][0],
+                current[1] + _NEIGHBOURS[index][1],
+            )
+            if padded[candidate]:
+                break
+        else:
+            break  # a single pixel
+        if current == start and len(outline) > 1 and candidate == outline[1]:
+            break
+        previous = _NEIGHBOURS[(index - 1) % 8]
+        backtrack = _NEIGHBOURS.index(
+            (
+                current[0] + previous[0] - candidate[0],
+                current[1] + previous[1] - candidate[1],
+            )
+        )
+        current = candidate
+        outline.append(current)
+    if len(outline) > 1 and outline[-1] == start:
+        outline.pop()
+    return [(row - 1, column - 1) for row, column in outline]
+
+
+def simplify(points: List[Tuple[int, int]], tolerance: float) -> List:
+    """Simplify a closed outline with the Douglas-Peucker algorithm.
+
+    Parameters
+    ----------
+    points : List[Tuple[int, int]]
+        The points of the outline, in order.
+    tolerance : float
+        The largest distance of any removed point from the simplified
+        outline.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The points that were kept, in order.
+    """
+    if len(points) < 4:
+        return list(points)
+    array = np.asarray(points, dtype=float)
+    # split the closed outline at the point farthest from the first one:
+    farthest = int(np.argmax(np.linalg.norm(array - array[0], axis=1)))
+    closed = np.vstack([array, array[:1]])
+    keep = np.zeros(len(closed), dtype=bool)
+    keep[[0, farthest, len(closed) - 1]] = True
+    stack = [(0, farthest), (farthest, len(closed) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = closed[first], closed[last]
+        between = closed[first + 1 : last]
+        segment = end - start
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.linalg.norm(between - start, axis=1)
+        else:
+            offsets = between - start
+            distances = (
+                np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0])
+                / length
+            )
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            middle = first + 1 + index
+            keep[middle] = True
+            stack.extend([(first, middle), (middle, last)])
+    kept = closed[:-1][keep[:-1]].astype(int)
+    return [tuple(point) for point in kept.tolist()]
+
+
+def _smooth(image: np.ndarray) -> np.ndarray:
+    """Average each pixel with its neighbours, to reduce noise."""
+    padded = np.pad(image, ((1, 1), (1, 1), (0, 0)), mode="edge")
+    height, width = image.shape[:2]
+    total = np.zeros_like(image)
+    for d_row in range(3):
+        for d_column in range(3):
+            total += padded[
+                d_row : d_row + height, d_column : d_column + width
+            ]
+    return total / 9
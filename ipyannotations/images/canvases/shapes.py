@@ -1,7 +1,23 @@
 from dataclasses import dataclass, field
-from typing import ClassVar, List, Optional, Tuple
+from typing import ClassVar, List, Optional, Sequence, Tuple
 
-from .image_utils import dist
+
+def dist(q: Sequence[float], p: Sequence[float]) -> float:
+    """Euclidian distance between two points.
+
+    Parameters
+    ----------
+    q : Sequence[float]
+        Point q
+    p : Sequence[float]
+        Point p
+
+    Returns
+    -------
+    float
+        The distance between point q and p.
+    """
+    return (sum((px - qx) ** 2.0 for px, qx in zip(p, q))) ** 0.5
 
 
 @dataclass
@@ -66,6 +82,19 @@ class Polygon:
         point = (round(point[0]), round(point[1]))
         self.points[point_index] = point
 
+    def translate(self, dx: int, dy: int):
+        """Move the whole polygon.
+
+        Parameters
+        ----------
+        dx : int
+            The distance to move the polygon by along the x axis.
+        dy : int
+            The distance to move the polygon by along the y axis.
+        """
+        dx, dy = round(dx), round(dy)
+        self.points = [(x + dx, y + dy) for x, y in self.points]
+
     @property
     def data(self):
         return {"type": "polygon", "label": self.label, "points": self.points}
@@ -107,6 +136,17 @@ class Point:
         """
         self.coordinates = (round(x), round(y))
 
+    def translate(self, dx: int, dy: int):
+        """Move a point by a distance.
+
+        Parameters
+        ----------
+        dx : int
+        dy : int
+        """
+        x, y = self.coordinates
+        self.move(x + dx, y + dy)
+
     @property
     def data(self) -> dict:
         return {
@@ -159,6 +199,20 @@ class BoundingBox:
         new_xy[y_idx] = round(new_y)
         self.xyxy = tuple(new_xy)  # type: ignore
 
+    def translate(self, dx: int, dy: int):
+        """Move the whole box.
+
+        Parameters
+        ----------
+        dx : int
+            The distance to move the box by along the x axis.
+        dy : int
+            The distance to move the box by along the y axis.
+        """
+        dx, dy = round(dx), round(dy)
+        x0, y0, x1, y1 = self.xyxy
+        self.xyxy = (x0 + dx, y0 + dy, x1 + dx, y1 + dy)
+
     @property
     def corners(self) -> List[Tuple[int, int]]:
         x0, y0, x1, y1 = self.xyxy
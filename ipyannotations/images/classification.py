@@ -1,8 +1,10 @@
-from typing import Sequence
+from typing import Optional, Sequence
 from functools import partial
 
+import IPython.display
+
 from .. import generic
-from .display import image_display_function
+from .display import image_display_function, image_thumbnail
 
 
 class ClassLabeller(generic.ClassLabeller):
@@ -82,3 +84,47 @@ class MulticlassLabeller(generic.MulticlassLabeller):
             *args,
             **kwargs,
         )  # type: ignore
+
+
+class BatchClassLabeller(generic.BatchClassLabeller):
+    def __init__(
+        self,
+        options: Sequence[str] = (),
+        page_size: int = 12,
+        n_columns: int = 4,
+        default_option: Optional[str] = None,
+        thumbnail_size=(150, 150),
+        *args,
+        **kwargs,
+    ):
+        """Create a widget for labelling a page of images at once.
+
+        The images are loaded and shrunk to thumbnails in background threads.
+
+        Parameters
+        ----------
+        options : Sequence[str], optional
+            The classes to be assigned, by default ()
+        page_size : int, optional
+            The largest number of images on a page, by default 12
+        n_columns : int, optional
+            The number of columns in the grid, by default 4
+        default_option : str, optional
+            The class chosen for images without a prediction, by default the
+            first option.
+        thumbnail_size : tuple(int, int)
+            The size each image is displayed at, in pixels.
+        """
+
+        super().__init__(
+            options=options,
+            page_size=page_size,
+            n_columns=n_columns,
+            default_option=default_option,
+            display_function=IPython.display.display,
+            preprocess_function=partial(
+                image_thumbnail, fit_into=thumbnail_size
+            ),
+            *args,
+            **kwargs,
+        )  # type: ignore
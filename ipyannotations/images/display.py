@@ -1,14 +1,22 @@
+import os
 import pathlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from functools import singledispatch
-from typing import Tuple
+from typing import Hashable, Iterable, Optional, Tuple, Union
 
 import IPython.display
 import numpy as np
 from PIL import Image, ImageOps
 
+from .normalize import to_uint8
+
 
 @singledispatch
-def image_display_function(image, fit_into=(500, 500)) -> None:
+def image_display_function(
+    image, fit_into=(500, 500), percentiles=None
+) -> None:
     """Display an image.
 
     Parameters
@@ -19,6 +27,12 @@ def image_display_function(image, fit_into=(500, 500)) -> None:
         What size the image should fit into, by default (500, 500). The image
         is scaled so that no side is larger than the corresponding pixels given
         here.
+    percentiles : tuple(float, float), optional
+        For arrays: the intensity window, as percentiles of the values in the
+        array, for example (1, 99) to ignore outliers (see `to_uint8`). By
+        default, arrays that aren't 8-bit are scaled from their smallest to
+        their largest value. Use ``functools.partial`` to pass this to an
+        annotator as its ``display_function``.
     """
     raise NotImplementedError(
         "You passed an object of type {}, but image_display_function ".format(
@@ -30,16 +44,19 @@ def image_display_function(image, fit_into=(500, 500)) -> None:
 
 @image_display_function.register(pathlib.Path)
 def _image_display_function_path(
-    image: pathlib.Path, fit_into: Tuple[int, int] = (500, 500)
+    image: pathlib.Path,
+    fit_into: Tuple[int, int] = (500, 500),
+    percentiles: Optional[Tuple[float, float]] = None,
 ) -> None:
-    """Path -> Image"""
-    image = Image.open(image)
-    image_display_function(image)
+    """Path -> (cached) thumbnail -> display & finish"""
+    IPython.display.display(image_thumbnail(image, fit_into=fit_into))
 
 
 @image_display_function.register(str)
 def _image_display_function_str(
-    image: str, fit_into: Tuple[int, int] = (500, 500)
+    image: str,
+    fit_into: Tuple[int, int] = (500, 500),
+    percentiles: Optional[Tuple[float, float]] = None,
 ) -> None:
     """str -> Path"""
     path_image: pathlib.Path = pathlib.Path(image)
@@ -48,25 +65,232 @@ def _image_display_function_str(
 
 @image_display_function.register(np.ndarray)
 def _image_display_function_array(
-    image: np.ndarray, fit_into: Tuple[int, int] = (500, 500)
+    image: np.ndarray,
+    fit_into: Tuple[int, int] = (500, 500),
+    percentiles: Optional[Tuple[float, float]] = None,
 ) -> None:
     """np.ndarray -> Image"""
-    image = 255 * (image / image.max())
-    image = image.astype(np.uint8)
-    image = Image.fromarray(image)
-
-    image_display_function(image, fit_into=fit_into)
+    image_display_function(
+        Image.fromarray(to_uint8(image, percentiles)), fit_into
+    )
 
 
 @image_display_function.register(Image.Image)
 def _image_display_function_pillow(
-    image: Image.Image, fit_into: Tuple[int, int] = (500, 500)
+    image: Image.Image,
+    fit_into: Tuple[int, int] = (500, 500),
+    percentiles: Optional[Tuple[float, float]] = None,
 ):
     """Image -> display & finish"""
-    if image.size < fit_into:
-        factor = max(s1 / s2 for s1, s2 in zip(image.size, fit_into))
-        image = image.resize((int(s / factor) for s in image.size))
+    IPython.display.display(_fit(image, fit_into))
+
+
+def image_thumbnail(
+    image: Union[Image.Image, np.ndarray, str, pathlib.Path],
+    fit_into: Tuple[int, int] = (150, 150),
+    percentiles: Optional[Tuple[float, float]] = None,
+) -> Image.Image:
+    """Load an image, and scale it to fit into a size.
+
+    Thumbnails of image files are cached, so displaying the same file at the
+    same size again doesn't read it again (unless it was modified).
+
+    Parameters
+    ----------
+    image : Pillow.Image.Image, np.ndarray, str, pathlib.Path
+        a Pillow / PIL image, or the array data for it, or a path to an image.
+    fit_into : tuple, optional
+        The size the thumbnail should fit into, by default (150, 150).
+    percentiles : tuple(float, float), optional
+        For arrays: the intensity window, as percentiles of the values in the
+        array (see `image_display_function`).
+
+    Returns
+    -------
+    Image.Image
+        The thumbnail, with its contrast adjusted like `image_display_function`
+        does.
+    """
+    if isinstance(image, np.ndarray):
+        return _fit(Image.fromarray(to_uint8(image, percentiles)), fit_into)
+    elif isinstance(image, Image.Image):
+        return _fit(image, fit_into)
+
+    path = pathlib.Path(image)
+    key = _cache_key(path, fit_into)
+    thumbnail = _THUMBNAIL_CACHE.get(key) if key is not None else None
+    if thumbnail is not None:
+        return thumbnail
+    thumbnail = _thumbnail_from_file(path, fit_into)
+    if key is not None:
+        _THUMBNAIL_CACHE.put(key, thumbnail)
+    return thumbnail
+
+
+def precompute_thumbnails(
+    paths: Iterable[Union[str, pathlib.Path]],
+    fit_into: Tuple[int, int] = (500, 500),
+    max_workers: Optional[int] = None,
+) -> int:
+    """Create the thumbnails for many image files in parallel processes.
+
+    Displaying these images at this size afterwards uses the cached
+    thumbnails. Only as many thumbnails are kept as fit into the cache (see
+    `set_thumbnail_cache_size`), so precompute the images you will look at
+    next, rather than a whole dataset at once.
+
+    Parameters
+    ----------
+    paths : Iterable[str, pathlib.Path]
+        The image files.
+    fit_into : tuple, optional
+        The size the images will be displayed at, by default (500, 500).
+    max_workers : int, optional
+        The number of processes, by default the number of CPUs.
+
+    Returns
+    -------
+    int
+        The number of thumbnails that were created.
+    """
+    keys = {}
+    for path in map(pathlib.Path, paths):
+        key = _cache_key(path, fit_into)
+        if key is not None and key not in _THUMBNAIL_CACHE:
+            keys[key] = path
+    if not keys:
+        return 0
+    with ProcessPoolExecutor(max_workers) as executor:
+        thumbnails = executor.map(
+            _thumbnail_from_file,
+            keys.values(),
+            [fit_into] * len(keys),
+            chunksize=max(1, len(keys) // (4 * (os.cpu_count() or 1))),
+        )
+        for key, thumbnail in zip(keys, thumbnails):
+            _THUMBNAIL_CACHE.put(key, thumbnail)
+    return len(keys)
+
+
+def set_thumbnail_cache_size(max_bytes: int):
+    """Set how much memory cached thumbnails can use.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The size of the cache, in bytes (by default 128 MiB). The least
+        recently used thumbnails are dropped first.
+    """
+    _THUMBNAIL_CACHE.max_bytes = max_bytes
+    _THUMBNAIL_CACHE.evict()
+
+
+def clear_thumbnail_cache():
+    """Drop all cached thumbnails."""
+    _THUMBNAIL_CACHE.clear()
+
+
+class _ThumbnailCache:
+    """A least-recently-used cache of images, limited by their size.
+
+    Thumbnails are loaded from several threads (for example by the batch
+    labellers), so the cache is only changed while holding a lock.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._images: "OrderedDict[Hashable, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._images
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._images)
+
+    def get(
+        self, key: Hashable, default: Optional[Image.Image] = None
+    ) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                return default
+            self._images.move_to_end(key)
+            return image
+
+    def put(self, key: Hashable, image: Image.Image):
+        with self._lock:
+            if key in self._images:
+                self.nbytes -= _image_nbytes(self._images.pop(key))
+            self._images[key] = image
+            self.nbytes += _image_nbytes(image)
+            self._evict()
+
+    def evict(self):
+        with self._lock:
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self.nbytes = 0
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._images:
+            _, image = self._images.popitem(last=False)
+            self.nbytes -= _image_nbytes(image)
+
+
+_THUMBNAIL_CACHE = _ThumbnailCache(max_bytes=128 * 1024 * 1024)
+
+
+def _cache_key(
+    path: pathlib.Path, fit_into: Tuple[int, int]
+) -> Optional[Hashable]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (
+        str(path.resolve()),
+        stat.st_mtime_ns,
+        stat.st_size,
+        tuple(fit_into),
+    )
+
+
+def _thumbnail_from_file(
+    path: pathlib.Path, fit_into: Tuple[int, int]
+) -> Image.Image:
+    image = Image.open(path)
+    size, factor = _fitted_size(image.size, fit_into)
+    if factor > 1:
+        # JPEGs can be decoded at a reduced scale directly:
+        image.draft(image.mode, size)
+    return _fit(image, fit_into)
+
+
+def _fitted_size(
+    size: Tuple[int, int], fit_into: Tuple[int, int]
+) -> Tuple[Tuple[int, int], float]:
+    factor = max(s1 / s2 for s1, s2 in zip(size, fit_into))
+    width, height = (max(1, int(s / factor)) for s in size)
+    return (width, height), factor
+
+
+def _fit(image: Image.Image, fit_into: Tuple[int, int]) -> Image.Image:
+    """Scale an image to fit into a size, and adjust its contrast."""
+    size, factor = _fitted_size(image.size, fit_into)
+    if factor > 1:
+        # reducing by whole factors before resampling is much faster:
+        image = image.resize(size, reducing_gap=2.0)
+    elif factor < 1:
+        image = image.resize(size)
+    return ImageOps.autocontrast(image)
 
-    image = ImageOps.autocontrast(image)
 
-    IPython.display.display(image)
+def _image_nbytes(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
@@ -0,0 +1,435 @@
+"""Export image annotations to COCO, Pascal VOC and YOLO datasets.
+
+The exporters take an iterable of `AnnotatedImage` records, for example a
+`Journal` of submitted annotations, and write each record as soon as it is
+read, so exporting uses the same amount of memory however large the dataset
+is. The annotations are the ``data`` of the image annotation widgets:
+polygons, boxes, points and masks.
+"""
+import json
+import pathlib
+import shutil
+import tempfile
+import xml.etree.ElementTree as ElementTree
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from PIL import Image
+
+from .canvases.analytics import bounding_boxes, polygon_areas
+from .canvases.mask import rle_to_mask
+
+PathLike = Union[str, pathlib.Path]
+
+
+class AnnotatedImage(NamedTuple):
+    """An image, and the annotation data for it.
+
+    Attributes
+    ----------
+    image : str
+        The path to the image file, which is used to name the image in the
+        exported dataset.
+    data : List[dict]
+        The annotations, in the format of the annotation widgets' ``data``.
+    size : Optional[Tuple[int, int]]
+        The (width, height) of the image. If None, the size is read from the
+        header of the image file when it is needed.
+    """
+
+    image: str
+    data: List[dict]
+    size: Optional[Tuple[int, int]] = None
+
+
+class Journal:
+    """A file that annotations are appended to as they are submitted.
+
+    Each record is one line of JSON, so a journal can grow during a labelling
+    session without being loaded, and can be exported (by iterating over it)
+    one record at a time.
+
+    Parameters
+    ----------
+    path : str, pathlib.Path
+        The journal file. It is created when the first record is appended.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = pathlib.Path(path)
+
+    def append(
+        self,
+        image: PathLike,
+        data: List[dict],
+        size: Optional[Tuple[int, int]] = None,
+    ):
+        """Add the annotations for an image to the journal.
+
+        Parameters
+        ----------
+        image : str, pathlib.Path
+            The path to the image file.
+        data : List[dict]
+            The annotations, for example the ``data`` of an image annotation
+            widget.
+        size : Tuple[int, int], optional
+            The (width, height) of the image, if it is known.
+        """
+        record: Dict[str, Any] = {"image": str(image), "data": data}
+        if size is not None:
+            record["size"] = list(size)
+        with self.path.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def __iter__(self) -> Iterator[AnnotatedImage]:
+        if not self.path.exists():
+            return
+        with self.path.open() as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    size = record.get("size")
+                    yield AnnotatedImage(
+                        record["image"],
+                        record["data"],
+                        tuple(size) if size is not None else None,
+                    )
+
+
+def export_coco(
+    records: Iterable[Union[AnnotatedImage, tuple]],
+    path: PathLike,
+    categories: Sequence[str] = (),
+) -> int:
+    """Write annotations to a COCO dataset file.
+
+    Polygons are exported with their segmentation, boxes with only a
+    bounding box, points as keypoint annotations with one keypoint, and masks
+    as (uncompressed) run-length encoded "crowd" segmentations.
+
+    Parameters
+    ----------
+    records : Iterable[AnnotatedImage]
+        The images and their annotations. Tuples of (image, data) or
+        (image, data, size) work as well.
+    path : str, pathlib.Path
+        The JSON file to write.
+    categories : Sequence[str], optional
+        The classes, in the order of their category ids (starting at 1).
+        Classes that aren't in this list get the next ids, in the order they
+        appear in.
+
+    Returns
+    -------
+    int
+        The number of images that were written.
+    """
+    category_ids = _CategoryIds(categories, start=1)
+    n_images = n_annotations = 0
+    with open(path, "w") as f, tempfile.TemporaryFile("w+") as annotations:
+        # images and annotations are separate lists in COCO, so annotations
+        # are written to a temporary file until all images were written:
+        f.write('{"images": [')
+        for image_id, record in enumerate(map(_record, records), start=1):
+            width, height = _image_size(record)
+            image = {
+                "id": image_id,
+                "file_name": record.image,
+                "width": width,
+                "height": height,
+            }
+            f.write((", " if image_id > 1 else "") + json.dumps(image))
+            for annotation, coco_annotation in _coco_annotations(record.data):
+                n_annotations += 1
+                coco_annotation.update(
+                    id=n_annotations,
+                    image_id=image_id,
+                    category_id=category_ids[annotation.get("label")],
+                )
+                annotations.write(
+                    (", " if n_annotations > 1 else "")
+                    + json.dumps(coco_annotation)
+                )
+            n_images += 1
+
+        f.write('], "annotations": [')
+        annotations.seek(0)
+        shutil.copyfileobj(annotations, f)
+        f.write('], "categories": ')
+        json.dump(
+            [
+                {"id": category_id, "name": name, "supercategory": ""}
+                for name, category_id in category_ids.items()
+            ],
+            f,
+        )
+        f.write("}")
+    return n_images
+
+
+def export_voc(
+    records: Iterable[Union[AnnotatedImage, tuple]], directory: PathLike
+) -> int:
+    """Write annotations to Pascal VOC XML files, one for each image.
+
+    Each file is named after its image file, with the extension ``.xml``.
+    Pascal VOC only has bounding boxes, so polygons and masks are exported
+    with the box around them, and points are left out.
+
+    Parameters
+    ----------
+    records : Iterable[AnnotatedImage]
+        The images and their annotations. Tuples of (image, data) or
+        (image, data, size) work as well.
+    directory : str, pathlib.Path
+        The directory to write the files to. It is created if needed.
+
+    Returns
+    -------
+    int
+        The number of files that were written.
+    """
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    n_files = 0
+    for record in map(_record, records):
+        width, height = _image_size(record)
+        root = ElementTree.Element("annotation")
+        image_path = pathlib.Path(record.image)
+        _sub_element(root, "folder", image_path.parent.name)
+        _sub_element(root, "filename", image_path.name)
+        size = _sub_element(root, "size")
+        _sub_element(size, "width", width)
+        _sub_element(size, "height", height)
+        _sub_element(size, "depth", 3)
+        for annotation in record.data:
+            box = _bounding_box(annotation)
+            if box is None:
+                continue
+            voc_object = _sub_element(root, "object")
+            _sub_element(voc_object, "name", annotation.get("label"))
+            _sub_element(voc_object, "difficult", 0)
+            bndbox = _sub_element(voc_object, "bndbox")
+            for key, value in zip(("xmin", "ymin", "xmax", "ymax"), box):
+                _sub_element(bndbox, key, round(value))
+        ElementTree.ElementTree(root).write(
+            directory / (image_path.stem + ".xml"), encoding="unicode"
+        )
+        n_files += 1
+    return n_files
+
+
+def export_yolo(
+    records: Iterable[Union[AnnotatedImage, tuple]],
+    directory: PathLike,
+    categories: Sequence[str] = (),
+) -> int:
+    """Write annotations to YOLO text files, one for each image.
+
+    Each file is named after its image file, with the extension ``.txt``.
+    Boxes are written as ``class x_center y_center width height`` and
+    polygons as ``class x1 y1 x2 y2 ...`` (the YOLO segmentation format),
+    relative to the size of the image. Masks are exported with the box
+    around them, and points are left out. The class names are written to
+    ``classes.txt``, one per line, in the order of their ids.
+
+    Parameters
+    ----------
+    records : Iterable[AnnotatedImage]
+        The images and their annotations. Tuples of (image, data) or
+        (image, data, size) work as well.
+    directory : str, pathlib.Path
+        The directory to write the files to. It is created if needed.
+    categories : Sequence[str], optional
+        The classes, in the order of their ids (starting at 0). Classes that
+        aren't in this list get the next ids, in the order they appear in.
+
+    Returns
+    -------
+    int
+        The number of image files that were written.
+    """
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    category_ids = _CategoryIds(categories, start=0)
+    n_files = 0
+    for record in map(_record, records):
+        width, height = _image_size(record)
+        scale = np.array([width, height], dtype=float)
+        lines = []
+        for annotation in record.data:
+            category_id = category_ids[annotation.get("label")]
+            if annotation["type"] == "polygon":
+                points = _polygon_points(annotation) / scale
+                if len(points) < 3:
+                    continue
+                values = points.ravel().tolist()
+            else:
+                box = _bounding_box(annotation)
+                if box is None:
+                    continue
+                (x0, y0), (x1, y1) = np.reshape(box, (2, 2)) / scale
+                values = [(x0 + x1) / 2, (y0 + y1) / 2, x1 - x0, y1 - y0]
+            lines.append(
+                " ".join(
+                    [str(category_id)]
+                    + ["{:.6f}".format(value) for value in values]
+                )
+            )
+        path = directory / (pathlib.Path(record.image).stem + ".txt")
+        path.write_text("".join(line + "\n" for line in lines))
+        n_files += 1
+    (directory / "classes.txt").write_text(
+        "".join("{}\n".format(name) for name in category_ids)
+    )
+    return n_files
+
+
+class _CategoryIds(Dict[Optional[str], int]):
+    """Category ids by class name, which are assigned on first use."""
+
+    def __init__(self, categories: Sequence[str], start: int):
+        super().__init__(
+            (name, category_id)
+            for category_id, name in enumerate(categories, start=start)
+        )
+        self.start = start
+
+    def __missing__(self, name: Optional[str]) -> int:
+        self[name] = category_id = self.start + len(self)
+        return category_id
+
+
+def _record(record: Union[AnnotatedImage, tuple]) -> AnnotatedImage:
+    if isinstance(record, AnnotatedImage):
+        return record
+    return AnnotatedImage(str(record[0]), *record[1:])
+
+
+def _image_size(record: AnnotatedImage) -> Tuple[int, int]:
+    if record.size is not None:
+        return record.size
+    try:
+        # only the header of the file is read:
+        with Image.open(record.image) as image:
+            return image.size
+    except (OSError, ValueError):
+        raise ValueError(
+            "The size of {} is not known, and it could not be read from the "
+            "image file.".format(record.image)
+        ) from None
+
+
+def _coco_annotations(data: List[dict]) -> Iterator[Tuple[dict, dict]]:
+    """Each annotation that can be exported, with its COCO annotation."""
+    polygons = [
+        _polygon_points(annotation)
+        for annotation in data
+        if annotation["type"] == "polygon"
+    ]
+    # the statistics of all polygons of an image are computed at once:
+    areas, boxes = polygon_areas(polygons), bounding_boxes(polygons)
+    polygon_index = 0
+    for annotation in data:
+        if annotation["type"] == "polygon":
+            points = polygons[polygon_index]
+            area, (x0, y0, x1, y1) = areas[polygon_index], boxes[polygon_index]
+            polygon_index += 1
+            if len(points):
+                yield annotation, {
+                    "segmentation": [points.ravel().tolist()],
+                    "area": float(area),
+                    "bbox": [
+                        float(x0),
+                        float(y0),
+                        float(x1 - x0),
+                        float(y1 - y0),
+                    ],
+                    "iscrowd": 0,
+                }
+        else:
+            coco_annotation = _coco_annotation(annotation)
+            if coco_annotation is not None:
+                yield annotation, coco_annotation
+
+
+def _coco_annotation(annotation: dict) -> Optional[dict]:
+    type_ = annotation["type"]
+    box = _bounding_box(annotation)
+    if type_ == "box" and box is not None:
+        x0, y0, x1, y1 = box
+        return {
+            "segmentation": [],
+            "area": float((x1 - x0) * (y1 - y0)),
+            "bbox": [float(x0), float(y0), float(x1 - x0), float(y1 - y0)],
+            "iscrowd": 0,
+        }
+    elif type_ == "point":
+        x, y = annotation["coordinates"]
+        return {
+            "keypoints": [x, y, 2],
+            "num_keypoints": 1,
+            "area": 0.0,
+            "bbox": [float(x), float(y), 0.0, 0.0],
+            "iscrowd": 0,
+        }
+    elif type_ == "mask" and box is not None:
+        # masks without painted pixels are skipped, as in the other formats:
+        rle = annotation["rle"]
+        x0, y0, x1, y1 = box
+        return {
+            "segmentation": rle,
+            "area": float(sum(rle["counts"][1::2])),
+            "bbox": [float(x0), float(y0), float(x1 - x0), float(y1 - y0)],
+            "iscrowd": 1,
+        }
+    return None
+
+
+def _polygon_points(annotation: dict) -> np.ndarray:
+    points = np.asarray(annotation["points"], dtype=float).reshape(-1, 2)
+    if len(points) > 1 and (points[0] == points[-1]).all():
+        # the closing point repeats the first one
+        points = points[:-1]
+    return points
+
+
+def _bounding_box(annotation: dict) -> Optional[Tuple[float, ...]]:
+    """The (x0, y0, x1, y1) box around an annotation, if it has an area."""
+    type_ = annotation["type"]
+    if type_ == "box":
+        x0, y0, x1, y1 = annotation["xyxy"]
+        return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+    elif type_ == "polygon":
+        box = bounding_boxes([_polygon_points(annotation)])[0]
+        return None if np.isnan(box).any() else tuple(box)
+    elif type_ == "mask":
+        mask = rle_to_mask(annotation["rle"])
+        rows, columns = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(
+            mask.any(axis=0)
+        )
+        if not len(rows):
+            return None
+        return (columns[0], rows[0], columns[-1] + 1, rows[-1] + 1)
+    return None
+
+
+def _sub_element(
+    parent: ElementTree.Element, tag: str, text: Optional[object] = None
+) -> ElementTree.Element:
+    element = ElementTree.SubElement(parent, tag)
+    if text is not None:
+        element.text = str(text)
+    return element
@@ -0,0 +1,496 @@
+"""Import pre-annotations, such as model predictions, onto the canvases.
+
+Setting the ``data`` of a canvas converts and checks one dictionary at a
+time. The importers here take arrays of coordinates instead: they check and
+clip all coordinates against the size of the image at once, build the
+canvas's shapes directly from the result, and re-draw the canvas once. They
+accept plain arrays, COCO datasets and YOLO label files.
+"""
+
+import json
+import pathlib
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .canvases.abstract_canvas import AbstractAnnotationCanvas
+from .canvases.box import BoundingBoxAnnotationCanvas
+from .canvases.point import PointAnnotationCanvas
+from .canvases.polygon import PolygonAnnotationCanvas
+from .canvases.shapes import BoundingBox, Point, Polygon
+
+BOX_FORMATS = ("xyxy", "xywh", "cxcywh")
+
+Labels = Union[str, Sequence[Optional[str]], None]
+
+
+def import_boxes(
+    target,
+    boxes: np.ndarray,
+    labels: Labels = None,
+    box_format: str = "xyxy",
+    normalized: bool = False,
+    replace: bool = True,
+) -> int:
+    """Add boxes to a bounding box canvas.
+
+    The boxes are clipped to the image, and boxes that have no area inside
+    the image are left out.
+
+    Parameters
+    ----------
+    target : BoundingBoxAnnotationCanvas, BoxAnnotator
+        The canvas, or the annotator whose canvas to add the boxes to.
+    boxes : np.ndarray
+        A (n_boxes, 4) array of box coordinates.
+    labels : str, Sequence[str], optional
+        The label of each box, or one label for all boxes. By default, the
+        canvas's current class.
+    box_format : str, optional
+        "xyxy" for two opposite corners, "xywh" for the top left corner and
+        the size, or "cxcywh" for the centre and the size. By default "xyxy".
+    normalized : bool, optional
+        Whether the coordinates are relative to the size of the image (from 0
+        to 1), rather than in pixels. By default False.
+    replace : bool, optional
+        Whether the boxes replace the canvas's annotations, by default True.
+        Otherwise, they are added to them, and can be undone in one go.
+
+    Returns
+    -------
+    int
+        The number of boxes that were added.
+    """
+    canvas = _canvas(target, BoundingBoxAnnotationCanvas)
+    if box_format not in BOX_FORMATS:
+        raise ValueError(
+            "The box format should be one of {}, not {}.".format(
+                BOX_FORMATS, box_format
+            )
+        )
+    boxes = _coordinates(boxes, 4, "boxes")
+    labels = _labels(labels, len(boxes), canvas)
+    if box_format == "xywh":
+        boxes = np.hstack([boxes[:, :2], boxes[:, :2] + boxes[:, 2:]])
+    elif box_format == "cxcywh":
+        half_size = boxes[:, 2:] / 2
+        boxes = np.hstack([boxes[:, :2] - half_size, boxes[:, :2] + half_size])
+    boxes = _to_pixels(boxes.reshape(-1, 2, 2), canvas, normalized)
+    boxes = np.hstack([boxes.min(axis=1), boxes.max(axis=1)])
+    keep = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+    shapes = [
+        BoundingBox(tuple(xyxy), label)
+        for xyxy, label in zip(
+            boxes[keep].tolist(), np.asarray(labels, dtype=object)[keep]
+        )
+    ]
+    _add_shapes(canvas, shapes, replace)
+    return len(shapes)
+
+
+def import_points(
+    target,
+    points: np.ndarray,
+    labels: Labels = None,
+    normalized: bool = False,
+    replace: bool = True,
+) -> int:
+    """Add points to a point canvas.
+
+    The points are clipped to the image.
+
+    Parameters
+    ----------
+    target : PointAnnotationCanvas, PointAnnotator
+        The canvas, or the annotator whose canvas to add the points to.
+    points : np.ndarray
+        A (n_points, 2) array of x and y coordinates.
+    labels : str, Sequence[str], optional
+        The label of each point, or one label for all points. By default, the
+        canvas's current class.
+    normalized : bool, optional
+        Whether the coordinates are relative to the size of the image (from 0
+        to 1), rather than in pixels. By default False.
+    replace : bool, optional
+        Whether the points replace the canvas's annotations, by default True.
+        Otherwise, they are added to them, and can be undone in one go.
+
+    Returns
+    -------
+    int
+        The number of points that were added.
+    """
+    canvas = _canvas(target, PointAnnotationCanvas)
+    points = _coordinates(points, 2, "points")
+    labels = _labels(labels, len(points), canvas)
+    points = _to_pixels(points, canvas, normalized)
+    # without a class, points get the empty default label of a Point:
+    shapes = [
+        Point(tuple(coordinates), label if label is not None else "")
+        for coordinates, label in zip(points.tolist(), labels)
+    ]
+    _add_shapes(canvas, shapes, replace)
+    return len(shapes)
+
+
+def import_polygons(
+    target,
+    polygons: Sequence[np.ndarray],
+    labels: Labels = None,
+    normalized: bool = False,
+    replace: bool = True,
+) -> int:
+    """Add polygons to a polygon canvas.
+
+    The points of all polygons are clipped to the image in one go. Polygons
+    with fewer than three distinct points are left out.
+
+    Parameters
+    ----------
+    target : PolygonAnnotationCanvas, PolygonAnnotator
+        The canvas, or the annotator whose canvas to add the polygons to.
+    polygons : Sequence[np.ndarray]
+        The (n_points, 2) array of x and y coordinates of each polygon. The
+        polygons are closed if their last point isn't their first one.
+    labels : str, Sequence[str], optional
+        The label of each polygon, or one label for all polygons. By default,
+        the canvas's current class.
+    normalized : bool, optional
+        Whether the coordinates are relative to the size of the image (from 0
+        to 1), rather than in pixels. By default False.
+    replace : bool, optional
+        Whether the polygons replace the canvas's annotations, by default
+        True. Otherwise, they are added to them, and can be undone in one go.
+
+    Returns
+    -------
+    int
+        The number of polygons that were added.
+    """
+    canvas = _canvas(target, PolygonAnnotationCanvas)
+    arrays = [np.asarray(polygon, dtype=float) for polygon in polygons]
+    labels = _labels(labels, len(arrays), canvas)
+    lengths = [array.size // 2 for array in arrays]
+    points = _coordinates(
+        np.concatenate([array.reshape(-1) for array in arrays] + [[]]),
+        2,
+        "polygons",
+    )
+    points = _to_pixels(points, canvas, normalized)
+    shapes = []
+    for polygon, label in zip(
+        np.split(points, np.cumsum(lengths)[:-1]), labels
+    ):
+        if len(polygon) and (polygon[0] != polygon[-1]).any():
+            polygon = np.vstack([polygon, polygon[:1]])
+        if len(np.unique(polygon, axis=0)) < 3:
+            continue
+        shapes.append(Polygon(list(map(tuple, polygon.tolist())), label=label))
+    _add_shapes(canvas, shapes, replace)
+    return len(shapes)
+
+
+def import_coco(
+    target,
+    dataset: Union[dict, str, pathlib.Path],
+    image: Union[int, str],
+    replace: bool = True,
+) -> int:
+    """Add the annotations for an image in a COCO dataset to a canvas.
+
+    Which annotations are added depends on the canvas: box canvases get the
+    bounding boxes, polygon canvases the polygon segmentations, and point
+    canvases the visible keypoints.
+
+    Parameters
+    ----------
+    target : AbstractAnnotationCanvas, Annotator
+        The canvas, or the annotator whose canvas to add the annotations to.
+    dataset : dict, str, pathlib.Path
+        The COCO dataset, or the path to its JSON file.
+    image : int, str
+        The id or the file name of the image in the dataset.
+    replace : bool, optional
+        Whether the annotations replace the canvas's annotations, by default
+        True.
+
+    Returns
+    -------
+    int
+        The number of shapes that were added.
+    """
+    canvas = _canvas(target, AbstractAnnotationCanvas)
+    data: dict
+    if isinstance(dataset, dict):
+        data = dataset
+    else:
+        with open(dataset) as f:
+            data = json.load(f)
+    if isinstance(image, str):
+        image_ids = [
+            entry["id"]
+            for entry in data["images"]
+            if entry["file_name"] == image
+        ]
+        if not image_ids:
+            raise ValueError(
+                "There is no image {} in the dataset.".format(image)
+            )
+        image = image_ids[0]
+    names = {
+        category["id"]: category["name"]
+        for category in data.get("categories", [])
+    }
+    annotations = [
+        annotation
+        for annotation in data["annotations"]
+        if annotation["image_id"] == image
+    ]
+    labels = [
+        names.get(annotation.get("category_id")) for annotation in annotations
+    ]
+
+    if isinstance(canvas, BoundingBoxAnnotationCanvas):
+        boxes = [annotation.get("bbox") for annotation in annotations]
+        return import_boxes(
+            canvas,
+            np.array([box for box in boxes if box], dtype=float),
+            [label for label, box in zip(labels, boxes) if box],
+            box_format="xywh",
+            replace=replace,
+        )
+    elif isinstance(canvas, PolygonAnnotationCanvas):
+        polygons, polygon_labels = [], []
+        for annotation, label in zip(annotations, labels):
+            segmentation = annotation.get("segmentation")
+            # run-length encoded segmentations are masks, not polygons:
+            if isinstance(segmentation, list):
+                polygons.extend(segmentation)
+                polygon_labels.extend([label] * len(segmentation))
+        return import_polygons(
+            canvas, polygons, polygon_labels, replace=replace
+        )
+    elif isinstance(canvas, PointAnnotationCanvas):
+        points, point_labels = [], []
+        for annotation, label in zip(annotations, labels):
+            keypoints = np.reshape(annotation.get("keypoints", []), (-1, 3))
+            visible = keypoints[keypoints[:, 2] > 0, :2]
+            points.append(visible)
+            point_labels.extend([label] * len(visible))
+        return import_points(
+            canvas,
+            np.concatenate(points + [np.empty((0, 2))]),
+            point_labels,
+            replace=replace,
+        )
+    raise TypeError(
+        "COCO annotations can only be imported onto box, polygon and point "
+        "canvases, not {}.".format(type(canvas).__name__)
+    )
+
+
+def import_yolo(
+    target,
+    labels: Union[str, pathlib.Path],
+    classes: Sequence[str],
+    replace: bool = True,
+) -> int:
+    """Add the annotations in a YOLO label file to a canvas.
+
+    Box canvases get one box for each line. Polygon canvases get one polygon
+    for each line; lines with a box become a polygon with four corners.
+
+    Parameters
+    ----------
+    target : BoundingBoxAnnotationCanvas, PolygonAnnotationCanvas, Annotator
+        The canvas, or the annotator whose canvas to add the annotations to.
+    labels : str, pathlib.Path
+        The path to the label file.
+    classes : Sequence[str]
+        The class names, in the order of their ids.
+    replace : bool, optional
+        Whether the annotations replace the canvas's annotations, by default
+        True.
+
+    Returns
+    -------
+    int
+        The number of shapes that were added.
+    """
+    canvas = _canvas(target, AbstractAnnotationCanvas)
+    rows = _yolo_rows(pathlib.Path(labels).read_text())
+    class_ids = {length: row[:, 0].astype(int) for length, row in rows.items()}
+    if any(
+        ((ids < 0) | (ids >= len(classes))).any() for ids in class_ids.values()
+    ):
+        raise ValueError(
+            "The label file has class ids that aren't in the classes."
+        )
+    names = np.asarray(classes, dtype=object)
+    boxes = rows.pop(5, np.empty((0, 5)))
+
+    if isinstance(canvas, BoundingBoxAnnotationCanvas):
+        for row in rows.values():
+            centres, sizes = _polygon_boxes(
+                row[:, 1:].reshape(len(row), -1, 2)
+            )
+            boxes = np.vstack([boxes, np.hstack([row[:, :1], centres, sizes])])
+        return import_boxes(
+            canvas,
+            boxes[:, 1:],
+            names[boxes[:, 0].astype(int)],
+            box_format="cxcywh",
+            normalized=True,
+            replace=replace,
+        )
+    elif isinstance(canvas, PolygonAnnotationCanvas):
+        centres, half_sizes = boxes[:, 1:3], boxes[:, 3:5] / 2
+        corners = np.stack(
+            [
+                centres - half_sizes,
+                centres + [1, -1] * half_sizes,
+                centres + half_sizes,
+                centres + [-1, 1] * half_sizes,
+            ],
+            axis=1,
+        )
+        polygons: List[np.ndarray] = list(corners)
+        polygon_names = list(names[boxes[:, 0].astype(int)])
+        for row in rows.values():
+            polygons.extend(row[:, 1:].reshape(len(row), -1, 2))
+            polygon_names.extend(names[row[:, 0].astype(int)])
+        return import_polygons(
+            canvas, polygons, polygon_names, normalized=True, replace=replace
+        )
+    raise TypeError(
+        "YOLO annotations can only be imported onto box and polygon "
+        "canvases, not {}.".format(type(canvas).__name__)
+    )
+
+
+def _canvas(target, canvas_class: type) -> AbstractAnnotationCanvas:
+    canvas = (
+        target
+        if isinstance(target, AbstractAnnotationCanvas)
+        else getattr(target, "canvas", None)
+    )
+    if not (
+        isinstance(canvas, AbstractAnnotationCanvas)
+        and isinstance(canvas, canvas_class)
+    ):
+        raise TypeError(
+            "These annotations can only be imported onto a {}, not {}.".format(
+                canvas_class.__name__, type(target).__name__
+            )
+        )
+    if getattr(canvas, "original_width", None) is None:
+        raise ValueError(
+            "The canvas needs to show an image before annotations can be "
+            "imported, to check them against its size."
+        )
+    return canvas
+
+
+def _coordinates(values, n_columns: int, name: str) -> np.ndarray:
+    """Check that values are a (n, n_columns) array of finite numbers."""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values.reshape(0, n_columns)
+    if values.ndim == 1 and values.size % n_columns == 0:
+        values = values.reshape(-1, n_columns)
+    if values.ndim != 2 or values.shape[1] != n_columns:
+        raise ValueError(
+            "The {} should have {} coordinates each, but have shape "
+            "{}.".format(name, n_columns, values.shape)
+        )
+    not_finite = ~np.isfinite(values).all(axis=1)
+    if not_finite.any():
+        raise ValueError(
+            "{} of the {} have coordinates that are NaN or infinite.".format(
+                np.count_nonzero(not_finite), name
+            )
+        )
+    return values
+
+
+def _labels(labels: Labels, n_shapes: int, canvas) -> List[Optional[str]]:
+    if labels is None or isinstance(labels, str):
+        label = canvas.current_class if labels is None else labels
+        return [label] * n_shapes
+    labels = list(labels)
+    if len(labels) != n_shapes:
+        raise ValueError(
+            "There are {} labels for {} shapes.".format(len(labels), n_shapes)
+        )
+    return labels
+
+
+def _to_pixels(
+    points: np.ndarray, canvas: AbstractAnnotationCanvas, normalized: bool
+) -> np.ndarray:
+    """Scale points to pixels, clip them to the image and round them."""
+    size = np.array([canvas.original_width, canvas.original_height])
+    if normalized:
+        points = points * size
+    return np.rint(np.clip(points, 0, size)).astype(int)
+
+
+def _add_shapes(
+    canvas: AbstractAnnotationCanvas,
+    shapes: list,
+    replace: bool,
+    record: bool = True,
+):
+    if replace:
+        canvas.init_empty_data()
+    store = _store(canvas)
+    n_shapes = len(store)
+    store.extend(shapes)
+    if record and not replace and shapes:
+        canvas._undo_queue.append(
+            lambda: _remove_imported(canvas, store, n_shapes),
+            lambda: _add_shapes(canvas, shapes, replace=False, record=False),
+        )
+    canvas.re_draw()
+
+
+def _store(canvas: AbstractAnnotationCanvas) -> list:
+    if isinstance(canvas, BoundingBoxAnnotationCanvas):
+        return canvas.annotations
+    elif isinstance(canvas, PolygonAnnotationCanvas):
+        return canvas.polygons
+    return canvas.points
+
+
+def _remove_imported(
+    canvas: AbstractAnnotationCanvas, store: list, n_shapes: int
+):
+    del store[n_shapes:]
+    canvas.re_draw()
+
+
+def _yolo_rows(text: str) -> Dict[int, np.ndarray]:
+    """The rows of a YOLO label file, grouped by their number of values."""
+    rows: Dict[int, List[List[float]]] = {}
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        values = line.split()
+        if not values:
+            continue
+        if len(values) != 5 and (len(values) < 7 or len(values) % 2 == 0):
+            raise ValueError(
+                "Line {} of the label file is neither a box nor a "
+                "polygon.".format(line_number)
+            )
+        rows.setdefault(len(values), []).append(
+            [float(value) for value in values]
+        )
+    return {
+        length: np.array(values, dtype=float)
+        for length, values in rows.items()
+    }
+
+
+def _polygon_boxes(polygons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The (centre, size) of the boxes around (n, n_points, 2) polygons."""
+    low, high = polygons.min(axis=1), polygons.max(axis=1)
+    return (low + high) / 2, high - low
@@ -0,0 +1,113 @@
+"""Interpolate the coordinates of tracked shapes between keyframes.
+
+All tracks are interpolated at once: the keyframes of each track are stored
+in the rows of padded arrays, so finding the keyframes around each frame and
+evaluating the curves between them are array operations, rather than loops
+over tracks and frames.
+"""
+from typing import Tuple
+
+import numpy as np
+
+METHODS = ("linear", "spline")
+
+
+def interpolate(
+    key_frames: np.ndarray,
+    key_values: np.ndarray,
+    frames: np.ndarray,
+    method: str = "linear",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Interpolate tracks between their keyframes.
+
+    Parameters
+    ----------
+    key_frames : np.ndarray
+        A (n_tracks, n_keys) array of the frames at which each track has a
+        keyframe, in increasing order. Tracks with fewer keyframes are padded
+        with NaN at the end.
+    key_values : np.ndarray
+        A (n_tracks, n_keys, n_dims) array of the coordinates of each track at
+        its keyframes.
+    frames : np.ndarray
+        The (n_frames,) frames to interpolate at.
+    method : str, optional
+        Either "linear", or "spline" for a cubic Hermite spline that passes
+        through the keyframes with Catmull-Rom tangents (scaled to the frame
+        distance between keyframes). By default "linear".
+
+    Returns
+    -------
+    values : np.ndarray
+        A (n_tracks, n_frames, n_dims) array of coordinates. It is NaN for
+        frames before the first or after the last keyframe of a track.
+    key_index : np.ndarray
+        A (n_tracks, n_frames) array with the index of the last keyframe at or
+        before each frame, or -1 before the first keyframe.
+    """
+    if method not in METHODS:
+        raise ValueError(
+            "The interpolation method should be one of {}, not {}.".format(
+                METHODS, method
+            )
+        )
+    key_frames = np.asarray(key_frames, dtype=float)
+    key_values = np.asarray(key_values, dtype=float)
+    frames = np.asarray(frames, dtype=float)
+
+    n_keys = np.sum(~np.isnan(key_frames), axis=1, keepdims=True)
+    # comparisons with NaN are False, so padding is never counted:
+    key_index = (
+        np.sum(key_frames[:, None, :] <= frames[None, :, None], axis=2) - 1
+    )
+    last_frame = np.take_along_axis(key_frames, n_keys - 1, axis=1)
+    inside = (key_index >= 0) & (frames[None, :] <= last_frame)
+
+    # the keyframes at the start and end of each frame's segment:
+    start = np.clip(key_index, 0, np.maximum(n_keys - 2, 0))
+    end = np.minimum(start + 1, n_keys - 1)
+    frame_0, frame_1 = _gather(key_frames, start), _gather(key_frames, end)
+    value_0 = _gather(key_values, start[..., None])
+    value_1 = _gather(key_values, end[..., None])
+    length = np.where(frame_1 > frame_0, frame_1 - frame_0, 1)
+    t = np.clip((frames[None, :] - frame_0) / length, 0, 1)[..., None]
+
+    if method == "linear":
+        values = value_0 + t * (value_1 - value_0)
+    else:
+        tangents = _tangents(key_frames, key_values, n_keys)
+        tangent_0 = _gather(tangents, start[..., None])
+        tangent_1 = _gather(tangents, end[..., None])
+        length = length[..., None]
+        t2, t3 = t * t, t * t * t
+        values = (
+            (2 * t3 - 3 * t2 + 1) * value_0
+            + (t3 - 2 * t2 + t) * length * tangent_0
+            + (-2 * t3 + 3 * t2) * value_1
+            + (t3 - t2) * length * tangent_1
+        )
+    values = np.where(inside[..., None], values, np.nan)
+    return values, key_index
+
+
+def _gather(array: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """Pick an entry on the second axis of an array for each track & frame."""
+    return np.take_along_axis(array, indices, axis=1)
+
+
+def _tangents(
+    key_frames: np.ndarray, key_values: np.ndarray, n_keys: np.ndarray
+) -> np.ndarray:
+    """The change per frame at each keyframe, from its two neighbours."""
+    index = np.arange(key_frames.shape[1])[None, :]
+    previous = np.clip(index - 1, 0, np.maximum(n_keys - 1, 0))
+    following = np.clip(index + 1, 0, np.maximum(n_keys - 1, 0))
+    frame_difference = _gather(key_frames, following) - _gather(
+        key_frames, previous
+    )
+    value_difference = _gather(key_values, following[..., None]) - _gather(
+        key_values, previous[..., None]
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tangents = value_difference / frame_difference[..., None]
+    return np.where(frame_difference[..., None] > 0, tangents, 0)
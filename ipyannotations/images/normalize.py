@@ -0,0 +1,110 @@
+"""Convert arrays of any type to 8-bit images without large copies.
+
+Scientific images are often 16-bit or floating point, and can be very large.
+Naively scaling them (``255 * (image / image.max())``) creates several
+full-size floating point copies. Instead, the intensity window is found with
+reductions that don't copy the data (or from a subsample, for percentiles),
+and the conversion happens in tiles of rows.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+#: The largest temporary (float32) array created while converting, in bytes.
+TILE_BYTES = 16 * 1024 * 1024
+
+#: The number of pixels sampled to estimate percentiles.
+SAMPLE_SIZE = 1024 * 1024
+
+
+def to_uint8(
+    image: np.ndarray,
+    percentiles: Optional[Tuple[float, float]] = None,
+    per_channel: bool = False,
+) -> np.ndarray:
+    """Convert an array to 8-bit integers for display.
+
+    Values inside an intensity window are mapped linearly onto 0 - 255, and
+    values outside it are clipped. NaN values become 0.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        A (height, width) or (height, width, channels) array of any integer,
+        boolean or floating point type.
+    percentiles : tuple(float, float), optional
+        The intensity window, as percentiles of the values in the image, for
+        example (1, 99) to ignore outliers. Percentiles are estimated from a
+        subsample of the image. By default, 8-bit arrays are returned
+        unchanged, integer arrays with values between 0 and 255 are only
+        cast, and all other arrays use the window from their smallest to their
+        largest value.
+    per_channel : bool, optional
+        Whether to use a separate window for each channel, by default False.
+
+    Returns
+    -------
+    np.ndarray
+        An array of the same shape, with dtype uint8.
+    """
+    image = np.asarray(image)
+    if percentiles is None:
+        if image.dtype == np.uint8:
+            return image
+        low, high = _min_max(image, per_channel)
+        if (
+            image.dtype.kind in "biu"
+            and np.all(low >= 0)
+            and np.all(high <= 255)
+        ):
+            return image.astype(np.uint8)
+    else:
+        low, high = _percentiles(image, percentiles, per_channel)
+
+    low = np.asarray(low, dtype=np.float32)
+    width = np.asarray(high, dtype=np.float32) - low
+    scale = np.divide(
+        255, width, out=np.zeros_like(width), where=width > 0
+    ).astype(np.float32)
+
+    out = np.empty(image.shape, dtype=np.uint8)
+    row_size = max(1, image[:1].size)
+    tile_rows = max(1, TILE_BYTES // (4 * row_size))
+    for start in range(0, max(len(image), 1), tile_rows):
+        tile = image[start : start + tile_rows].astype(np.float32)
+        tile -= low
+        tile *= scale
+        np.clip(tile, 0, 255, out=tile)
+        if image.dtype.kind == "f":
+            tile[np.isnan(tile)] = 0
+        out[start : start + tile_rows] = tile
+    return out
+
+
+def _channel_axes(image: np.ndarray, per_channel: bool):
+    if per_channel and image.ndim == 3:
+        return (0, 1)
+    return None
+
+
+def _min_max(image: np.ndarray, per_channel: bool) -> Tuple:
+    axes = _channel_axes(image, per_channel)
+    if image.dtype.kind == "f":
+        return np.nanmin(image, axis=axes), np.nanmax(image, axis=axes)
+    return image.min(axis=axes), image.max(axis=axes)
+
+
+def _percentiles(
+    image: np.ndarray, percentiles: Tuple[float, float], per_channel: bool
+) -> Tuple:
+    # a strided view of the image, so only the sample is copied:
+    n_pixels = image.shape[0] * image.shape[1]
+    stride = max(1, int(np.ceil(np.sqrt(n_pixels / SAMPLE_SIZE))))
+    sample = image[::stride, ::stride].astype(np.float32)
+    if per_channel and image.ndim == 3:
+        sample = sample.reshape(-1, image.shape[-1])
+    else:
+        sample = sample.reshape(-1)
+    percentile = np.nanpercentile if image.dtype.kind == "f" else np.percentile
+    low, high = percentile(sample, percentiles, axis=0)
+    return low, high
@@ -0,0 +1,628 @@
+"""Annotate image sequences and videos, one frame at a time.
+
+Frames are only decoded when they are needed, and are kept in a cache of
+image widgets: the browser keeps the image data of each widget, so going back
+to a frame that was already shown doesn't send it again. While you annotate a
+frame, the neighbouring frames are decoded in the background.
+"""
+
+import io
+import pathlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import ipywidgets as widgets
+import numpy as np
+import traitlets
+from PIL import Image
+
+from .annotator import Annotator
+from .canvases.box import BoundingBoxAnnotationCanvas
+from .canvases.point import PointAnnotationCanvas
+from .interpolation import METHODS, interpolate
+from .normalize import to_uint8
+
+FrameSource = Union[str, pathlib.Path, np.ndarray, Sequence[Any]]
+
+
+class FrameSequence:
+    """The frames of an image sequence or a video, decoded lazily.
+
+    Parameters
+    ----------
+    frames : str, pathlib.Path, np.ndarray, Sequence
+        One of:
+
+        - a sequence of images (paths, arrays, Pillow images or bytes);
+        - an array of frames, with the frames along the first axis;
+        - the path to a multi-frame image file, such as a GIF or TIFF stack;
+        - the path to a video file. This needs the ``imageio`` package (and
+          its ``imageio-ffmpeg`` plugin) to be installed, for example with
+          ``pip install ipyannotations[video]``.
+    cache_size : int, optional
+        The number of frames to keep, by default 32. The least recently shown
+        frames are dropped first.
+    read_ahead : int, optional
+        The number of frames before and after the current frame that are
+        decoded in the background, by default 2. Use 0 to only decode frames
+        when they are shown.
+    percentiles : tuple(float, float), optional
+        For frames that are arrays: the intensity window, as percentiles of
+        the values in each frame, for example (1, 99) to ignore outliers. By
+        default, frames that aren't 8-bit are scaled from their smallest to
+        their largest value.
+    """
+
+    def __init__(
+        self,
+        frames: FrameSource,
+        cache_size: int = 32,
+        read_ahead: int = 2,
+        percentiles: Optional[Tuple[float, float]] = None,
+    ):
+        if cache_size < 2 * read_ahead + 1:
+            raise ValueError(
+                "The cache needs space for the read-ahead frames on both "
+                "sides of the current frame, so cache_size needs to be at "
+                "least {}.".format(2 * read_ahead + 1)
+            )
+        self.cache_size = cache_size
+        self.read_ahead = read_ahead
+        self._reader = _reader(frames, percentiles)
+        self._frames: "OrderedDict[int, Union[Future, widgets.Image]]" = (
+            OrderedDict()
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    def __getitem__(self, index: int) -> widgets.Image:
+        """The image widget for a frame.
+
+        The same widget is returned as long as the frame stays in the cache.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(
+                "Frame {} is out of range for a sequence of {} frames.".format(
+                    index, len(self)
+                )
+            )
+        frame = self._frames.pop(index, None)
+        self._read_neighbours(index)
+        if frame is None:
+            frame = widgets.Image(value=self._reader.encode(index))
+        elif isinstance(frame, Future):
+            frame = widgets.Image(value=frame.result())
+        self._put(index, frame)
+        return frame
+
+    def __contains__(self, index: int) -> bool:
+        """Whether a frame is already in the cache (or being decoded)."""
+        return index in self._frames
+
+    def close(self):
+        """Stop decoding frames, and close the cached image widgets."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while self._frames:
+            _, frame = self._frames.popitem()
+            if isinstance(frame, widgets.Image):
+                frame.close()
+        self._reader.close()
+
+    def _read_neighbours(self, index: int):
+        if not self.read_ahead:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                min(4, 2 * self.read_ahead),
+                thread_name_prefix="ipyannotations-frames",
+            )
+        for distance in range(1, self.read_ahead + 1):
+            for neighbour in (index + distance, index - distance):
+                if 0 <= neighbour < len(self) and neighbour not in self:
+                    self._put(
+                        neighbour,
+                        self._executor.submit(self._reader.encode, neighbour),
+                    )
+
+    def _put(self, index: int, frame: Union[Future, widgets.Image]):
+        self._frames[index] = frame
+        self._frames.move_to_end(index)
+        while len(self._frames) > self.cache_size:
+            _, evicted = self._frames.popitem(last=False)
+            if isinstance(evicted, Future):
+                evicted.cancel()
+            else:
+                evicted.close()
+
+
+class _FrameReader:
+    """Encodes single frames of a source as image file bytes."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def encode(self, index: int) -> bytes:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class _ImageListReader(_FrameReader):
+    def __init__(
+        self,
+        images: Union[np.ndarray, Sequence[Any]],
+        percentiles: Optional[Tuple[float, float]] = None,
+    ):
+        self.images = images
+        self.percentiles = percentiles
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def encode(self, index: int) -> bytes:
+        image = self.images[index]
+        if isinstance(image, bytes):
+            return image
+        if isinstance(image, (str, pathlib.Path)):
+            # image files can be sent as they are, without decoding them
+            return pathlib.Path(image).read_bytes()
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(to_uint8(image, self.percentiles))
+        return _encode(image)
+
+
+class _MultiFrameImageReader(_FrameReader):
+    def __init__(self, image: Image.Image):
+        self.image = image
+        self.n_frames = getattr(image, "n_frames", 1)
+        # a multi-frame image has one current frame, so only one thread can
+        # seek and decode at a time:
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def encode(self, index: int) -> bytes:
+        with self.lock:
+            self.image.seek(index)
+            frame = self.image.copy()
+        return _encode(frame)
+
+    def close(self):
+        self.image.close()
+
+
+class _VideoReader(_FrameReader):
+    def __init__(
+        self,
+        path: pathlib.Path,
+        percentiles: Optional[Tuple[float, float]] = None,
+    ):
+        try:
+            import imageio
+        except ImportError:  # pragma: no cover
+            raise ImportError(
+                "Reading video files needs the imageio package. You can "
+                "install it with `pip install ipyannotations[video]`."
+            ) from None
+        self.reader = imageio.get_reader(path)
+        self.percentiles = percentiles
+        self.n_frames = self.reader.count_frames()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def encode(self, index: int) -> bytes:
+        with self.lock:
+            frame = self.reader.get_data(index)
+        return _encode(Image.fromarray(to_uint8(frame, self.percentiles)))
+
+    def close(self):
+        self.reader.close()
+
+
+def _reader(
+    frames: FrameSource, percentiles: Optional[Tuple[float, float]] = None
+) -> _FrameReader:
+    if isinstance(frames, (str, pathlib.Path)):
+        path = pathlib.Path(frames)
+        try:
+            return _MultiFrameImageReader(Image.open(path))
+        except Image.UnidentifiedImageError:
+            return _VideoReader(path, percentiles)
+    if isinstance(frames, np.ndarray) and frames.ndim < 3:
+        raise ValueError(
+            "An array of frames needs at least three dimensions, with the "
+            "frames along the first one."
+        )
+    return _ImageListReader(frames, percentiles)
+
+
+def _encode(image: Image.Image) -> bytes:
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class SequenceAnnotator(Annotator):
+    """A generic widget to annotate each frame of an image sequence.
+
+    Use the slider, the arrow buttons or the left and right arrow keys to move
+    between frames. The annotations of each frame are kept when you move to
+    another frame.
+
+    Frames you annotate are keyframes. With interpolation, the annotations on
+    the frames between two keyframes are interpolated: the n-th shape on one
+    keyframe moves to the n-th shape on the next, if it has one. Changing the
+    annotations on any frame makes it a keyframe. After the last keyframe, its
+    annotations are shown as a starting point for the next keyframe.
+
+    Parameters
+    ----------
+    canvas_size : (int, int), optional
+        Size of the annotation canvas in pixels.
+    options : List[str], optional
+        The list of classes you'd like to annotate.
+    data_postprocessor : Optional[Callable[[Dict[int, List[dict]]], Any]]
+        A function that transforms the annotation data. By default None.
+    cache_size : int, optional
+        The number of frames to keep in memory, by default 32.
+    read_ahead : int, optional
+        The number of neighbouring frames to decode in the background, by
+        default 2.
+    interpolation : str, optional
+        How to fill in the frames between keyframes: "none", "linear", or
+        "spline" for a smooth curve through the keyframes. By default "none".
+    """
+
+    interpolation = traitlets.Enum(
+        ("none",) + METHODS,
+        default_value="none",
+        help="How annotations are interpolated between keyframes",
+    )
+
+    #: The key of the annotations' coordinates, for annotations that can be
+    #: interpolated.
+    coordinates_key: Optional[str] = None
+
+    def __init__(
+        self,
+        canvas_size=(700, 500),
+        options: Sequence[str] = (),
+        data_postprocessor: Optional[
+            Callable[[Dict[int, List[dict]]], Any]
+        ] = None,
+        cache_size: int = 32,
+        read_ahead: int = 2,
+        interpolation: str = "none",
+        **kwargs,
+    ):
+        super().__init__(canvas_size=canvas_size, options=options, **kwargs)
+        # this annotator's data is a dictionary of frames, not a list:
+        self.data_postprocessor = data_postprocessor
+        self.cache_size = cache_size
+        self.read_ahead = read_ahead
+        self.frames: Optional[FrameSequence] = None
+        self._frame_data: Dict[int, List[dict]] = {}
+        self._current_frame: Optional[int] = None
+        self._shown_data: List[dict] = []
+
+        button_layout = widgets.Layout(width="40px")
+        self.previous_button = widgets.Button(
+            icon="step-backward", layout=button_layout
+        )
+        self.previous_button.on_click(lambda _: self.step(-1))
+        self.next_button = widgets.Button(
+            icon="step-forward", layout=button_layout
+        )
+        self.next_button.on_click(lambda _: self.step(1))
+        self.frame_slider = widgets.IntSlider(
+            description="Frame", min=0, max=0, layout={"flex": "1 1 auto"}
+        )
+        self.frame_slider.observe(self._show_frame, "value")
+        self.frame_controls = widgets.HBox(
+            (self.previous_button, self.frame_slider, self.next_button),
+            layout={"width": f"{self.canvas.width}px"},
+        )
+        canvas_position = self.children.index(self.canvas)
+        self.children = (
+            self.children[: canvas_position + 1]
+            + (self.frame_controls,)
+            + self.children[canvas_position + 1 :]
+        )
+        self.interpolation = interpolation
+
+    def display(
+        self,
+        frames: Union[FrameSequence, FrameSource],
+        percentiles: Optional[Tuple[float, float]] = None,
+    ):
+        """Clear the annotations and display the first frame of a sequence.
+
+        Parameters
+        ----------
+        frames : FrameSequence, str, pathlib.Path, np.ndarray, Sequence
+            The frames, as a `FrameSequence`, or anything a `FrameSequence`
+            can be created from: a sequence of images, an array of frames, or
+            the path to a multi-frame image or video file.
+        percentiles : tuple(float, float), optional
+            For frames that are arrays: the intensity window, as percentiles
+            of the values in each frame (see `FrameSequence`). A
+            `FrameSequence` that is passed in keeps its own window.
+        """
+        if self.frames is not None:
+            self.frames.close()
+        if not isinstance(frames, FrameSequence):
+            frames = FrameSequence(
+                frames,
+                cache_size=self.cache_size,
+                read_ahead=self.read_ahead,
+                percentiles=percentiles,
+            )
+        self.frames = frames
+        self._frame_data = {}
+        self._current_frame = None
+        with self.frame_slider.hold_trait_notifications():
+            self.frame_slider.value = 0
+            self.frame_slider.max = max(0, len(frames) - 1)
+        self._show_frame()
+
+    @property
+    def frame(self) -> int:
+        """The index of the frame that is currently shown."""
+        return self.frame_slider.value
+
+    @frame.setter
+    def frame(self, value: int):
+        self.frame_slider.value = value
+
+    def step(self, n_frames: int):
+        """Move forward (or backward, if negative) by a number of frames."""
+        self.frame_slider.value = min(
+            max(self.frame_slider.value + n_frames, self.frame_slider.min),
+            self.frame_slider.max,
+        )
+
+    @property
+    def keyframes(self) -> Dict[int, List[dict]]:
+        """The annotations on the keyframes, by frame index."""
+        self._store_frame_data()
+        return dict(sorted(self._frame_data.items()))
+
+    @property
+    def data(self) -> Dict[int, List[dict]]:
+        """The annotation data, as a dictionary of frame index: annotations.
+
+        Only frames with at least one annotation are included. With
+        interpolation, this includes the interpolated frames between
+        keyframes. The annotations on each frame have the same format as those
+        of the single-image annotator.
+        """
+        data = self.keyframes
+        if data and self.interpolation != "none":
+            data = self._interpolate(np.arange(min(data), max(data) + 1))
+        if self.data_postprocessor is not None:
+            return self.data_postprocessor(data)
+        return data
+
+    @data.setter
+    def data(self, value: Dict[int, List[dict]]):  # noqa: D001
+        self._frame_data = {
+            int(frame): list(annotations)
+            for frame, annotations in value.items()
+            if annotations
+        }
+        self._show_annotations()
+
+    def _annotations_at(self, frame: int) -> List[dict]:
+        if frame in self._frame_data or self.interpolation == "none":
+            return list(self._frame_data.get(frame, []))
+        if not self._frame_data:
+            return []
+        last_keyframe = max(self._frame_data)
+        if frame > last_keyframe:
+            return list(self._frame_data[last_keyframe])
+        return self._interpolate(np.array([frame])).get(frame, [])
+
+    def _interpolate(self, frames: np.ndarray) -> Dict[int, List[dict]]:
+        """Interpolate the keyframe annotations at a range of frames."""
+        key = self.coordinates_key
+        if key is None:
+            raise ValueError(
+                "{} annotations can not be interpolated.".format(
+                    type(self).__name__
+                )
+            )
+        # each run of keyframes that have an n-th shape is a track:
+        tracks: List[List[tuple]] = []
+        track_at_index: Dict[int, int] = {}
+        for frame, annotations in sorted(self._frame_data.items()):
+            continued = {}
+            for index, annotation in enumerate(annotations):
+                track_index = track_at_index.get(index)
+                if track_index is None:
+                    track_index = len(tracks)
+                    tracks.append([])
+                tracks[track_index].append(
+                    (frame, annotation[key], annotation["label"])
+                )
+                continued[index] = track_index
+            track_at_index = continued
+
+        n_keys = max(len(track) for track in tracks)
+        n_dims = len(tracks[0][0][1])
+        key_frames = np.full((len(tracks), n_keys), np.nan)
+        key_values = np.zeros((len(tracks), n_keys, n_dims))
+        key_labels = np.empty((len(tracks), n_keys), dtype=object)
+        for row, track in enumerate(tracks):
+            track_frames, track_values, track_labels = zip(*track)
+            key_frames[row, : len(track)] = track_frames
+            key_values[row, : len(track)] = track_values
+            key_labels[row, : len(track)] = track_labels
+
+        interpolated, key_index = interpolate(
+            key_frames, key_values, frames, self.interpolation
+        )
+        shown = ~np.isnan(interpolated[..., 0])
+        positions = self._valid_coordinates(
+            np.rint(np.nan_to_num(interpolated))
+        ).astype(int)
+        labels = np.take_along_axis(
+            key_labels, np.maximum(key_index, 0), axis=1
+        )
+        type_ = self._frame_data[min(self._frame_data)][0]["type"]
+
+        data = {}
+        for column, frame in enumerate(frames.tolist()):
+            rows = np.flatnonzero(shown[:, column])
+            if len(rows):
+                data[frame] = [
+                    {
+                        "type": type_,
+                        "label": label,
+                        key: tuple(coordinates),
+                    }
+                    for label, coordinates in zip(
+                        labels[rows, column].tolist(),
+                        positions[rows, column].tolist(),
+                    )
+                ]
+        return data
+
+    def _valid_coordinates(self, values: np.ndarray) -> np.ndarray:
+        return values
+
+    @traitlets.validate("interpolation")
+    def _check_interpolation(self, proposal):
+        if proposal["value"] != "none" and self.coordinates_key is None:
+            raise traitlets.TraitError(
+                "{} annotations can not be interpolated.".format(
+                    type(self).__name__
+                )
+            )
+        return proposal["value"]
+
+    @traitlets.observe("interpolation")
+    def _interpolation_changed(self, change):
+        self._store_frame_data()
+        self._show_annotations()
+
+    def _store_frame_data(self):
+        if self._current_frame is None:
+            return
+        annotations = self.canvas.data
+        if annotations == self._shown_data:
+            return
+        if annotations:
+            self._frame_data[self._current_frame] = annotations
+        else:
+            self._frame_data.pop(self._current_frame, None)
+        self._shown_data = annotations
+
+    def _show_frame(self, change=None):
+        if self.frames is None:
+            return
+        self._store_frame_data()
+        self._current_frame = self.frame
+        self.canvas.clear()
+        # the cached widget is drawn by reference, so frames that were shown
+        # before are not sent to the browser again:
+        self.canvas.load_image(self.frames[self.frame])
+        self._show_annotations()
+
+    def _show_annotations(self):
+        if self.frames is None:
+            return
+        self.canvas.data = self._annotations_at(self.frame)
+        # the history is shared with the canvas, and its changes refer to the
+        # annotations that were shown before:
+        self._undo_queue.clear()
+        # the canvas may format the data differently, so it's read back to
+        # tell later whether the annotations on this frame were changed:
+        self._shown_data = self.canvas.data
+
+    def _handle_keystroke(self, event):
+        super()._handle_keystroke(event)
+        if event.get("key") == "ArrowRight":
+            self.step(1)
+        elif event.get("key") == "ArrowLeft":
+            self.step(-1)
+
+
+class BoxSequenceAnnotator(SequenceAnnotator):
+    """An annotator for drawing boxes on each frame of an image sequence.
+
+    Boxes are drawn and edited like in the `BoxAnnotator`. Use the slider,
+    the arrow buttons or the left and right arrow keys to move between frames.
+    To label a moving object, draw its box on a few keyframes where its motion
+    changes, and let the boxes in between be interpolated.
+
+    Parameters
+    ----------
+    canvas_size : (int, int), optional
+        Size of the annotation canvas in pixels.
+    options : List[str], optional
+        The list of classes you want to create annotations for, by default
+        None.
+    cache_size : int, optional
+        The number of frames to keep in memory, by default 32.
+    read_ahead : int, optional
+        The number of neighbouring frames to decode in the background, by
+        default 2.
+    interpolation : str, optional
+        How to fill in the frames between keyframes: "none", "linear", or
+        "spline". By default "none".
+    """
+
+    CanvasClass = BoundingBoxAnnotationCanvas
+    coordinates_key = "xyxy"
+
+    def _valid_coordinates(self, values: np.ndarray) -> np.ndarray:
+        # splines can overshoot, which would swap the corners of small boxes
+        xs, ys = np.sort(values[..., 0::2], axis=-1), np.sort(
+            values[..., 1::2], axis=-1
+        )
+        return np.stack(
+            [xs[..., 0], ys[..., 0], xs[..., 1], ys[..., 1]], axis=-1
+        )
+
+
+class PointSequenceAnnotator(SequenceAnnotator):
+    """An annotator for marking points on each frame of an image sequence.
+
+    Points are added and edited like in the `PointAnnotator`. Use the slider,
+    the arrow buttons or the left and right arrow keys to move between frames.
+    To track a moving point, mark it on a few keyframes where its motion
+    changes, and let the points in between be interpolated.
+
+    Parameters
+    ----------
+    canvas_size : (int, int), optional
+        Size of the annotation canvas in pixels.
+    options : List[str], optional
+        The list of classes you want to create annotations for, by default
+        None.
+    cache_size : int, optional
+        The number of frames to keep in memory, by default 32.
+    read_ahead : int, optional
+        The number of neighbouring frames to decode in the background, by
+        default 2.
+    interpolation : str, optional
+        How to fill in the frames between keyframes: "none", "linear", or
+        "spline". By default "none".
+    """
+
+    CanvasClass = PointAnnotationCanvas
+    coordinates_key = "coordinates"
@@ -1,17 +1,26 @@
 """Text annotation tools."""
 
 from .classification import (
+    BatchClassLabeller,
     ClassLabeller,
     SentimentLabeller,
     MulticlassLabeller,
 )
 from .freetext import FreetextAnnotator
+from .pretagging import Gazetteer, PreTagger, RegexSet, tag_corpus
+from .spans import SpanStore
 from .tagging import TextTagger
 
 __all__ = [
     "TextTagger",
+    "SpanStore",
+    "Gazetteer",
+    "RegexSet",
+    "PreTagger",
+    "tag_corpus",
     "SentimentLabeller",
     "ClassLabeller",
+    "BatchClassLabeller",
     "FreetextAnnotator",
     "MulticlassLabeller",
 ]
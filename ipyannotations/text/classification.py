@@ -1,4 +1,4 @@
-from typing import Sequence
+from typing import Optional, Sequence
 
 import IPython.display
 import ipywidgets as widgets
@@ -82,6 +82,43 @@ class MulticlassLabeller(generic.MulticlassLabeller):
         )  # type: ignore
 
 
+class BatchClassLabeller(generic.BatchClassLabeller):
+    """A text classification widget that shows a page of texts at a time."""
+
+    def __init__(
+        self,
+        options: Sequence[str] = (),
+        page_size: int = 12,
+        n_columns: int = 3,
+        default_option: Optional[str] = None,
+        *args,
+        **kwargs,
+    ):
+        """Create a widget for classifying a page of texts at once.
+
+        Parameters
+        ----------
+        options : Sequence[str], optional
+            The classes, by default ()
+        page_size : int, optional
+            The largest number of texts on a page, by default 12
+        n_columns : int, optional
+            The number of columns in the grid, by default 3
+        default_option : str, optional
+            The class chosen for texts without a prediction, by default the
+            first option.
+        """
+        super().__init__(
+            options=options,
+            page_size=page_size,
+            n_columns=n_columns,
+            default_option=default_option,
+            display_function=_text_display_function,
+            *args,
+            **kwargs,
+        )  # type: ignore
+
+
 class SentimentLabeller(
     GenericWidgetMixin, LabellingWidgetMixin, widgets.VBox
 ):
@@ -119,12 +156,9 @@ class SentimentLabeller(
         ]
         for button in self.buttons:
             button.on_click(self.submit)
-        self.display_widget = widgets.Output(
-            layout=widgets.Layout(margin="auto")
-        )
         self.children = [
             widgets.Box(
-                (self.display_widget,),
+                (self._display_buffer_box,),
                 layout=widgets.Layout(
                     justify_content="center",
                     padding="2.5% 0",
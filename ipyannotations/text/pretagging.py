@@ -0,0 +1,369 @@
+"""Tag text in advance, with a dictionary of terms and regular expressions.
+
+A `Gazetteer` compiles its terms into an Aho-Corasick automaton: a trie of
+the terms, in which each node also links to the longest suffix of its prefix
+that is a prefix of another term. Text is scanned in one pass, and each
+character follows at most a few links, however many terms there are. A
+`RegexSet` compiles its patterns into a single regular expression, so text
+is also scanned once, rather than once per pattern.
+
+A `PreTagger` combines both, and returns spans that can be passed to a
+`TextTagger` as its data. `tag_corpus` tags many texts in a process pool.
+"""
+
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .spans import Span
+
+Terms = Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+
+# characters are stored as node * _N_CHARACTERS + code point, so that the
+# whole trie is one dictionary of integers:
+_N_CHARACTERS = 0x110000
+
+
+class Gazetteer:
+    """A dictionary of terms, and the classes they should be tagged with.
+
+    Parameters
+    ----------
+    terms : Mapping[str, str] or Iterable[Tuple[str, str]], optional
+        The terms, and their classes. If a term is added twice, the last
+        class is used.
+    case_sensitive : bool, optional
+        Whether terms only match text with the same case, by default True.
+    """
+
+    def __init__(self, terms: Terms = (), case_sensitive: bool = True):
+        self.case_sensitive = case_sensitive
+        self._labels: List[str] = []
+        self._label_indices: Dict[str, int] = {}
+        # for each node: the node it branches from and the character it
+        # adds, its depth, the label of the term it ends (or -1), and the
+        # nodes it falls back to on a mismatch and on a match:
+        self._goto: Dict[int, int] = {}
+        self._parent = array("q", [0])
+        self._char = array("q", [0])
+        self._depth = array("q", [0])
+        self._label = array("q", [-1])
+        self._fail = array("q")
+        self._output = array("q")
+        self._n_terms = 0
+        if isinstance(terms, Mapping):
+            terms = terms.items()
+        for term, label in terms:
+            self.add(term, label)
+
+    def add(self, term: str, label: str):
+        """Add a term.
+
+        Parameters
+        ----------
+        term : str
+            The text to match.
+        label : str
+            The class to tag it with.
+
+        Raises
+        ------
+        ValueError
+            If the term is empty.
+        """
+        if not term:
+            raise ValueError("Terms can't be empty.")
+        goto, depth = self._goto, self._depth
+        node = 0
+        for code in map(ord, self._fold(term)):
+            key = node * _N_CHARACTERS + code
+            child = goto.get(key)
+            if child is None:
+                child = goto[key] = len(depth)
+                self._parent.append(node)
+                self._char.append(code)
+                depth.append(depth[node] + 1)
+                self._label.append(-1)
+            node = child
+        if self._label[node] == -1:
+            self._n_terms += 1
+        if label not in self._label_indices:
+            self._label_indices[label] = len(self._labels)
+            self._labels.append(label)
+        self._label[node] = self._label_indices[label]
+        # the links are computed again before the next search:
+        del self._fail[:]
+
+    def finditer(self, text: str) -> Iterator[Span]:
+        """Find all occurrences of all terms, including overlapping ones.
+
+        Parameters
+        ----------
+        text : str
+
+        Yields
+        ------
+        Tuple[int, int, str]
+            The start, end and class of each occurrence, in the order they
+            end in.
+        """
+        self._compile()
+        goto, fail, output = self._goto, self._fail, self._output
+        depth, label, labels = self._depth, self._label, self._labels
+        node = 0
+        for end, code in enumerate(map(ord, self._fold(text)), 1):
+            child = goto.get(node * _N_CHARACTERS + code)
+            while child is None and node:
+                node = fail[node]
+                child = goto.get(node * _N_CHARACTERS + code)
+            node = child or 0
+            match = node if label[node] != -1 else output[node]
+            while match:
+                yield end - depth[match], end, labels[label[match]]
+                match = output[match]
+
+    def _fold(self, text: str) -> str:
+        if self.case_sensitive:
+            return text
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded
+        # some characters become several when lower-cased:
+        return "".join(
+            low if len(low) == 1 else char
+            for char, low in ((char, char.lower()) for char in text)
+        )
+
+    def _compile(self):
+        """Link each node to its longest proper suffix that is in the trie.
+
+        Nodes are linked in order of depth, as a node's link depends on the
+        link of the node it branches from. Nothing is done if the links are
+        up to date.
+        """
+        if len(self._fail) == len(self._depth):
+            return
+        n_nodes = len(self._depth)
+        fail, output = array("q", [0]) * n_nodes, array("q", [0]) * n_nodes
+        goto, label, parents, chars = (
+            self._goto,
+            self._label,
+            self._parent,
+            self._char,
+        )
+        for node in sorted(range(1, n_nodes), key=self._depth.__getitem__):
+            parent = parents[node]
+            if parent:
+                code = chars[node]
+                suffix = fail[parent]
+                child = goto.get(suffix * _N_CHARACTERS + code)
+                while child is None and suffix:
+                    suffix = fail[suffix]
+                    child = goto.get(suffix * _N_CHARACTERS + code)
+                if child:
+                    fail[node] = child
+                    output[node] = (
+                        child if label[child] != -1 else output[child]
+                    )
+        self._fail, self._output = fail, output
+
+    def __len__(self) -> int:
+        return self._n_terms
+
+    def __repr__(self) -> str:
+        return "<Gazetteer with {} terms and {} classes>".format(
+            len(self), len(self._labels)
+        )
+
+
+class RegexSet:
+    """Regular expressions, and the classes they should be tagged with.
+
+    The patterns are compiled into one expression, with a group around
+    each. They are matched like an alternation: where several match at the
+    same position, the first one is used. Patterns can't refer to their own
+    groups by number, as the numbers change; named groups can be used.
+
+    Parameters
+    ----------
+    patterns : Mapping[str, str] or Iterable[Tuple[str, str]]
+        The patterns, and their classes.
+    flags : int, optional
+        Flags from the `re` module, for all patterns. By default none.
+    """
+
+    def __init__(self, patterns: Terms, flags: int = 0):
+        if isinstance(patterns, Mapping):
+            patterns = patterns.items()
+        patterns = list(patterns)
+        self.labels: List[str] = [label for _, label in patterns]
+        # the class of each pattern, by the number of the group around it:
+        self._group_labels: Dict[int, str] = {}
+        group = 1
+        for pattern, label in patterns:
+            self._group_labels[group] = label
+            group += 1 + re.compile(pattern, flags).groups
+        self.pattern = re.compile(
+            "|".join("({})".format(pattern) for pattern, _ in patterns)
+            or "(?!)",
+            flags,
+        )
+
+    def finditer(self, text: str) -> Iterator[Span]:
+        """Find the matches of the patterns, which don't overlap.
+
+        Parameters
+        ----------
+        text : str
+
+        Yields
+        ------
+        Tuple[int, int, str]
+            The start, end and class of each non-empty match, in order.
+        """
+        labels = self._group_labels
+        for match in self.pattern.finditer(text):
+            start, end = match.span()
+            # the group around a pattern closes after the groups inside it:
+            if end > start and match.lastindex is not None:
+                yield start, end, labels[match.lastindex]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class PreTagger:
+    """Tag text with the terms of a gazetteer and regular expressions.
+
+    Where matches overlap, the one that starts first is kept, and of those
+    that start at the same character, the longest. The spans are therefore
+    valid `TextTagger` data with any overlap policy.
+
+    Parameters
+    ----------
+    gazetteer : Gazetteer, optional
+        The terms to tag.
+    regexes : RegexSet, optional
+        The patterns to tag.
+    snap_to_word_boundary : bool, optional
+        Whether matches have to start and end at word boundaries, by default
+        True. This is what the `TextTagger` option of the same name does with
+        selections: a match that starts or ends inside a word is dropped,
+        rather than stretched to whole words.
+    """
+
+    def __init__(
+        self,
+        gazetteer: Optional[Gazetteer] = None,
+        regexes: Optional[RegexSet] = None,
+        snap_to_word_boundary: bool = True,
+    ):
+        self.gazetteer = gazetteer
+        self.regexes = regexes
+        self.snap_to_word_boundary = snap_to_word_boundary
+
+    def __call__(self, text: str) -> List[Span]:
+        """Tag a text.
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        List[Tuple[int, int, str]]
+            The spans, in order.
+        """
+        matches: List[Span] = []
+        for source in (self.gazetteer, self.regexes):
+            if source is not None:
+                matches.extend(source.finditer(text))
+        if self.snap_to_word_boundary:
+            matches = [
+                span
+                for span in matches
+                if _is_boundary(text, span[0]) and _is_boundary(text, span[1])
+            ]
+        matches.sort(key=lambda span: (span[0], -span[1]))
+        spans: List[Span] = []
+        end = 0
+        for span in matches:
+            if span[0] >= end:
+                spans.append(span)
+                end = span[1]
+        return spans
+
+
+def tag_corpus(
+    texts: Iterable[str],
+    tagger: PreTagger,
+    processes: Optional[int] = None,
+    chunksize: int = 64,
+) -> List[List[Span]]:
+    """Tag many texts, in a pool of processes.
+
+    The tagger is sent to each process once, rather than with each text.
+
+    Parameters
+    ----------
+    texts : Iterable[str]
+        The texts to tag.
+    tagger : PreTagger
+        The tagger to use.
+    processes : int, optional
+        The number of processes, by default the number of CPUs. If 1, the
+        texts are tagged in this process.
+    chunksize : int, optional
+        The number of texts sent to a process at a time, by default 64.
+
+    Returns
+    -------
+    List[List[Tuple[int, int, str]]]
+        The spans of each text, in the order of the texts.
+    """
+    if processes == 1:
+        return [tagger(text) for text in texts]
+    if tagger.gazetteer is not None:
+        # rather than in each process:
+        tagger.gazetteer._compile()
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_set_worker_tagger,
+        initargs=(tagger,),
+    ) as executor:
+        return list(executor.map(_tag, texts, chunksize=chunksize))
+
+
+_worker_tagger: Optional[PreTagger] = None
+
+
+def _set_worker_tagger(tagger: PreTagger):
+    global _worker_tagger
+    _worker_tagger = tagger
+
+
+def _tag(text: str) -> List[Span]:
+    return _worker_tagger(text)  # type: ignore
+
+
+def _is_boundary(text: str, offset: int) -> bool:
+    """Whether an offset isn't between two characters of the same word."""
+    return not (
+        0 < offset < len(text)
+        and _is_word_character(text[offset - 1])
+        and _is_word_character(text[offset])
+    )
+
+
+def _is_word_character(character: str) -> bool:
+    return character.isalnum() or character == "_"
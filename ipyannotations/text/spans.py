@@ -0,0 +1,303 @@
+"""A sorted store of text spans, indexed for overlap queries.
+
+The spans are kept in an interval tree: a treap (a binary search tree that
+is balanced by random priorities) ordered by span, in which each node also
+knows the largest end of the spans below it. Inserting and removing a span
+takes O(log n) time, and finding the spans that overlap a range takes
+O(log n + k) time for k results.
+"""
+
+import random
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+Span = Tuple[int, int, str]
+
+#: What to do with a span that overlaps (or is nested in) another one:
+#: keep both, raise an error, or merge spans of the same class into one.
+OVERLAP_POLICIES = ("allow", "reject", "merge")
+
+
+class SpanStore:
+    """A set of (start, end, class) spans, in sorted order.
+
+    Spans that are added twice are only stored once, and spans have to
+    cover at least one character.
+
+    Parameters
+    ----------
+    spans : Iterable[Tuple[int, int, str]], optional
+        The spans to start with, by default none.
+    overlap : str, optional
+        What to do when a span overlaps another one, by default "allow":
+
+        - "allow" keeps both spans;
+        - "reject" raises a ValueError;
+        - "merge" replaces both with one span that covers both, if they have
+          the same class, and raises a ValueError otherwise.
+    """
+
+    def __init__(self, spans: Iterable[Span] = (), overlap: str = "allow"):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(
+                "overlap should be one of {}, not {!r}.".format(
+                    OVERLAP_POLICIES, overlap
+                )
+            )
+        self.overlap = overlap
+        self._root: Optional[_Node] = None
+        self._len = 0
+        for span in spans:
+            self.add(span)
+
+    def add(self, span: Span) -> Span:
+        """Add a span.
+
+        Parameters
+        ----------
+        span : Tuple[int, int, str]
+            The start, end and class of the span.
+
+        Returns
+        -------
+        Tuple[int, int, str]
+            The span that was stored, which covers all spans it was merged
+            with.
+
+        Raises
+        ------
+        ValueError
+            If the span doesn't end after it starts, or overlaps another span
+            that it can't be merged with.
+        """
+        span = tuple(span)  # type: ignore
+        start, end, label = span
+        if end <= start:
+            raise ValueError(
+                "The span {} doesn't end after it starts.".format(span)
+            )
+        if span in self:
+            return span
+        overlapping = self.overlapping(start, end)
+        if overlapping and self.overlap == "reject":
+            raise ValueError(
+                "The span {} overlaps {}.".format(span, overlapping[0])
+            )
+        if overlapping and self.overlap == "merge":
+            conflicts = [other for other in overlapping if other[2] != label]
+            if conflicts:
+                raise ValueError(
+                    "The span {} overlaps {}, which has a different "
+                    "class.".format(span, conflicts[0])
+                )
+            for other in overlapping:
+                self.remove(other)
+            start = min(start, *(other[0] for other in overlapping))
+            end = max(end, *(other[1] for other in overlapping))
+            span = (start, end, label)
+        self._root = _insert(self._root, _Node(span))
+        self._len += 1
+        return span
+
+    def remove(self, span: Span):
+        """Remove a span.
+
+        Raises
+        ------
+        KeyError
+            If the span isn't stored.
+        """
+        span = tuple(span)  # type: ignore
+        if span not in self:
+            raise KeyError(span)
+        self._root = _delete(self._root, span)
+        self._len -= 1
+
+    def overlapping(self, start: int, end: int) -> List[Span]:
+        """The spans that overlap a range of the text, in order.
+
+        Parameters
+        ----------
+        start : int
+            The first character of the range.
+        end : int
+            The character after the range.
+
+        Returns
+        -------
+        List[Tuple[int, int, str]]
+        """
+        found: List[Span] = []
+        _overlapping(self._root, start, end, found)
+        return found
+
+    def at(self, offset: int) -> List[Span]:
+        """The spans that contain a character, in order."""
+        return self.overlapping(offset, offset + 1)
+
+    def assign(self, spans: Iterable[Span]) -> List[Span]:
+        """Make the store hold a list of spans.
+
+        Only the spans that differ from the stored ones are removed and
+        added, so changing a few spans of a long list is fast. If a span
+        can't be added, the store is left unchanged.
+
+        Parameters
+        ----------
+        spans : Iterable[Tuple[int, int, str]]
+
+        Returns
+        -------
+        List[Tuple[int, int, str]]
+            The stored spans, in order.
+
+        Raises
+        ------
+        ValueError
+            If a span overlaps another one that it can't be merged with.
+        """
+        spans = [tuple(span) for span in spans]  # type: ignore
+        previous = list(self)
+        start, old_end, new_end = changed_range(previous, spans)
+        try:
+            for span in previous[start:old_end]:
+                self.remove(span)
+            for span in spans[start:new_end]:
+                self.add(span)
+        except ValueError:
+            self._reset(previous)
+            raise
+        return list(self)
+
+    def _reset(self, spans: List[Span]):
+        """Store sorted spans that are known not to conflict."""
+        self._root = None
+        for span in spans:
+            self._root = _insert(self._root, _Node(span))
+        self._len = len(spans)
+
+    def __contains__(self, span) -> bool:
+        span = tuple(span)
+        node = self._root
+        while node is not None and node.span != span:
+            node = node.left if span < node.span else node.right
+        return node is not None
+
+    def __iter__(self) -> Iterator[Span]:
+        # in order, without recursion:
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.span
+            node = node.right
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return "SpanStore({!r}, overlap={!r})".format(list(self), self.overlap)
+
+
+def changed_range(old: list, new: list) -> Tuple[int, int, int]:
+    """Where two lists differ: after their common start, before their end.
+
+    Returns
+    -------
+    Tuple[int, int, int]
+        The index of the first difference, and the end of the differing
+        items in `old` and in `new`.
+    """
+    shortest = min(len(old), len(new))
+    start = 0
+    while start < shortest and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and old[-end - 1] == new[-end - 1]:
+        end += 1
+    return start, len(old) - end, len(new) - end
+
+
+class _Node:
+    __slots__ = ("span", "priority", "max_end", "left", "right")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self.priority = random.random()
+        self.max_end = span[1]
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _update(node: "_Node") -> "_Node":
+    node.max_end = node.span[1]
+    if node.left is not None and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+    return node
+
+
+def _split(node: Optional[_Node], span: Span):
+    """Split a tree into the nodes before a span, and the others."""
+    if node is None:
+        return None, None
+    if node.span < span:
+        node.right, right = _split(node.right, span)
+        return _update(node), right
+    left, node.left = _split(node.left, span)
+    return left, _update(node)
+
+
+def _join(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Join two trees, when all spans in the left one are smaller."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _join(left.right, right)
+        return _update(left)
+    right.left = _join(left, right.left)
+    return _update(right)
+
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    if node is None:
+        return new
+    if new.priority > node.priority:
+        new.left, new.right = _split(node, new.span)
+        return _update(new)
+    if new.span < node.span:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    return _update(node)
+
+
+def _delete(node: Optional[_Node], span: Span) -> Optional[_Node]:
+    if node is None:
+        return None
+    if node.span == span:
+        return _join(node.left, node.right)
+    if span < node.span:
+        node.left = _delete(node.left, span)
+    else:
+        node.right = _delete(node.right, span)
+    return _update(node)
+
+
+def _overlapping(
+    node: Optional[_Node], start: int, end: int, found: List[Span]
+):
+    # no span below a node ends after its max_end:
+    if node is None or node.max_end <= start:
+        return
+    _overlapping(node.left, start, end, found)
+    # spans to the right start later, so they can't overlap either:
+    if node.span[0] < end:
+        if node.span[1] > start:
+            found.append(node.span)
+        _overlapping(node.right, start, end, found)
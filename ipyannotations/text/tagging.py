@@ -1,13 +1,61 @@
+import sys
+from typing import List
+
 import ipywidgets as widgets
 import traitlets
+from traitlets import TraitError
 
 from ..base import LabellingWidgetMixin
 from .._frontend import module_name, module_version
+from .spans import Span, SpanStore, changed_range
+
+
+class SpanList(traitlets.List):
+    """A list of (start, end, class) spans.
+
+    The spans are checked in one pass, rather than with a trait for each
+    number and string, which keeps assigning thousands of spans fast.
+    """
+
+    info_text = "a list of (start, end, class) spans"
+
+    def info(self):
+        return self.info_text
+
+    def validate_elements(self, obj, value):
+        spans = []
+        for span in value:
+            try:
+                start, end, label = span
+            except (TypeError, ValueError):
+                self.error(obj, value)
+            if not (
+                isinstance(start, int)
+                and isinstance(end, int)
+                and isinstance(label, str)
+            ):
+                self.error(obj, value)
+            spans.append((start, end, label))
+        return spans
 
 
 @widgets.register
 class TextTaggerCore(widgets.DOMWidget):
-    """A text tagging javascript widget."""
+    """A text tagging javascript widget.
+
+    The spans aren't synced as a whole with the frontend. Instead, both sides
+    send the changes they make as a list of operations, which each add,
+    remove or update one span:
+
+    - ``{"type": "spans", "seq": n, "ops": [...]}`` changes the spans. The
+      sequence number ``n`` counts the changes made to the spans so far, and
+      a change is only applied if it directly follows the last one.
+    - ``{"type": "reset", "seq": n, "spans": [...]}`` replaces all spans. It
+      is sent when the frontend asks for the spans with
+      ``{"type": "request_spans"}``, or when a change from the frontend
+      didn't follow the last change (because both sides changed the spans at
+      the same time).
+    """
 
     # properties to make sure the right frontend widget is found:
     _view_name = traitlets.Unicode("TextTaggerView").tag(sync=True)
@@ -25,11 +73,8 @@ class TextTaggerCore(widgets.DOMWidget):
     ).tag(sync=True)
     selected_class = traitlets.Unicode().tag(sync=True)
     snap_to_word_boundary = traitlets.Bool().tag(sync=True)
-    entity_spans = traitlets.List(
-        trait=traitlets.Tuple(
-            traitlets.Int(), traitlets.Int(), traitlets.Unicode()
-        )
-    ).tag(sync=True)
+    # synced with custom messages, see the class docstring:
+    entity_spans = SpanList()
     palette = traitlets.List(
         trait=traitlets.Unicode(),
         default_value=[
@@ -54,6 +99,7 @@ class TextTaggerCore(widgets.DOMWidget):
         classes=["MISC", "PER", "LOC", "ORG"],
         entity_spans=[],
         snap_to_word_boundary=True,
+        overlap="allow",
         **kwargs,
     ):
         """Create a text tagging "core" widget.
@@ -80,7 +126,15 @@ class TextTaggerCore(widgets.DOMWidget):
         snap_to_word_boundary : bool
             Whether to always snap to the word boundary, even when a
             word is only partially selected.
+        overlap : str, optional
+            What to do with a span that overlaps, or is nested in, another
+            one: "allow" it, "reject" it, or "merge" it with spans of the
+            same class. By default "allow".
         """
+        #: The spans, in order, indexed for overlap queries.
+        self.spans = SpanStore(overlap=overlap)
+        self._spans_seq = 0
+        self._applying_frontend_change = False
         super().__init__(
             text=text,
             classes=classes,
@@ -90,16 +144,73 @@ class TextTaggerCore(widgets.DOMWidget):
         )
         if not self.selected_class:
             self.selected_class = self.classes[0]
+        self.on_msg(self._handle_span_message)
 
+    @traitlets.validate("entity_spans")
+    def _validate_spans(self, proposal: dict):
+        return self._checked_spans(proposal["value"])
 
-class TextTagger(LabellingWidgetMixin, widgets.VBox):
-    """A tagging widget to annotate tokens inside text."""
+    def _checked_spans(self, spans: List[Span]) -> List[Span]:
+        """Store spans, and return them sorted, merged and de-duplicated."""
+        try:
+            return self.spans.assign(spans)
+        except ValueError as error:
+            raise TraitError(str(error)) from error
+
+    @traitlets.observe("entity_spans")
+    def _send_span_changes(self, change: dict):
+        if self._applying_frontend_change:
+            return
+        # the first value replaces no spans:
+        self._send_changes(change["old"] or [], change["new"])
 
-    data = traitlets.List(
-        trait=traitlets.Tuple(
-            traitlets.Int(), traitlets.Int(), traitlets.Unicode()
+    def _send_changes(self, old: List[Span], new: List[Span]):
+        self._spans_seq += 1
+        ops = span_operations(old, new)
+        if len(ops) > len(new):
+            # replacing all spans is shorter:
+            self._send_spans()
+        else:
+            self.send({"type": "spans", "seq": self._spans_seq, "ops": ops})
+
+    def _send_spans(self):
+        self.send(
+            {
+                "type": "reset",
+                "seq": self._spans_seq,
+                "spans": [list(span) for span in self.entity_spans],
+            }
         )
-    )
+
+    def _handle_span_message(self, _, content: dict, buffers: list):
+        if content.get("type") == "request_spans":
+            self._send_spans()
+        elif content.get("type") == "spans":
+            if content.get("seq") != self._spans_seq + 1:
+                # the spans changed here in the meantime:
+                self._spans_seq += 1
+                self._send_spans()
+                return
+            try:
+                spans = apply_span_operations(
+                    self.entity_spans, content["ops"]
+                )
+                self._applying_frontend_change = True
+                self.entity_spans = spans
+            except (IndexError, KeyError, TypeError, ValueError, TraitError):
+                self._spans_seq += 1
+                self._send_spans()
+                return
+            finally:
+                self._applying_frontend_change = False
+            self._spans_seq = content["seq"]
+            if self.entity_spans != spans:
+                # the spans were sorted, merged or de-duplicated:
+                self._send_changes(spans, self.entity_spans)
+
+
+class TextTagger(LabellingWidgetMixin, widgets.VBox):
+    """A tagging widget to annotate tokens inside text."""
 
     def __init__(
         self,
@@ -108,6 +219,7 @@ class TextTagger(LabellingWidgetMixin, widgets.VBox):
         data=[],
         button_width="5em",
         snap_to_word_boundary=True,
+        overlap="allow",
     ):
         """A tagging widget to annotate tokens inside text.
 
@@ -127,6 +239,11 @@ class TextTagger(LabellingWidgetMixin, widgets.VBox):
             boundaries. For most languages, this should be left True, but some
             languages are based off single characters (e.g. traditional
             mandarin).
+        overlap : str, optional
+            What to do with a span that overlaps, or is nested in, another
+            one: "allow" it, "reject" it, or "merge" it with spans of the
+            same class. By default "allow". The spans in `data` are always
+            sorted, and each span is only kept once.
         """
         super().__init__()
         self.text_widget = TextTaggerCore(
@@ -134,6 +251,7 @@ class TextTagger(LabellingWidgetMixin, widgets.VBox):
             classes=classes,
             entity_spans=data,
             snap_to_word_boundary=snap_to_word_boundary,
+            overlap=overlap,
         )
         self.class_selector = widgets.ToggleButtons(
             options=classes,
@@ -144,7 +262,7 @@ class TextTagger(LabellingWidgetMixin, widgets.VBox):
             (self.class_selector, "value"),
             (self.text_widget, "selected_class"),
         )
-        widgets.link((self, "data"), (self.text_widget, "entity_spans"))
+        self.text_widget.observe(self._append_undo_fn, "entity_spans")
         self.children = (self.text_widget, self.class_selector)
 
         self.children = (
@@ -162,6 +280,24 @@ class TextTagger(LabellingWidgetMixin, widgets.VBox):
         )
         self.__undo_in_process = False
 
+    @property
+    def spans(self) -> SpanStore:
+        """The spans, in order, indexed for overlap queries."""
+        return self.text_widget.spans
+
+    @property
+    def data(self) -> List[Span]:
+        """The tagged spans, as (start, end, class) tuples, in order.
+
+        This is the same list as the ``entity_spans`` of the text widget,
+        and is checked when it is assigned.
+        """
+        return self.text_widget.entity_spans
+
+    @data.setter
+    def data(self, value: List[Span]):
+        self.text_widget.entity_spans = value
+
     def display(self, text: str):
         """Display text to be tagged.
 
@@ -173,22 +309,101 @@ class TextTagger(LabellingWidgetMixin, widgets.VBox):
         self.clear()
         self._undo_queue.clear()
 
-    @traitlets.observe("data")
-    def _append_undo_fn(self, proposal: dict):
+    def clear(self):
+        """Remove all spans."""
+        self.data = []
+
+    def _append_undo_fn(self, change: dict):
         if self.__undo_in_process:
             return
-        old_data = proposal["old"]
+        old, new = list(change["old"]), list(change["new"])
+        # only the spans that changed are kept, not copies of all spans:
+        start, old_end, new_end = changed_range(old, new)
+        removed, added = old[start:old_end], new[start:new_end]
+        self._undo_queue.append(
+            lambda: self._replace_spans(start, len(added), removed),
+            lambda: self._replace_spans(start, len(removed), added),
+            nbytes=sum(sys.getsizeof(span) for span in removed + added),
+        )
 
-        def _undo_data_change():
-            self.__undo_in_process = True
-            self.data = old_data
+    def _replace_spans(self, start: int, n_spans: int, spans: list):
+        self.__undo_in_process = True
+        try:
+            self.data = (
+                self.data[:start] + spans + self.data[start + n_spans :]
+            )
+        finally:
             self.__undo_in_process = False
 
-        self._undo_queue.append(_undo_data_change)
-
     def _handle_keystroke(self, event):
         super()._handle_keystroke(event)
         keys = [str(i) for i in range(1, 10)] + ["0"]
         for key, option in zip(keys, self.class_selector.options):
             if event.get("key") == key:
                 self.class_selector.value = option
+
+
+def span_operations(old: List[Span], new: List[Span]) -> List[dict]:
+    """The operations that turn one list of spans into another.
+
+    Parameters
+    ----------
+    old : List[Tuple[int, int, str]]
+    new : List[Tuple[int, int, str]]
+
+    Returns
+    -------
+    List[dict]
+        Operations with the keys ``"op"`` (``"add"``, ``"remove"`` or
+        ``"update"``), ``"index"`` and, unless a span is removed, ``"span"``.
+    """
+    start, old_end, new_end = changed_range(old, new)
+    n_updated = min(old_end, new_end) - start
+    ops = [
+        {"op": "update", "index": index, "span": list(new[index])}
+        for index in range(start, start + n_updated)
+    ]
+    ops += [
+        {"op": "remove", "index": start + n_updated}
+        for _ in range(start + n_updated, old_end)
+    ]
+    ops += [
+        {"op": "add", "index": index, "span": list(new[index])}
+        for index in range(start + n_updated, new_end)
+    ]
+    return ops
+
+
+def apply_span_operations(spans: List[Span], ops: List[dict]) -> List[Span]:
+    """Apply operations from `span_operations` to a copy of a list of spans.
+
+    Parameters
+    ----------
+    spans : List[Tuple[int, int, str]]
+    ops : List[dict]
+
+    Returns
+    -------
+    List[Tuple[int, int, str]]
+
+    Raises
+    ------
+    ValueError
+        If an operation isn't known.
+    IndexError
+        If an operation refers to a span that doesn't exist.
+    """
+    spans = list(spans)
+    for op in ops:
+        index = op["index"]
+        if not 0 <= index <= len(spans) - (op["op"] != "add"):
+            raise IndexError("There is no span {}.".format(index))
+        if op["op"] == "add":
+            spans.insert(index, tuple(op["span"]))
+        elif op["op"] == "remove":
+            del spans[index]
+        elif op["op"] == "update":
+            spans[index] = tuple(op["span"])
+        else:
+            raise ValueError("Unknown operation {!r}.".format(op["op"]))
+    return spans
@@ -0,0 +1,325 @@
+"""Account for the comm traffic between widgets and the frontend.
+
+Every interaction with a widget sends messages between the kernel and the
+browser. On a remote server these messages can make widgets feel slow, so
+this module counts the messages and bytes each widget (and each of its traits)
+sends and receives.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import ipywidgets as widgets
+
+SENT = "sent"
+RECEIVED = "received"
+
+#: The pseudo-trait that the initial state sent when a widget opens counts as.
+OPEN = "<open>"
+#: The pseudo-trait that custom messages count as.
+CUSTOM = "<custom>"
+
+
+@dataclass
+class TrafficStats:
+    """The number of messages and bytes counted for something."""
+
+    messages: int = 0
+    nbytes: int = 0
+
+    def add(self, messages: int, nbytes: int):
+        self.messages += messages
+        self.nbytes += nbytes
+
+
+_ACTIVE_MONITORS: List["CommTrafficMonitor"] = []
+_ORIGINAL_METHODS: Dict[str, Any] = {}
+
+
+class CommTrafficMonitor:
+    """Count the comm messages and bytes sent and received by widgets.
+
+    While the monitor is active (either using it as a context manager, or
+    between calls to ``start`` and ``stop``), every state update, custom
+    message, and the initial state of newly created widgets is counted, in
+    both directions. This also works without a frontend, in which case the
+    messages that would have been sent are counted.
+
+    Parameters
+    ----------
+    root : widgets.Widget, optional
+        If provided, only count traffic for this widget and the widgets it
+        contains (found through its traits, e.g. ``children``). The widgets
+        are found again whenever one of these traits changes. By default,
+        all widgets are counted.
+    """
+
+    def __init__(self, root: Optional[widgets.Widget] = None):
+        self.root = root
+        self._stats: Dict[Tuple[str, str, str, str], TrafficStats] = (
+            defaultdict(TrafficStats)
+        )
+        # the ids of the widgets in root, or None if they need to be found:
+        self._members: Optional[Set[int]] = None
+        self._observed: List[Tuple[widgets.Widget, List[str]]] = []
+
+    def start(self):
+        """Start counting messages."""
+        if self not in _ACTIVE_MONITORS:
+            _ACTIVE_MONITORS.append(self)
+        _install()
+
+    def stop(self):
+        """Stop counting messages."""
+        if self in _ACTIVE_MONITORS:
+            _ACTIVE_MONITORS.remove(self)
+        if not _ACTIVE_MONITORS:
+            _uninstall()
+        self._forget_members()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def reset(self):
+        """Discard all counts."""
+        self._stats.clear()
+
+    def summary(self, by: str = "class") -> List[dict]:
+        """Summarise the traffic, sorted from most to fewest bytes.
+
+        Parameters
+        ----------
+        by : str, optional
+            Either "class" (the default) to group the traffic of all widgets
+            of the same class, or "widget" to report every widget instance
+            separately.
+
+        Returns
+        -------
+        List[dict]
+            One entry per widget (class), trait and direction, with the keys
+            ``widget``, ``trait``, ``direction``, ``messages`` and ``bytes``.
+        """
+        if by not in ("class", "widget"):
+            raise ValueError("You can summarise by 'class' or 'widget'.")
+        grouped: Dict[Tuple[str, str, str], TrafficStats] = defaultdict(
+            TrafficStats
+        )
+        for (cls, widget, trait, direction), stats in self._stats.items():
+            name = cls if by == "class" else widget
+            grouped[(name, trait, direction)].add(stats.messages, stats.nbytes)
+        rows = [
+            {
+                "widget": name,
+                "trait": trait,
+                "direction": direction,
+                "messages": stats.messages,
+                "bytes": stats.nbytes,
+            }
+            for (name, trait, direction), stats in grouped.items()
+        ]
+        return sorted(rows, key=lambda row: (-row["bytes"], row["widget"]))
+
+    def total(self, direction: Optional[str] = None) -> TrafficStats:
+        """The total traffic counted.
+
+        Parameters
+        ----------
+        direction : str, optional
+            Either "sent" or "received". By default, both are counted.
+        """
+        total = TrafficStats()
+        for (_, _, _, stats_direction), stats in self._stats.items():
+            if direction is None or stats_direction == direction:
+                total.add(stats.messages, stats.nbytes)
+        return total
+
+    def report(self, by: str = "class", top: Optional[int] = 20) -> str:
+        """A plain text table of the traffic summary.
+
+        Parameters
+        ----------
+        by : str, optional
+            Either "class" or "widget", see `summary`.
+        top : int, optional
+            How many rows to include, by default 20.
+        """
+        rows = self.summary(by=by)[:top]
+        header = ("widget", "trait", "direction", "messages", "bytes")
+        lines = [header] + [
+            tuple(str(row[column]) for column in header) for row in rows
+        ]
+        widths = [max(len(line[i]) for line in lines) for i in range(5)]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) for cell, width in zip(line, widths)
+            ).rstrip()
+            for line in lines
+        )
+
+    def _is_member(self, widget: widgets.Widget) -> bool:
+        if self.root is None:
+            return True
+        if self._members is None:
+            self._find_members()
+        return id(widget) in self._members  # type: ignore
+
+    def _find_members(self):
+        """Find the widgets in root, and watch the traits that contain them."""
+        self._forget_members()
+        self._members = set()
+        for widget in _walk(self.root):
+            self._members.add(id(widget))
+            names = _container_traits(widget)
+            if names:
+                widget.observe(self._members_changed, names=names)
+                self._observed.append((widget, names))
+
+    def _members_changed(self, change: dict):
+        # found again when the next message is counted:
+        self._forget_members()
+
+    def _forget_members(self):
+        for widget, names in self._observed:
+            widget.unobserve(self._members_changed, names=names)
+        self._observed = []
+        self._members = None
+
+    def _count(
+        self,
+        widget: widgets.Widget,
+        direction: str,
+        sizes: Iterable[Tuple[str, int]],
+    ):
+        if not self._is_member(widget):
+            return
+        cls = type(widget).__name__
+        label = "{}({})".format(cls, (widget.model_id or "")[:8])
+        for trait, nbytes in sizes:
+            self._stats[(cls, label, trait, direction)].add(1, nbytes)
+
+
+def _container_traits(widget: widgets.Widget) -> List[str]:
+    """The traits of a widget that can contain other widgets."""
+    return [
+        name
+        for name in widget.trait_names()
+        if isinstance(
+            getattr(widget, name, None), (widgets.Widget, list, tuple)
+        )
+    ]
+
+
+def _walk(root: widgets.Widget) -> Iterable[widgets.Widget]:
+    """All widgets reachable from a widget through its traits."""
+    seen = set()
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        if id(widget) in seen:
+            continue
+        seen.add(id(widget))
+        yield widget
+        for name in widget.trait_names():
+            value = getattr(widget, name, None)
+            if isinstance(value, widgets.Widget):
+                stack.append(value)
+            elif isinstance(value, (list, tuple)):
+                stack.extend(
+                    item for item in value if isinstance(item, widgets.Widget)
+                )
+
+
+def _nbytes(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _buffer_nbytes(buffers: Optional[Iterable]) -> int:
+    return sum(memoryview(buffer).nbytes for buffer in buffers or [])
+
+
+def _state_sizes(msg: dict, buffers: Optional[list]) -> List[Tuple[str, int]]:
+    """Split the size of a state message between the traits it contains."""
+    buffer_sizes: Dict[str, int] = defaultdict(int)
+    for path, buffer in zip(msg.get("buffer_paths", []), buffers or []):
+        buffer_sizes[path[0]] += memoryview(buffer).nbytes
+    state = msg.get("state", {})
+    traits = list(state) + [
+        trait for trait in buffer_sizes if trait not in state
+    ]
+    return [
+        (trait, _nbytes(state.get(trait, None)) + buffer_sizes[trait])
+        for trait in traits
+    ]
+
+
+def _split_state(state: dict) -> Tuple[dict, list]:
+    """Separate binary buffers from a state, like ipywidgets does."""
+    state, buffer_paths, buffers = widgets.widget._remove_buffers(state)
+    return {"state": state, "buffer_paths": buffer_paths}, buffers
+
+
+def _message_sizes(
+    msg: dict, buffers: Optional[list]
+) -> List[Tuple[str, int]]:
+    if msg.get("method") in ("update", "echo_update"):
+        return _state_sizes(msg, buffers)
+    return [(CUSTOM, _nbytes(msg.get("content")) + _buffer_nbytes(buffers))]
+
+
+def _record(widget: widgets.Widget, direction: str, sizes):
+    for monitor in _ACTIVE_MONITORS:
+        monitor._count(widget, direction, sizes)
+
+
+def _monitored_send(self, msg, buffers=None):
+    _record(self, SENT, _message_sizes(msg, buffers))
+    return _ORIGINAL_METHODS["_send"](self, msg, buffers=buffers)
+
+
+def _monitored_set_state(self, sync_data):
+    _record(self, RECEIVED, _state_sizes(*_split_state(sync_data)))
+    return _ORIGINAL_METHODS["set_state"](self, sync_data)
+
+
+def _monitored_handle_custom_msg(self, content, buffers):
+    sizes = [(CUSTOM, _nbytes(content) + _buffer_nbytes(buffers))]
+    _record(self, RECEIVED, sizes)
+    return _ORIGINAL_METHODS["_handle_custom_msg"](self, content, buffers)
+
+
+def _monitored_open(self):
+    opening = self.comm is None
+    _ORIGINAL_METHODS["open"](self)
+    if opening and self.comm is not None:
+        msg, buffers = _split_state(self.get_state())
+        nbytes = sum(size for _, size in _state_sizes(msg, buffers))
+        _record(self, SENT, [(OPEN, nbytes)])
+
+
+_PATCHES = {
+    "_send": _monitored_send,
+    "set_state": _monitored_set_state,
+    "_handle_custom_msg": _monitored_handle_custom_msg,
+    "open": _monitored_open,
+}
+
+
+def _install():
+    if _ORIGINAL_METHODS:
+        return
+    for name, patch in _PATCHES.items():
+        _ORIGINAL_METHODS[name] = getattr(widgets.Widget, name)
+        setattr(widgets.Widget, name, patch)
+
+
+def _uninstall():
+    for name, original in _ORIGINAL_METHODS.items():
+        setattr(widgets.Widget, name, original)
+    _ORIGINAL_METHODS.clear()
@@ -129,6 +129,11 @@ setup_args = dict(
             "docargs",
             "jupyter_packaging",
         ],
+        "video": [
+            # Reading video files in image sequence annotators
+            "imageio",
+            "imageio-ffmpeg",
+        ],
         "examples": [
             # Any requirements for the examples to run
         ],
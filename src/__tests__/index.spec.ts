@@ -1,6 +1,12 @@
 import { createTestModel } from './utils';
 
-import { TextTaggerModel } from '..';
+import {
+  TextTaggerModel,
+  apply_span_ops,
+  chunk_starts,
+  find_chunk,
+  Span,
+} from '..';
 
 describe('Example', () => {
   describe('ExampleModel', () => {
@@ -8,7 +14,7 @@ describe('Example', () => {
       const model = createTestModel(TextTaggerModel);
       expect(model).toBeInstanceOf(TextTaggerModel);
       expect(model.get('text')).toEqual('');
-      expect(model.get('entity_spans')).toEqual([]);
+      expect(model.spans).toEqual([]);
       expect(model.get('classes')).toEqual([]);
       expect(model.get('palette')).toEqual([]);
       expect(model.get('selected_class')).toEqual('');
@@ -19,7 +25,7 @@ describe('Example', () => {
       const model = createTestModel(TextTaggerModel, state);
       expect(model).toBeInstanceOf(TextTaggerModel);
       expect(model.get('text')).toEqual('Test text.');
-      expect(model.get('entity_spans')).toEqual([]);
+      expect(model.spans).toEqual([]);
     });
 
     it('should be createable with a custom classes', () => {
@@ -27,8 +33,78 @@ describe('Example', () => {
       const model = createTestModel(TextTaggerModel, state);
       expect(model).toBeInstanceOf(TextTaggerModel);
       expect(model.get('text')).toEqual('Test text.');
-      expect(model.get('entity_spans')).toEqual([]);
+      expect(model.spans).toEqual([]);
       expect(model.get('classes')).toEqual(['hi', 'hello']);
     });
+
+    it('should apply span changes in sequence', () => {
+      const model = createTestModel(TextTaggerModel);
+      model._handle_span_message({
+        type: 'reset',
+        seq: 3,
+        spans: [[0, 4, 'PER']],
+      });
+      model._handle_span_message({
+        type: 'spans',
+        seq: 4,
+        ops: [
+          { op: 'add', index: 1, span: [5, 9, 'LOC'] },
+          { op: 'update', index: 0, span: [0, 4, 'ORG'] },
+        ],
+      });
+      expect(model.spans).toEqual([
+        [0, 4, 'ORG'],
+        [5, 9, 'LOC'],
+      ]);
+      // changes that don't follow the last one are ignored:
+      model._handle_span_message({
+        type: 'spans',
+        seq: 6,
+        ops: [{ op: 'remove', index: 0 }],
+      });
+      expect(model.spans.length).toEqual(2);
+      model.edit_spans([{ op: 'remove', index: 0 }]);
+      expect(model.spans).toEqual([[5, 9, 'LOC']]);
+      expect(model.spans_seq).toEqual(5);
+    });
+  });
+});
+
+describe('Chunks', () => {
+  it('should split long text at new lines and spaces', () => {
+    const text = 'word '.repeat(300) + '\n' + 'word '.repeat(1000);
+    const starts = chunk_starts(text);
+    expect(starts[0]).toEqual(0);
+    expect(starts[1]).toEqual(1501);
+    for (let i = 1; i < starts.length; i++) {
+      expect(starts[i] - starts[i - 1]).toBeLessThanOrEqual(2000);
+      expect(text[starts[i] - 1]).toMatch(/\s/);
+    }
+    expect(chunk_starts('short text')).toEqual([0]);
+    expect(chunk_starts('a'.repeat(4500))).toEqual([0, 2000, 4000]);
+  });
+
+  it('should find the chunk of a character', () => {
+    const starts = [0, 10, 25];
+    expect(find_chunk(starts, 0)).toEqual(0);
+    expect(find_chunk(starts, 9)).toEqual(0);
+    expect(find_chunk(starts, 10)).toEqual(1);
+    expect(find_chunk(starts, 100)).toEqual(2);
+  });
+
+  it('should return the ranges that span changes affect', () => {
+    const spans: Span[] = [[0, 4, 'PER']];
+    const ranges = apply_span_ops(spans, [
+      { op: 'update', index: 0, span: [10, 14, 'PER'] },
+      { op: 'add', index: 1, span: [20, 24, 'LOC'] },
+      { op: 'remove', index: 0 },
+    ]);
+    expect(spans).toEqual([[20, 24, 'LOC']]);
+    expect(ranges).toEqual([
+      [0, 4],
+      [10, 14],
+      [20, 24],
+      [10, 14],
+    ]);
   });
 });
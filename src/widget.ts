@@ -16,6 +16,97 @@ interface NonStandardSelection extends Selection {
   modify(s: string, t: string, u: string): void;
 }
 
+export type Span = [number, number, string];
+
+// A change to one span. The spans are synced with the kernel as lists of
+// these, each with a sequence number, rather than as a whole.
+export type SpanOp =
+  | { op: 'add'; index: number; span: Span }
+  | { op: 'remove'; index: number }
+  | { op: 'update'; index: number; span: Span };
+
+interface SpanMessage {
+  type: 'spans' | 'reset';
+  seq: number;
+  ops?: SpanOp[];
+  spans?: Span[];
+}
+
+// The number of characters the text is split into chunks of, which are
+// only rendered while they are near the visible part of the page.
+export const CHUNK_SIZE = 2000;
+
+/**
+ * Apply changes to a list of spans, and return the ranges of the text they
+ * affect (where spans were removed from, and where they were added).
+ */
+export function apply_span_ops(
+  spans: Span[],
+  ops: SpanOp[]
+): [number, number][] {
+  const ranges: [number, number][] = [];
+  for (const op of ops) {
+    if (op.op !== 'add') {
+      ranges.push([spans[op.index][0], spans[op.index][1]]);
+    }
+    if (op.op === 'add') {
+      spans.splice(op.index, 0, op.span);
+    } else if (op.op === 'remove') {
+      spans.splice(op.index, 1);
+    } else {
+      spans[op.index] = op.span;
+    }
+    if (op.op !== 'remove') {
+      ranges.push([op.span[0], op.span[1]]);
+    }
+  }
+  return ranges;
+}
+
+/**
+ * Where each chunk of a text starts. Chunks end after a new line or a space
+ * near the chunk size, if there is one.
+ */
+export function chunk_starts(text: string, size = CHUNK_SIZE): number[] {
+  const starts = [0];
+  let start = 0;
+  while (text.length - start > size) {
+    let end = text.lastIndexOf('\n', start + size);
+    if (end <= start + size / 2) {
+      end = text.lastIndexOf(' ', start + size);
+    }
+    end = end <= start + size / 2 ? start + size : end + 1;
+    starts.push(end);
+    start = end;
+  }
+  return starts;
+}
+
+/**
+ * The index of the chunk that contains a character, by binary search.
+ */
+export function find_chunk(starts: number[], offset: number): number {
+  let low = 0;
+  let high = starts.length - 1;
+  while (low < high) {
+    const middle = Math.ceil((low + high) / 2);
+    if (starts[middle] <= offset) {
+      low = middle;
+    } else {
+      high = middle - 1;
+    }
+  }
+  return low;
+}
+
+function escape_html(text: string): string {
+  return text
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
 export class TextTaggerModel extends DOMWidgetModel {
   defaults(): {
     _model_module: string;
@@ -37,12 +128,51 @@ export class TextTaggerModel extends DOMWidgetModel {
       text: '',
       classes: [],
       selected_class: '',
-      entity_spans: [],
       palette: [],
       snap_to_word_boundary: true,
     };
   }
 
+  initialize(attributes: any, options: any): void {
+    super.initialize(attributes, options);
+    this.spans = [];
+    this.spans_seq = 0;
+    this.on('msg:custom', this._handle_span_message, this);
+    this.send({ type: 'request_spans' }, {});
+  }
+
+  /**
+   * Change the spans, and send the change to the kernel.
+   */
+  edit_spans(ops: SpanOp[]): void {
+    const ranges = apply_span_ops(this.spans, ops);
+    this.spans_seq += 1;
+    this.send({ type: 'spans', seq: this.spans_seq, ops: ops }, {});
+    this.trigger('spans:change', ranges);
+  }
+
+  _handle_span_message(message: SpanMessage): void {
+    // the ranges of the text that changed, or null if all of it did:
+    let ranges: [number, number][] | null = null;
+    if (message.type === 'reset' && message.spans) {
+      this.spans = message.spans;
+    } else if (message.type === 'spans' && message.ops) {
+      if (message.seq !== this.spans_seq + 1) {
+        // the kernel rejects our last change, and sends all spans:
+        return;
+      }
+      ranges = apply_span_ops(this.spans, message.ops);
+    } else {
+      return;
+    }
+    this.spans_seq = message.seq;
+    this.trigger('spans:change', ranges);
+  }
+
+  // the spans are synced with custom messages rather than as an attribute:
+  spans: Span[];
+  spans_seq: number;
+
   static serializers: ISerializers = {
     ...DOMWidgetModel.serializers,
     // Add any extra serializers here
@@ -56,47 +186,207 @@ export class TextTaggerModel extends DOMWidgetModel {
   static view_module_version = MODULE_VERSION;
 }
 
+/**
+ * Displays the text in chunks, and renders only the chunks near the visible
+ * part of the page. Chunks further away are empty, with the height they had
+ * (or are estimated to have), and changes to spans only re-render the chunks
+ * they are in.
+ */
 export class TextTaggerView extends DOMWidgetView {
+  model: TextTaggerModel;
+
   render(): void {
     this.el.classList.add('entity-tagger');
+    this._starts = [];
+    this._chunks = [];
+    this._rendered = [];
+    this._chunk_spans = null;
+    this._dirty = new Set();
+    this._render_request = null;
+    // characters per pixel of height, to estimate the height of chunks:
+    this._height_per_character = 0.35;
+    if (typeof IntersectionObserver !== 'undefined') {
+      this._observer = new IntersectionObserver(
+        this._on_intersection.bind(this),
+        { rootMargin: '100% 0px' }
+      );
+    }
     this._render_text();
     // Observe changes in the value traitlet in Python, and define
     // a custom callback.
     this.listenTo(this.model, 'change:text', this._render_text);
-    this.listenTo(this.model, 'change:entity_spans', this._render_text);
+    this.listenTo(this.model, 'spans:change', this._on_spans_change);
     this.el.addEventListener('mouseup', this.on_click.bind(this));
   }
 
+  remove(): any {
+    if (this._observer) {
+      this._observer.disconnect();
+    }
+    return super.remove();
+  }
+
+  /**
+   * Split the text into chunks, and render the visible ones.
+   */
   _render_text(): void {
-    let text = this.model.get('text');
-    const entity_spans = this.model.get('entity_spans');
-    entity_spans.sort((a: number[], b: number[]) => {
-      return a[0] - b[0];
+    const text: string = this.model.get('text');
+    if (this._observer) {
+      this._observer.disconnect();
+    }
+    this._starts = chunk_starts(text);
+    this._chunk_spans = null;
+    this._dirty.clear();
+    this.el.textContent = '';
+    this._chunks = this._starts.map((start, index) => {
+      const chunk = document.createElement('div');
+      chunk.classList.add('entity-tagger-chunk');
+      chunk.dataset.chunk = String(index);
+      chunk.dataset.offset = String(start);
+      this.el.appendChild(chunk);
+      return chunk;
+    });
+    this._rendered = this._chunks.map(() => false);
+    this._chunks.forEach((chunk, index) => {
+      if (this._observer && this._chunks.length > 1) {
+        this._clear_chunk(index);
+        this._observer.observe(chunk);
+      } else {
+        this._render_chunk(index);
+      }
     });
-    for (let i = entity_spans.length - 1; i >= 0; i--) {
-      const span = entity_spans[i];
-      text = this._format_entity(text, span, i);
+  }
+
+  _on_intersection(entries: IntersectionObserverEntry[]): void {
+    for (const entry of entries) {
+      const index = Number((entry.target as HTMLElement).dataset.chunk);
+      if (entry.isIntersecting && !this._rendered[index]) {
+        this._render_chunk(index);
+      } else if (!entry.isIntersecting && this._rendered[index]) {
+        this._clear_chunk(index);
+      }
+    }
+  }
+
+  _on_spans_change(ranges: [number, number][] | null): void {
+    this._chunk_spans = null;
+    if (ranges === null) {
+      this._chunks.forEach((_, index) => this._dirty.add(index));
+    } else {
+      for (const [start, end] of ranges) {
+        const last = find_chunk(this._starts, Math.max(start, end - 1));
+        for (let i = find_chunk(this._starts, start); i <= last; i++) {
+          this._dirty.add(i);
+        }
+      }
+    }
+    // render at most once per frame, however many changes arrive:
+    if (this._render_request === null) {
+      this._render_request = window.requestAnimationFrame(() => {
+        this._render_request = null;
+        this._render_dirty();
+      });
+    }
+  }
+
+  _render_dirty(): void {
+    for (const index of this._dirty) {
+      // chunks that aren't rendered are up to date once they are:
+      if (this._rendered[index]) {
+        this._render_chunk(index);
+      }
     }
-    this.el.innerHTML = text;
+    this._dirty.clear();
   }
 
-  _format_entity(text: string, span: number[], span_index: number): string {
+  _render_chunk(index: number): void {
+    const text: string = this.model.get('text');
+    const spans = this.model.spans;
+    const start = this._starts[index];
+    const end =
+      index + 1 < this._starts.length ? this._starts[index + 1] : text.length;
+    const parts: string[] = [];
+    let position = start;
+    for (const span_index of this._spans_in_chunk(index)) {
+      const span = spans[span_index];
+      // spans that cross into other chunks are cut at the chunk's edges:
+      const span_start = Math.max(span[0], position);
+      const span_end = Math.min(span[1], end);
+      if (span_end <= span_start) {
+        continue;
+      }
+      parts.push(escape_html(text.slice(position, span_start)));
+      parts.push(
+        this._format_entity(text, span, span_start, span_end, span[1] <= end)
+      );
+      position = span_end;
+    }
+    parts.push(escape_html(text.slice(position, end)));
+    const chunk = this._chunks[index];
+    chunk.innerHTML = parts.join('');
+    chunk.style.height = '';
+    this._rendered[index] = true;
+  }
+
+  _clear_chunk(index: number): void {
+    const chunk = this._chunks[index];
+    const length =
+      (index + 1 < this._starts.length
+        ? this._starts[index + 1]
+        : this.model.get('text').length) - this._starts[index];
+    if (this._rendered[index] && chunk.offsetHeight > 0 && length > 0) {
+      this._height_per_character = chunk.offsetHeight / length;
+      chunk.style.height = `${chunk.offsetHeight}px`;
+    } else {
+      chunk.style.height = `${length * this._height_per_character}px`;
+    }
+    chunk.textContent = '';
+    this._rendered[index] = false;
+  }
+
+  /**
+   * The indices of the spans in a chunk, in the order they appear in.
+   */
+  _spans_in_chunk(index: number): number[] {
+    if (this._chunk_spans === null) {
+      const spans = this.model.spans;
+      const chunk_spans: number[][] = this._starts.map(() => []);
+      spans.forEach((span, span_index) => {
+        const last = find_chunk(this._starts, Math.max(span[0], span[1] - 1));
+        for (let i = find_chunk(this._starts, span[0]); i <= last; i++) {
+          chunk_spans[i].push(span_index);
+        }
+      });
+      for (const indices of chunk_spans) {
+        indices.sort((a, b) => spans[a][0] - spans[b][0]);
+      }
+      this._chunk_spans = chunk_spans;
+    }
+    return this._chunk_spans[index];
+  }
+
+  _format_entity(
+    text: string,
+    span: Span,
+    start: number,
+    end: number,
+    label: boolean
+  ): string {
     const classes = this.model.get('classes');
     const class_idx = classes.indexOf(span[2]);
     const palette = this.model.get('palette');
     // note: can be undefined, defaults to CSS value (grey)
     const colour = palette[class_idx];
-    text =
-      text.slice(0, span[0]) +
-      `<mark class="entity" data-span_index="${span_index}"` +
+    return (
+      `<mark class="entity" data-span_start="${span[0]}"` +
+      ` data-span_end="${span[1]}" data-span_class="${escape_html(span[2])}"` +
       ` style="background:${colour}">` +
-      text.slice(span[0], span[1]) +
-      '<span class="entity-label"> ' +
-      span[2] +
-      '</span>' +
-      '</mark>' +
-      text.slice(span[1], text.length);
-    return text;
+      escape_html(text.slice(start, end)) +
+      (label
+        ? '<span class="entity-label"> ' + escape_html(span[2]) + '</span>'
+        : '') +
+      '</mark>'
+    );
   }
 
   on_click(event: Event): void {
@@ -114,14 +404,20 @@ export class TextTaggerView extends DOMWidgetView {
     if (
       clicked.classList &&
       clicked.classList.contains('entity') &&
-      clicked.dataset.span_index
+      clicked.dataset.span_start
     ) {
       // Remove the clicked-on span:
-      const span_index: number = parseInt(clicked.dataset.span_index);
-      const entity_spans = this.model.get('entity_spans');
-      const new_entity_spans = [...entity_spans];
-      new_entity_spans.splice(span_index, 1);
-      this.model.set('entity_spans', new_entity_spans);
+      const start = Number(clicked.dataset.span_start);
+      const end = Number(clicked.dataset.span_end);
+      const span_index = this.model.spans.findIndex(
+        (span) =>
+          span[0] === start &&
+          span[1] === end &&
+          span[2] === clicked.dataset.span_class
+      );
+      if (span_index >= 0) {
+        this.model.edit_spans([{ op: 'remove', index: span_index }]);
+      }
     }
     // we are only iterested in text events:
     const selection: Selection = window.getSelection() as Selection;
@@ -129,9 +425,6 @@ export class TextTaggerView extends DOMWidgetView {
     if (!selection.isCollapsed) {
       this.on_select();
     }
-    this.model.save_changes();
-    this.touch();
-    this._render_text();
   }
 
   on_select(): void {
@@ -148,18 +441,35 @@ export class TextTaggerView extends DOMWidgetView {
       if (snap_to_word_boundary) {
         snap_to_word(selection);
       }
-      const offset = get_offset_relative_to(this.el);
+      // offsets are counted from the start of the chunk the selection is in:
+      let chunk = selection.getRangeAt(0).startContainer as HTMLElement | null;
+      while (chunk && !(chunk.dataset && chunk.dataset.offset)) {
+        chunk = chunk.parentElement;
+      }
+      if (!chunk) {
+        return;
+      }
+      const offset =
+        Number(chunk.dataset.offset) + get_offset_relative_to(chunk);
       txt = selection.toString();
       // var raw_text = this.model.get('text')
       // append this span as start idx, end idx, class
-      const entity_spans = this.model.get('entity_spans');
-      const new_entity_spans = [...entity_spans];
       const selected_class = this.model.get('selected_class');
-      const span = [offset, offset + txt.length, selected_class];
-      new_entity_spans.push(span);
-      this.model.set('entity_spans', new_entity_spans);
+      const span: Span = [offset, offset + txt.length, selected_class];
+      this.model.edit_spans([
+        { op: 'add', index: this.model.spans.length, span: span },
+      ]);
     }
   }
+
+  private _starts: number[];
+  private _chunks: HTMLElement[];
+  private _rendered: boolean[];
+  private _chunk_spans: number[][] | null;
+  private _dirty: Set<number>;
+  private _render_request: number | null;
+  private _height_per_character: number;
+  private _observer?: IntersectionObserver;
 }
 
 function snap_to_word(selection: NonStandardSelection) {
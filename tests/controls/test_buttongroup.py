@@ -73,3 +73,38 @@ def test_that_enter_exit_for_output_get_called(mocker):
 
     assert mock_enter.call_count == 1
     assert mock_exit.call_count == 1
+
+
+def test_that_changing_options_keeps_existing_buttons():
+    widget = ButtonGroup(["a", "b", "c"])
+    a, b, c = (widget.buttons[option] for option in "abc")
+
+    widget.options = ["c", "a", "d"]
+    assert list(widget.buttons) == ["c", "a", "d"]
+    assert widget.buttons["c"] is c
+    assert widget.buttons["a"] is a
+    assert list(widget.children[:2]) == [c, a]
+    assert b.comm is None
+    assert b.button.comm is None
+
+
+def test_that_button_width_is_shared_and_updated():
+    widget = ButtonGroup(["a", "b"])
+    widget.options = ["a", "b", "c", "d"]
+    assert widget.button_width == "25%"
+    assert all(
+        button.layout.width == "25%" for button in widget.buttons.values()
+    )
+
+    widget = ButtonGroup(["a", "b"], button_width="100px")
+    widget.options = ["a", "b", "c", "d"]
+    assert widget.button_width == "100px"
+
+
+def test_that_appending_options_only_adds_buttons():
+    widget = ButtonGroup(["a", "b"])
+    children = widget.children
+    widget.options = ["a", "b", "c"]
+    assert widget.children[:2] == children
+    assert list(widget.buttons) == ["a", "b", "c"]
+    assert widget.hints is widget.buttons
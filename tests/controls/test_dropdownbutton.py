@@ -17,6 +17,14 @@ def test_that_options_are_set(options):
     assert widget.options == options == list(widget.dropdown.options)
 
 
+def test_that_duplicate_options_are_dropped():
+    widget = DropdownButton(["a", "b", "a"])
+    assert widget.options == ["a", "b"]
+    widget.options = ["a", "b", "c", "b"]
+    assert widget.options == ["a", "b", "c"]
+    assert "c" in widget._options
+
+
 def test_that_on_click_adds_callables_to_execution_list(mocker):
 
     mock_callable = mocker.Mock()
@@ -0,0 +1,32 @@
+import pytest
+
+from ipyannotations.controls.options import OrderedOptions
+
+
+def test_that_options_are_deduplicated_in_order():
+    options = OrderedOptions(["b", "a", "b", "c"])
+    assert list(options) == ["b", "a", "c"]
+    assert len(options) == 3
+    assert "a" in options
+    assert "d" not in options
+    assert options.index("c") == 2
+    with pytest.raises(KeyError):
+        options.index("d")
+
+
+def test_that_appended_options_are_reported():
+    options = OrderedOptions(["a", "b"])
+    assert options.update(["a", "b", "c", "d"]) == ["c", "d"]
+    assert options.index("d") == 3
+    assert options.update(["a", "b", "c", "d"]) == []
+    assert options.update(["a", "b", "a", "c", "d", "e"]) == ["e"]
+
+
+def test_that_other_changes_are_not_reported_as_appended():
+    options = OrderedOptions(["a", "b", "c"])
+    assert options.update(["c", "b", "a"]) is None
+    assert list(options) == ["c", "b", "a"]
+    assert options.index("a") == 2
+    assert options.update(["c", "a"]) is None
+    assert options.update([]) is None
+    assert len(options) == 0
@@ -95,3 +95,16 @@ def test_that_enter_exit_for_output_get_called(mocker):
 
     assert mock_enter.call_count == 1
     assert mock_exit.call_count == 1
+
+
+def test_that_changing_options_keeps_existing_toggles():
+    widget = ToggleButtonGroup(["a", "b", "c"])
+    a, b, c = widget.buttons
+    widget.value = ["a", "b"]
+
+    widget.options = ["c", "a", "d"]
+    assert widget.buttons[:2] == [c, a]
+    assert [button.description for button in widget.buttons] == list("cad")
+    assert widget.value == ["a"]
+    assert b.comm is None
+    assert widget.button_width == "33%"
@@ -0,0 +1,61 @@
+import pytest
+
+from ipyannotations.controls.typeahead import OptionIndex, TypeaheadButton
+
+OPTIONS = ["golden retriever", "labrador retriever", "beagle", "poodle"]
+
+
+def test_that_prefixes_of_words_match():
+    index = OptionIndex(OPTIONS)
+    assert index.search("gol") == ["golden retriever"]
+    assert index.search("RETR") == ["golden retriever", "labrador retriever"]
+    assert index.search("") == OPTIONS
+
+
+def test_that_trigrams_match_typos():
+    index = OptionIndex(OPTIONS)
+    assert index.search("oodle") == ["poodle"]
+    assert index.search("beagel") == ["beagle"]
+    assert index.search("xyz") == []
+
+
+def test_that_frequent_options_rank_first():
+    index = OptionIndex(OPTIONS)
+    index.record_use("labrador retriever")
+    assert index.search("retr")[0] == "labrador retriever"
+    assert index.search("", k=2) == ["labrador retriever", "golden retriever"]
+
+
+def test_that_updates_add_and_remove_options():
+    index = OptionIndex(OPTIONS)
+    index.update(["poodle", "pug"])
+    assert len(index) == 2
+    assert "beagle" not in index
+    assert index.search("p") == ["poodle", "pug"]
+    assert index.search("beag") == []
+    assert index.search("") == ["poodle", "pug"]
+
+
+def test_that_only_the_best_matches_are_displayed():
+    widget = TypeaheadButton([str(i) for i in range(1000)], n_matches=5)
+    assert len(widget.matches.children) == 5
+    widget.search_box.value = "99"
+    assert widget.matches.options == ["99", "990", "991", "992", "993"]
+
+
+def test_that_clicks_and_enter_submit_matches(mocker):
+    widget = TypeaheadButton(OPTIONS)
+    submission_function = mocker.Mock()
+    widget.on_click(submission_function)
+
+    widget.search_box.value = "bea"
+    widget._submit_top_match()
+    assert submission_function.call_args[0][0].description == "beagle"
+    assert widget.search_box.value == ""
+    assert widget.matches.options[0] == "beagle"
+
+    widget.matches.buttons["poodle"].button.click()
+    assert submission_function.call_args[0][0].description == "poodle"
+
+    with pytest.raises(ValueError):
+        widget.on_click("non-callable")
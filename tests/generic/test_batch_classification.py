@@ -0,0 +1,76 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from ipyannotations.generic import BatchClassLabeller
+
+
+def test_that_pages_are_prefilled_and_submitted(mocker):
+    widget = BatchClassLabeller(
+        options=["a", "b", "c"], page_size=4, default_option="b"
+    )
+    submission_function: MagicMock = mocker.MagicMock()
+    widget.on_submit(submission_function)
+
+    widget.display(["x", "y", "z"], predictions=["a", None, "unknown"])
+    assert widget.data == ["a", "b", "b"]
+    assert widget.cells[3].layout.display == "none"
+
+    widget.cells[1].dropdown.value = "c"
+    assert widget.cells[1].layout.border != widget.cells[0].layout.border
+    widget.submit()
+    submission_function.assert_called_once_with(["a", "c", "b"])
+
+    widget.clear()
+    assert widget.data == ["a", "b", "b"]
+
+
+def test_that_the_first_option_is_the_default():
+    widget = BatchClassLabeller(options=["a", "b"], page_size=2)
+    widget.display(["x"])
+    assert widget.data == ["a"]
+    with pytest.raises(ValueError):
+        widget.display(["x", "y", "z"])
+
+
+def test_that_the_default_option_has_to_be_an_option():
+    with pytest.raises(ValueError):
+        BatchClassLabeller(options=["a", "b"], default_option="z")
+
+
+def test_that_preprocessing_happens_in_the_background(mocker):
+    threads = set()
+
+    def preprocess(item):
+        threads.add(threading.get_ident())
+        return item.upper()
+
+    display_function = mocker.Mock()
+    widget = BatchClassLabeller(
+        options=["a"],
+        display_function=display_function,
+        preprocess_function=preprocess,
+    )
+    widget.display(["x", "y"])
+    assert [call[0][0] for call in display_function.call_args_list] == [
+        "X",
+        "Y",
+    ]
+    assert threading.get_ident() not in threads
+
+    page = ["z"]
+    widget.preload(page)
+    preprocess = widget.preprocess_function = mocker.Mock()
+    widget.display(page)
+    preprocess.assert_not_called()
+    display_function.assert_called_with("Z")
+
+
+def test_that_closing_stops_the_background_threads():
+    widget = BatchClassLabeller(options=["a"], preprocess_function=str.upper)
+    widget.display(["x"])
+    executor = widget._executor
+    widget.close()
+    assert widget._executor is None
+    assert executor._shutdown
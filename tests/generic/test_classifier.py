@@ -1,7 +1,7 @@
 import time
 from unittest.mock import MagicMock
 
-from ipyannotations.controls import buttongroup, dropdownbutton
+from ipyannotations.controls import buttongroup, dropdownbutton, typeahead
 from ipyannotations.generic import classification
 from ipyannotations import generic
 
@@ -35,6 +35,36 @@ def test_changing_options_updates_buttons():
     assert len(widget.control_elements.buttons.values()) == 3
 
 
+def test_changing_options_reuses_widgets():
+    widget = classification.ClassLabeller(options=["a", "b"], max_buttons=3)
+    buttons = widget.control_elements
+    children = widget.children
+    widget.options = ["a", "b", "c"]
+    assert widget.control_elements is buttons
+    assert widget.children == children
+    assert widget.control_elements.button_width == "33%"
+
+    widget.options = ["a", "b", "c", "d"]
+    dropdown = widget.control_elements
+    assert isinstance(dropdown, dropdownbutton.DropdownButton)
+    widget.options = ["a", "b"]
+    assert widget.control_elements is buttons
+    assert widget.control_elements.options == ["a", "b"]
+    widget.options = ["a", "b", "c", "d", "e"]
+    assert widget.control_elements is dropdown
+    assert widget.control_elements.dropdown.options == tuple("abcde")
+
+
+def test_reused_widgets_submit_once(mocker):
+    widget = classification.ClassLabeller(options=["a"], max_buttons=1)
+    widget.options = ["a", "b"]
+    widget.options = ["a"]
+    submission_function: MagicMock = mocker.MagicMock()
+    widget.on_submit(submission_function)
+    widget.control_elements.buttons["a"].button.click()
+    submission_function.assert_called_once_with("a")
+
+
 def test_sorting_options():
     widget = classification.ClassLabeller(options=["b", "a"])
     displayed_opts = [
@@ -162,3 +192,23 @@ def test_that_new_buttons_are_removed(mocker):
     assert len(widget.class_selector.buttons) == 2
     assert widget.data == []
     undo_function.assert_called_once()
+
+
+def test_many_options_switch_to_typeahead(mocker):
+    widget = classification.ClassLabeller(
+        options=[str(i) for i in range(20)],
+        max_buttons=5,
+        max_dropdown_options=10,
+    )
+    assert isinstance(widget.control_elements, typeahead.TypeaheadButton)
+    submission_function: MagicMock = mocker.MagicMock()
+    widget.on_submit(submission_function)
+
+    widget.control_elements.search_box.value = "12"
+    widget.control_elements._submit_top_match()
+    submission_function.assert_called_once_with("12")
+
+    widget.freetext_widget.value = "new"
+    widget.submit(widget.freetext_widget)
+    widget.control_elements.search_box.value = "ne"
+    assert widget.control_elements.matches.options == ["new"]
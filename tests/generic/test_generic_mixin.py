@@ -0,0 +1,45 @@
+import ipywidgets as widgets
+
+from ipyannotations.generic import ClassLabeller
+
+
+def test_that_preloaded_items_are_swapped_in(mocker):
+    display_function = mocker.Mock()
+    widget = ClassLabeller(options=["a"], display_function=display_function)
+    first_buffer, second_buffer = widget._display_buffer_box.children
+
+    widget.display("first")
+    display_function.assert_called_once_with("first")
+    assert second_buffer.layout.display is None
+    assert first_buffer.layout.display == "none"
+
+    widget.preload("second")
+    assert display_function.call_count == 2
+    assert first_buffer.layout.display == "none"
+
+    widget.display("second")
+    assert display_function.call_count == 2
+    assert first_buffer.layout.display is None
+    assert second_buffer.layout.display == "none"
+
+
+def test_that_the_display_widget_is_the_visible_output(mocker):
+    widget = ClassLabeller(options=["a"], display_function=mocker.Mock())
+    widget.display("first")
+    visible = widget.display_widget
+    assert isinstance(visible, widgets.Output)
+    assert visible.layout.display is None
+    with widget.display_widget:
+        pass
+    widget.display_widget.clear_output()
+
+
+def test_that_items_that_werent_preloaded_are_rendered(mocker):
+    display_function = mocker.Mock()
+    widget = ClassLabeller(options=["a"], display_function=display_function)
+
+    widget.preload("second")
+    widget.display("third")
+    display_function.assert_called_with("third")
+    widget.display("third")
+    assert display_function.call_count == 3
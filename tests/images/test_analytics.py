@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from hypothesis import example, given, settings, strategies
+
+from ipyannotations.images.canvases.analytics import (
+    bounding_boxes,
+    box_areas,
+    box_iou,
+    points_in_polygon,
+    polygon_areas,
+    rasterize,
+)
+from ipyannotations.images.canvases.shapes import BoundingBox, Polygon
+
+SQUARE = Polygon([(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)], label="a")
+TRIANGLE = Polygon([(0, 0), (10, 0), (10, 10)], label="b")
+
+
+def test_polygon_areas_and_boxes():
+    polygons = [SQUARE, np.empty((0, 2)), TRIANGLE, [(1, 1), (2, 2)]]
+    np.testing.assert_allclose(polygon_areas(polygons), [16, 0, 50, 0])
+    boxes = bounding_boxes(polygons)
+    np.testing.assert_allclose(
+        boxes[[0, 2, 3]], [[0, 0, 4, 4], [0, 0, 10, 10], [1, 1, 2, 2]]
+    )
+    assert np.isnan(boxes[1]).all()
+    assert polygon_areas([]).shape == (0,)
+
+
+def test_box_areas_and_iou():
+    boxes = [BoundingBox((0, 0, 10, 10)), BoundingBox((15, 10, 5, 0))]
+    np.testing.assert_allclose(box_areas(boxes), [100, 100])
+    np.testing.assert_allclose(box_iou(boxes), [[1, 1 / 3], [1 / 3, 1]])
+    iou = box_iou(
+        np.array([[0, 0, 1, 1]]), np.array([[5, 5, 6, 6], [2, 2, 2, 2]])
+    )
+    np.testing.assert_allclose(iou, [[0, 0]])
+
+
+def test_points_in_polygon():
+    inside = points_in_polygon([(1, 2), (5, 1), (2, 3.9), (9, 1)], TRIANGLE)
+    assert inside.tolist() == [False, True, False, True]
+    assert not points_in_polygon([(0, 0)], [(0, 0), (1, 1)]).any()
+
+
+def test_rasterize_boxes_and_polygons():
+    shapes = [SQUARE, BoundingBox((2, 2, 6, 3), label="b")]
+    mask, labels = rasterize(shapes, (8, 6), labels=["b"])
+    assert labels == ["b", "a"]
+    expected = np.zeros((6, 8), dtype=np.uint8)
+    expected[:4, :4] = 2
+    expected[2, 2:6] = 1
+    np.testing.assert_array_equal(mask, expected)
+    empty, _ = rasterize([], (8, 6))
+    assert empty.shape == (6, 8) and not empty.any()
+
+
+@settings(deadline=None, max_examples=25)
+@given(
+    coordinates=strategies.lists(
+        strategies.tuples(
+            strategies.integers(-5, 30), strategies.integers(-5, 30)
+        ),
+        min_size=3,
+        max_size=8,
+    )
+)
+# a pixel centre on an edge:
+@example(coordinates=[(25, 17), (0, 0), (-2, 4)])
+def test_rasterize_matches_point_in_polygon(coordinates):
+    mask, _ = rasterize([Polygon(coordinates, label="a")], (25, 20))
+    rows, columns = np.mgrid[:20, :25]
+    centres = np.stack([columns.ravel() + 0.5, rows.ravel() + 0.5], axis=1)
+    inside = points_in_polygon(centres, coordinates).reshape(20, 25)
+    np.testing.assert_array_equal(mask == 1, inside)
+
+
+def test_too_many_classes():
+    shapes = [BoundingBox((0, 0, 1, 1), label=str(i)) for i in range(256)]
+    with pytest.raises(ValueError):
+        rasterize(shapes, (2, 2))
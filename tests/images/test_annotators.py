@@ -8,7 +8,7 @@ from ipyannotations.images import (
     PolygonAnnotator,
     BoxAnnotator,
 )
-from ipyannotations.images.canvases import shapes
+from ipyannotations.images.canvases import abstract_canvas, shapes
 from ipyannotations.images.annotator import Annotator
 from ipyannotations.images.canvases import (
     PointAnnotationCanvas,
@@ -107,6 +107,17 @@ def test_creating_widgets_setting_and_reading_data(
     assert annotator.canvas.data == [box.data] == annotator.data
 
 
+def test_display_passes_percentile_windows_on():
+    annotator = PointAnnotator()
+    image = np.zeros((50, 70))
+    with patch(
+        "ipyannotations.images.canvases.abstract_canvas.load_img",
+        wraps=abstract_canvas.load_img,
+    ) as load_img:
+        annotator.display(image, percentiles=(1, 99))
+    load_img.assert_called_once_with(image, (1, 99))
+
+
 def test_undo():
 
     mock_queue_callback = MagicMock()
@@ -126,6 +137,21 @@ def test_undo():
     mock_base_callback.assert_called_once()
 
 
+def test_redo_with_shift_backspace():
+    annotator = PointAnnotator()
+    annotator.display(np.zeros((500, 700, 3), dtype=np.uint8))
+    annotator.canvas.on_click(10, 10)
+    # the canvas records its changes in the annotator's history:
+    assert annotator._undo_queue is annotator.canvas._undo_queue
+
+    annotator._handle_keystroke({"type": "keyup", "key": "Backspace"})
+    assert annotator.canvas.points == []
+    annotator._handle_keystroke(
+        {"type": "keyup", "key": "Backspace", "shiftKey": True}
+    )
+    assert annotator.canvas.points[0].coordinates == (10, 10)
+
+
 def test_skip():
     mock_callback_1 = MagicMock()
     mock_callback_2 = MagicMock()
@@ -150,3 +176,20 @@ def test_submit():
         annotator.submit()
         mock_callback_1.assert_called_once_with(mock_data)
         mock_callback_2.assert_called_once_with(mock_data)
+
+
+def test_deleting_selected_shapes():
+    widget = BoxAnnotator(options=["a"])
+    widget.display(np.zeros((500, 700, 3), dtype=np.uint8))
+    widget.data = [{"type": "box", "label": "a", "xyxy": (10, 10, 20, 20)}]
+    widget.edit_button.value = True
+    widget.canvas.on_click(15, 15)
+    widget.canvas.on_release(15, 15)
+    widget._handle_keystroke({"type": "keyup", "key": "Delete"})
+    assert widget.data == []
+    widget.undo()
+    assert len(widget.data) == 1
+    widget.canvas.on_click(15, 15)
+    widget.delete_button.click()
+    assert widget.data == []
+    assert not hasattr(PointAnnotator(), "delete_button")
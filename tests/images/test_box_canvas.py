@@ -122,6 +122,9 @@ def test_dragging_empty_in_edit_mode(
             for corner in box.corners
         )
     )
+    # clicks inside a box select it, and dragging moves the whole box:
+    x0, y0, x1, y1 = canvas.data[0]["xyxy"]
+    assume(not (x0 <= click_coords[0] <= x1 and y0 <= click_coords[1] <= y1))
     canvas.on_click(*click_coords)
     canvas.on_drag(*drag_coords)
     canvas.on_release(*drag_coords)
@@ -153,3 +156,37 @@ def test_dragging_corner_in_edit_mode(box: BoundingBox, drag_coords):
     unittest.TestCase().assertCountEqual(
         canvas.annotations[0].corners, previous_corners
     )
+
+
+def test_overlapping_boxes_are_outlined():
+    canvas = BoundingBoxAnnotationCanvas()
+    canvas.load_image(IMAGE)
+    canvas.data = [
+        {"type": "box", "label": "a", "xyxy": (0, 0, 10, 10)},
+        {"type": "box", "label": "b", "xyxy": (50, 50, 60, 60)},
+        {"type": "box", "label": "a", "xyxy": (1, 1, 10, 10)},
+    ]
+    assert canvas.overlapping_boxes == []
+
+    with patch.object(canvas.annotation_canvas, "stroke_rects") as strokes:
+        canvas.overlap_threshold = 0.5
+    assert canvas.overlapping_boxes == [(0, 2)]
+    # one stroke for each class, and one for the warnings:
+    assert strokes.call_count == 3
+    assert len(strokes.call_args[0][0]) == 2
+
+
+def test_selecting_and_moving_boxes():
+    canvas = BoundingBoxAnnotationCanvas()
+    canvas.load_image(IMAGE)
+    canvas.data = [{"type": "box", "label": "a", "xyxy": (10, 10, 50, 50)}]
+    canvas.editing = True
+    canvas.on_click(30, 30)
+    canvas.on_drag(40, 20)
+    canvas.on_release(40, 20)
+    assert canvas.annotations[0].xyxy == (20, 0, 60, 40)
+    canvas.delete_selected()
+    assert canvas.data == []
+    canvas._undo_queue.pop()()
+    canvas._undo_queue.pop()()
+    assert canvas.annotations[0].xyxy == (10, 10, 50, 50)
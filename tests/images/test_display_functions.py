@@ -1,9 +1,19 @@
+import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import numpy as np
 from PIL import Image
 
-from ipyannotations.images.display import image_display_function
+from ipyannotations.images import display
+from ipyannotations.images.display import (
+    clear_thumbnail_cache,
+    image_display_function,
+    image_thumbnail,
+    precompute_thumbnails,
+    set_thumbnail_cache_size,
+)
 
 TEST_ARRAY = np.random.randint(0, 256, (20, 20, 3), dtype=np.uint8)
 TEST_ARRAY[:5, :] = 0
@@ -49,6 +59,23 @@ def test_image_function_converts_numpy_arrays(mocker):
     assert np.allclose(np.array(img), TEST_ARRAY)
 
 
+def test_image_function_windows_arrays_by_percentiles(mocker):
+    disp_mocker = mocker.patch("IPython.display.display")
+    test_array = np.linspace(0, 1, 400).reshape(20, 20)
+    test_array[0, 0] = 1000
+
+    image_display_function(test_array, fit_into=(20, 20))
+    assert np.array(disp_mocker.call_args[0][0])[10, 10] == 0
+
+    image_display_function(test_array, fit_into=(20, 20), percentiles=(0, 95))
+    img = np.array(disp_mocker.call_args[0][0])
+    assert img[0, 0] == 255
+    assert img[10, 10] > 100
+
+    thumbnail = image_thumbnail(test_array, (20, 20), percentiles=(0, 95))
+    assert np.array_equal(np.array(thumbnail), img)
+
+
 def test_image_function_resizes(mocker):
 
     disp_mocker = mocker.patch("IPython.display.display")
@@ -66,3 +93,91 @@ def test_image_function_resizes(mocker):
         np.array(img.resize((20, 20))),
         np.array(TEST_IMG.resize((40, 40)).resize((20, 20))),
     )
+
+
+def test_image_function_shrinks_large_images(mocker):
+    disp_mocker = mocker.patch("IPython.display.display")
+
+    image_display_function(TEST_IMG.resize((80, 40)), fit_into=(20, 20))
+
+    img = disp_mocker.call_args[0][0]
+    assert img.size == (20, 10)
+
+
+def test_thumbnails_of_files_are_cached(tmp_path, mocker):
+    clear_thumbnail_cache()
+    path = tmp_path / "test-img.jpg"
+    TEST_IMG.resize((200, 200)).save(path)
+    open_spy = mocker.spy(Image, "open")
+
+    thumbnail = image_thumbnail(str(path), fit_into=(50, 50))
+    assert thumbnail.size == (50, 50)
+    assert image_thumbnail(path, fit_into=(50, 50)) is thumbnail
+    assert open_spy.call_count == 1
+
+    assert image_thumbnail(path, fit_into=(20, 20)).size == (20, 20)
+    assert open_spy.call_count == 2
+
+    # changing the file invalidates the thumbnail:
+    TEST_IMG.resize((100, 200)).save(path)
+    os.utime(path, ns=(0, 0))
+    assert image_thumbnail(path, fit_into=(50, 50)).size == (25, 50)
+    assert open_spy.call_count == 3
+    clear_thumbnail_cache()
+
+
+def test_thumbnail_cache_is_limited_in_size(tmp_path):
+    clear_thumbnail_cache()
+    set_thumbnail_cache_size(2 * 20 * 20 * 3)
+    try:
+        paths = [tmp_path / "{}.png".format(i) for i in range(3)]
+        for path in paths:
+            TEST_IMG.save(path)
+            image_thumbnail(path, fit_into=(20, 20))
+        assert len(display._THUMBNAIL_CACHE) == 2
+        assert display._cache_key(paths[0], (20, 20)) not in (
+            display._THUMBNAIL_CACHE
+        )
+    finally:
+        set_thumbnail_cache_size(128 * 1024 * 1024)
+        clear_thumbnail_cache()
+
+
+def test_thumbnail_cache_can_be_used_from_threads(tmp_path):
+    clear_thumbnail_cache()
+    set_thumbnail_cache_size(3 * 10 * 10 * 3)
+    try:
+        paths = [tmp_path / "{}.png".format(i) for i in range(6)]
+        for path in paths:
+            TEST_IMG.save(path)
+        with ThreadPoolExecutor(4) as executor:
+            thumbnails = list(
+                executor.map(
+                    partial(image_thumbnail, fit_into=(10, 10)), paths * 50
+                )
+            )
+        assert all(thumbnail.size == (10, 10) for thumbnail in thumbnails)
+        assert len(display._THUMBNAIL_CACHE) <= 3
+        assert display._THUMBNAIL_CACHE.nbytes == sum(
+            map(
+                display._image_nbytes,
+                display._THUMBNAIL_CACHE._images.values(),
+            )
+        )
+    finally:
+        set_thumbnail_cache_size(128 * 1024 * 1024)
+        clear_thumbnail_cache()
+
+
+def test_thumbnails_can_be_precomputed(tmp_path, mocker):
+    clear_thumbnail_cache()
+    paths = [tmp_path / "{}.png".format(i) for i in range(3)]
+    for path in paths:
+        TEST_IMG.save(path)
+
+    assert precompute_thumbnails(paths, fit_into=(10, 10), max_workers=1) == 3
+    assert precompute_thumbnails(paths, fit_into=(10, 10), max_workers=1) == 0
+    open_spy = mocker.spy(Image, "open")
+    assert image_thumbnail(paths[0], fit_into=(10, 10)).size == (10, 10)
+    open_spy.assert_not_called()
+    clear_thumbnail_cache()
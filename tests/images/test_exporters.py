@@ -0,0 +1,129 @@
+import json
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ipyannotations.images import (
+    AnnotatedImage,
+    Journal,
+    export_coco,
+    export_voc,
+    export_yolo,
+)
+from ipyannotations.images.canvases.mask import mask_to_rle
+
+POLYGON = {
+    "type": "polygon",
+    "label": "a",
+    "points": [(0, 0), (10, 0), (10, 20), (0, 20), (0, 0)],
+}
+BOX = {"type": "box", "label": "b", "xyxy": (30, 40, 10, 20)}
+POINT = {"type": "point", "label": "a", "coordinates": (5, 6)}
+
+
+def _mask_annotation():
+    mask = np.zeros((50, 100), dtype=bool)
+    mask[10:20, 30:35] = True
+    return {"type": "mask", "label": "c", "rle": mask_to_rle(mask)}
+
+
+def test_coco_export(tmp_path):
+    records = [
+        AnnotatedImage("first.png", [POLYGON, BOX], size=(100, 50)),
+        ("second.png", [POINT, _mask_annotation()], (100, 50)),
+    ]
+    path = tmp_path / "coco.json"
+    assert export_coco(records, path, categories=["b"]) == 2
+
+    dataset = json.loads(path.read_text())
+    assert [image["id"] for image in dataset["images"]] == [1, 2]
+    assert dataset["categories"] == [
+        {"id": 1, "name": "b", "supercategory": ""},
+        {"id": 2, "name": "a", "supercategory": ""},
+        {"id": 3, "name": "c", "supercategory": ""},
+    ]
+    polygon, box, point, mask = dataset["annotations"]
+    assert [annotation["id"] for annotation in dataset["annotations"]] == [
+        1,
+        2,
+        3,
+        4,
+    ]
+    assert polygon["segmentation"] == [[0, 0, 10, 0, 10, 20, 0, 20]]
+    assert polygon["area"] == 200
+    assert polygon["bbox"] == [0, 0, 10, 20]
+    assert polygon["category_id"] == 2
+    assert box["bbox"] == [10, 20, 20, 20] and box["area"] == 400
+    assert point["keypoints"] == [5, 6, 2] and point["image_id"] == 2
+    assert mask["iscrowd"] == 1 and mask["area"] == 50
+    assert mask["bbox"] == [30, 10, 5, 10]
+
+
+def test_coco_export_without_annotations(tmp_path):
+    path = tmp_path / "coco.json"
+    assert export_coco([], path) == 0
+    assert json.loads(path.read_text()) == {
+        "images": [],
+        "annotations": [],
+        "categories": [],
+    }
+
+
+def test_coco_export_skips_empty_masks(tmp_path):
+    empty_mask = {
+        "type": "mask",
+        "label": "c",
+        "rle": mask_to_rle(np.zeros((4, 5), dtype=bool)),
+    }
+    path = tmp_path / "coco.json"
+    export_coco([("image.png", [empty_mask, POINT], (5, 4))], path)
+    (point,) = json.loads(path.read_text())["annotations"]
+    assert point["keypoints"] == [5, 6, 2]
+
+
+def test_voc_export(tmp_path):
+    Image.new("RGB", (100, 50)).save(tmp_path / "image.png")
+    records = [(tmp_path / "image.png", [POLYGON, BOX, POINT])]
+    assert export_voc(records, tmp_path / "voc") == 1
+
+    root = ElementTree.parse(tmp_path / "voc" / "image.xml").getroot()
+    assert root.find("size/width").text == "100"
+    objects = root.findall("object")
+    assert [obj.find("name").text for obj in objects] == ["a", "b"]
+    assert [
+        int(objects[1].find("bndbox/" + key).text)
+        for key in ("xmin", "ymin", "xmax", "ymax")
+    ] == [10, 20, 30, 40]
+
+
+def test_yolo_export(tmp_path):
+    records = [AnnotatedImage("image.png", [BOX, POLYGON, POINT], (100, 50))]
+    assert export_yolo(records, tmp_path, categories=["a", "b"]) == 1
+
+    box, polygon = (tmp_path / "image.txt").read_text().splitlines()
+    assert box.split() == ["1", "0.200000", "0.600000", "0.200000", "0.400000"]
+    assert polygon.split()[:3] == ["0", "0.000000", "0.000000"]
+    assert len(polygon.split()) == 9
+    assert (tmp_path / "classes.txt").read_text() == "a\nb\n"
+
+
+def test_image_size_is_needed(tmp_path):
+    with pytest.raises(ValueError):
+        export_voc([("missing.png", [BOX])], tmp_path)
+
+
+def test_journal_round_trip(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    assert list(journal) == []
+    journal.append("first.png", [BOX], size=(100, 50))
+    Image.new("RGB", (10, 10)).save(tmp_path / "second.png")
+    journal.append(tmp_path / "second.png", [])
+    first, second = journal
+    assert first == AnnotatedImage(
+        "first.png", [dict(BOX, xyxy=[30, 40, 10, 20])], (100, 50)
+    )
+    assert second.image == str(tmp_path / "second.png")
+    assert second.size is None
+    assert export_coco(journal, tmp_path / "coco.json") == 2
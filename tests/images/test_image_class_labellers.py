@@ -46,3 +46,15 @@ def test_that_multiclass_doesnt_error_when_displaying(mocker):
     widget = images.MulticlassLabeller(options=["a", "b"])
     widget.display(Image.new("RGB", size=(50, 50), color=(0, 0, 0)))
     widget.display(np.zeros((50, 50)))
+
+
+def test_that_batch_labeller_displays_thumbnails(mocker):
+    display = mocker.patch("IPython.display.display")
+    widget = images.BatchClassLabeller(
+        options=["a", "b"], thumbnail_size=(10, 10)
+    )
+    image = np.random.randint(0, 256, size=(40, 20, 3), dtype=np.uint8)
+    widget.display([image, Image.fromarray(image)])
+    thumbnails = [call[0][0] for call in display.call_args_list]
+    assert [thumbnail.size for thumbnail in thumbnails] == [(5, 10)] * 2
+    assert widget.data == ["a", "a"]
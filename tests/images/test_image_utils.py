@@ -69,6 +69,18 @@ def test_load_img_from_array(image_array):
         assert isinstance(mockImage.call_args[1]["value"], bytes)
 
 
+def test_load_img_windows_arrays_by_percentiles():
+    image_array = np.linspace(0, 1, 2500).reshape(50, 50)
+    image_array[0, 0] = 1000
+
+    def loaded(**kwargs):
+        img = load_img(image_array, **kwargs)
+        return np.array(Image.open(io.BytesIO(img.value)))
+
+    assert loaded()[25, 25] < 5
+    assert loaded(percentiles=(0, 95))[25, 25] > 100
+
+
 def test_load_img_directly(pillow_image):
 
     with patch.object(ipywidgets, "Image") as mockImage:
@@ -150,3 +162,10 @@ def test_trigger_redraw(mocker: MockerFixture):
 
     test_canvas.test_method()
     spy.assert_called_once()
+
+
+def test_url_regex_is_importable():
+    from ipyannotations.images.canvases.image_utils import URL_REGEX
+
+    assert URL_REGEX.match("https://www.example.com/image.png")
+    assert not URL_REGEX.match("/home/user/image.png")
@@ -0,0 +1,144 @@
+import json
+
+import numpy as np
+import pytest
+
+from ipyannotations.images import (
+    BoxAnnotator,
+    PointAnnotator,
+    PolygonAnnotator,
+    import_boxes,
+    import_coco,
+    import_points,
+    import_polygons,
+    import_yolo,
+)
+from ipyannotations.images.canvases import (
+    BoundingBoxAnnotationCanvas,
+    PolygonAnnotationCanvas,
+)
+from ipyannotations.images.canvases.image_utils import load_img
+
+IMAGE = np.random.randint(0, 256, size=(50, 100, 3), dtype=np.uint8)
+
+
+def _canvas(canvas_class):
+    canvas = canvas_class(classes=["a", "b"])
+    canvas.load_image(load_img(IMAGE))
+    return canvas
+
+
+def test_boxes_are_clipped_to_the_image():
+    canvas = _canvas(BoundingBoxAnnotationCanvas)
+    boxes = np.array(
+        [[-10, 5, 20, 60], [30, 40, 10.4, 20.6], [200, 0, 300, 10]]
+    )
+    assert import_boxes(canvas, boxes, ["a", "b", "a"]) == 2
+    assert canvas.data == [
+        {"type": "box", "label": "a", "xyxy": (0, 5, 20, 50)},
+        {"type": "box", "label": "b", "xyxy": (10, 21, 30, 40)},
+    ]
+
+
+def test_box_formats_and_normalized_coordinates():
+    canvas = _canvas(BoundingBoxAnnotationCanvas)
+    import_boxes(canvas, [[0.5, 0.5, 0.2, 0.4]], "a", "cxcywh", True)
+    import_boxes(canvas, [[10, 10, 5, 5]], "b", "xywh", replace=False)
+    assert [box.xyxy for box in canvas.annotations] == [
+        (40, 15, 60, 35),
+        (10, 10, 15, 15),
+    ]
+    canvas._undo_queue.pop()()
+    assert len(canvas.annotations) == 1
+
+
+def test_invalid_coordinates_are_rejected():
+    canvas = _canvas(BoundingBoxAnnotationCanvas)
+    with pytest.raises(ValueError):
+        import_boxes(canvas, [[0, 0, np.nan, 10]])
+    with pytest.raises(ValueError):
+        import_boxes(canvas, [[0, 0, 10]])
+    with pytest.raises(ValueError):
+        import_boxes(canvas, [[0, 0, 10, 10]], ["a", "b"])
+    with pytest.raises(TypeError):
+        import_points(canvas, [[0, 0]])
+    with pytest.raises(ValueError):
+        import_boxes(BoundingBoxAnnotationCanvas(), [[0, 0, 10, 10]])
+
+
+def test_points_and_polygons_are_imported_onto_annotators():
+    widget = PointAnnotator(options=["a"])
+    widget.display(load_img(IMAGE))
+    assert import_points(widget, [[10.6, 5], [120, -3]]) == 2
+    assert [point.coordinates for point in widget.canvas.points] == [
+        (11, 5),
+        (100, 0),
+    ]
+    widget.canvas.current_class = None
+    import_points(widget, [[1, 2]])
+    assert widget.canvas.points[0].label == ""
+
+    widget = PolygonAnnotator(options=["a"])
+    widget.display(load_img(IMAGE))
+    polygons = [[(0, 0), (10, 0), (10, 10)], [(5, 5), (5, 5), (6, 6)]]
+    assert import_polygons(widget, polygons, "a") == 1
+    assert widget.canvas.data == [
+        {
+            "type": "polygon",
+            "label": "a",
+            "points": [(0, 0), (10, 0), (10, 10), (0, 0)],
+        }
+    ]
+
+
+def test_coco_import():
+    dataset = {
+        "images": [{"id": 7, "file_name": "image.png"}],
+        "categories": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+        "annotations": [
+            {
+                "image_id": 7,
+                "category_id": 2,
+                "bbox": [1, 2, 3, 4],
+                "segmentation": [[0, 0, 4, 0, 4, 4]],
+            },
+            {
+                "image_id": 7,
+                "category_id": 1,
+                "bbox": [5, 6, 0, 0],
+                "keypoints": [5, 6, 2, 0, 0, 0],
+            },
+            {"image_id": 8, "category_id": 1, "bbox": [0, 0, 9, 9]},
+        ],
+    }
+    canvas = _canvas(BoundingBoxAnnotationCanvas)
+    assert import_coco(canvas, dataset, "image.png") == 1
+    assert canvas.data == [{"type": "box", "label": "b", "xyxy": (1, 2, 4, 6)}]
+
+    widget = PointAnnotator(options=["a"])
+    widget.display(load_img(IMAGE))
+    assert import_coco(widget, dataset, 7) == 1
+    assert widget.canvas.points[0].coordinates == (5, 6)
+
+    canvas = _canvas(PolygonAnnotationCanvas)
+    assert import_coco(canvas, json.loads(json.dumps(dataset)), 7) == 1
+    assert canvas.polygons[0].label == "b"
+
+
+def test_yolo_import(tmp_path):
+    path = tmp_path / "image.txt"
+    path.write_text("0 0.5 0.5 0.2 0.4\n1 0.1 0.1 0.3 0.1 0.3 0.5\n\n")
+    widget = BoxAnnotator(options=["a", "b"])
+    widget.display(load_img(IMAGE))
+    assert import_yolo(widget, path, ["a", "b"]) == 2
+    assert widget.canvas.data == [
+        {"type": "box", "label": "a", "xyxy": (40, 15, 60, 35)},
+        {"type": "box", "label": "b", "xyxy": (10, 5, 30, 25)},
+    ]
+
+    canvas = _canvas(PolygonAnnotationCanvas)
+    assert import_yolo(canvas, path, ["a", "b"]) == 2
+    assert canvas.polygons[0].points[:2] == [(40, 15), (60, 15)]
+
+    with pytest.raises(ValueError):
+        import_yolo(canvas, path, ["a"])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from ipyannotations.images.interpolation import interpolate
+
+KEY_FRAMES = np.array([[0, 10, 20], [2, 4, np.nan], [5, np.nan, np.nan]])
+KEY_VALUES = np.array(
+    [
+        [[0, 0], [10, 20], [30, 20]],
+        [[0, 0], [4, 4], [0, 0]],
+        [[1, 1], [0, 0], [0, 0]],
+    ],
+    dtype=float,
+)
+
+
+def test_linear_interpolation():
+    values, key_index = interpolate(
+        KEY_FRAMES, KEY_VALUES, np.arange(-1, 22), "linear"
+    )
+    assert values.shape == (3, 23, 2)
+    np.testing.assert_allclose(values[0, 1:12, 0], np.arange(11))
+    np.testing.assert_allclose(values[0, 11:22, 1], 20)
+    assert np.isnan(values[0, [0, 22]]).all()
+    np.testing.assert_allclose(values[1, 3:6, 0], [0, 2, 4])
+    assert np.isnan(values[1, 6:]).all()
+    # a track with a single keyframe is only shown on that frame:
+    assert np.flatnonzero(~np.isnan(values[2, :, 0])).tolist() == [6]
+    assert key_index[0, [0, 1, 11, 22]].tolist() == [-1, 0, 1, 2]
+
+
+def test_spline_passes_through_keyframes_smoothly():
+    frames = np.arange(21)
+    values, _ = interpolate(KEY_FRAMES, KEY_VALUES, frames, "spline")
+    np.testing.assert_allclose(values[0, [0, 10, 20]], KEY_VALUES[0])
+    # unlike linear interpolation, the speed doesn't jump at keyframe 10:
+    speed = np.diff(values[0, :, 0])
+    assert abs(speed[10] - speed[9]) < 0.5
+    np.testing.assert_allclose(values[1, 2:5, 0], [0, 2, 4])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        interpolate(KEY_FRAMES, KEY_VALUES, np.arange(3), "cubic")
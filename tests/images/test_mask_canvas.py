@@ -0,0 +1,116 @@
+import numpy as np
+from hypothesis import given, strategies
+from hypothesis.extra.numpy import arrays
+
+from ipyannotations.images import MaskAnnotator
+from ipyannotations.images.canvases import MaskAnnotationCanvas
+from ipyannotations.images.canvases.mask import mask_to_rle, rle_to_mask
+from ipyannotations.images.canvases.recording import CanvasRecorder
+
+IMAGE = np.random.randint(0, 256, size=(500, 700, 3), dtype=np.uint8)
+
+
+@given(mask=arrays(bool, strategies.tuples(*[strategies.integers(1, 20)] * 2)))
+def test_rle_round_trip(mask):
+    rle = mask_to_rle(mask)
+    assert rle["size"] == list(mask.shape)
+    assert sum(rle["counts"]) == mask.size
+    np.testing.assert_array_equal(rle_to_mask(rle), mask)
+
+
+def test_rle_is_column_major_and_starts_with_background():
+    mask = np.array([[1, 1], [0, 1]], dtype=bool)
+    assert mask_to_rle(mask)["counts"] == [0, 1, 1, 2]
+
+
+def test_painting_and_erasing():
+    canvas = MaskAnnotationCanvas(classes=["a", "b"])
+    canvas.load_image(IMAGE)
+    canvas.current_class = "a"
+    canvas.brush_size = 10
+    canvas.on_click(100, 100)
+    canvas.on_drag(200, 100)
+    canvas.on_release(200, 100)
+    assert canvas.mask[100, 150] == 1
+    assert canvas.mask[100, 250] == 0
+    assert canvas.mask[95:106, 150].all()
+    assert not canvas.mask[110, 150]
+
+    canvas.erasing = True
+    canvas.on_click(150, 100)
+    canvas.on_release(150, 100)
+    assert canvas.mask[100, 150] == 0
+    canvas._undo_queue.pop()()
+    assert canvas.mask[100, 150] == 1
+    canvas._undo_queue.pop()()
+    assert not canvas.mask.any()
+
+
+def test_painting_without_an_image_does_nothing():
+    canvas = MaskAnnotationCanvas(classes=["a"])
+    canvas.current_class = "a"
+    canvas.add_point(10, 10)
+    canvas.on_release(10, 10)
+    canvas.re_draw()
+    assert canvas.mask is None
+    assert canvas.data == []
+
+
+def test_strokes_only_redraw_dirty_tiles():
+    canvas = MaskAnnotationCanvas(classes=["a"])
+    canvas.load_image(IMAGE)
+    canvas.current_class = "a"
+    canvas.on_click(100, 100)
+    with CanvasRecorder(canvas) as recording:
+        canvas.on_drag(110, 100)
+    assert recording.counts()["clear"] == 0
+    assert recording.counts()["clearRect"] == 1
+    assert recording.counts()["putImageData"] == 1
+
+
+def test_data_is_encoded_per_class():
+    canvas = MaskAnnotationCanvas(classes=["a", "b"])
+    canvas.load_image(IMAGE)
+    canvas.current_class = "a"
+    canvas.on_click(100, 100)
+    canvas.on_release(100, 100)
+    canvas.current_class = "b"
+    canvas.on_click(300, 300)
+    canvas.on_release(300, 300)
+
+    data = canvas.data
+    assert [annotation["label"] for annotation in data] == ["a", "b"]
+    assert all(annotation["type"] == "mask" for annotation in data)
+    assert data[0]["rle"]["size"] == [500, 700]
+
+    mask = canvas.mask.copy()
+    canvas.data = []
+    assert not canvas.mask.any()
+    canvas.data = data
+    np.testing.assert_array_equal(canvas.mask, mask)
+
+
+def test_mask_annotator_controls():
+    widget = MaskAnnotator(options=["a"])
+    widget.display(IMAGE)
+    widget.brush_size_slider.value = 20
+    assert widget.canvas.brush_size == 20
+    widget.erase_button.value = True
+    assert widget.canvas.erasing
+    assert widget.data == []
+
+
+def test_redoing_strokes():
+    canvas = MaskAnnotationCanvas(classes=["a"])
+    canvas.load_image(IMAGE)
+    canvas.current_class = "a"
+    canvas.on_click(100, 100)
+    canvas.on_drag(300, 100)
+    canvas.on_release(300, 100)
+    painted = canvas.mask.copy()
+    assert canvas._undo_queue.nbytes > 0
+
+    canvas._undo_queue.undo()
+    assert not canvas.mask.any()
+    canvas._undo_queue.redo()
+    np.testing.assert_array_equal(canvas.mask, painted)
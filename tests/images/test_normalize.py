@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from ipyannotations.images import normalize
+from ipyannotations.images.normalize import to_uint8
+
+
+def test_that_8_bit_data_is_unchanged():
+    image = np.random.randint(0, 256, (10, 10, 3), dtype=np.uint8)
+    assert to_uint8(image) is image
+    small_ints = image.astype(np.int64)
+    assert np.array_equal(to_uint8(small_ints), image)
+
+
+@pytest.mark.parametrize("dtype", [np.uint16, np.int32, np.float64])
+def test_that_values_are_scaled_from_min_to_max(dtype):
+    image = np.linspace(1000, 4000, 60).reshape(6, 10).astype(dtype)
+    result = to_uint8(image)
+    assert result.dtype == np.uint8
+    assert result.shape == image.shape
+    assert result.min() == 0
+    assert result.max() == 255
+    assert np.all(np.diff(result.ravel().astype(int)) >= 0)
+
+
+def test_that_floats_in_unit_range_are_scaled_and_nan_is_zero():
+    image = np.array([[0.0, 0.5, 1.0, np.nan]])
+    assert to_uint8(image).tolist() == [[0, 127, 255, 0]]
+
+
+def test_that_conversion_happens_in_tiles(monkeypatch):
+    monkeypatch.setattr(normalize, "TILE_BYTES", 4 * 10)
+    image = np.arange(600, dtype=np.uint16).reshape(20, 10, 3)
+    expected = (image * (255 / 599)).astype(np.uint8)
+    assert np.array_equal(to_uint8(image), expected)
+
+
+def test_percentile_windows_clip_outliers(monkeypatch):
+    monkeypatch.setattr(normalize, "SAMPLE_SIZE", 100)
+    image = np.linspace(0, 1, 10000).reshape(100, 100)
+    image[0, 0] = 1000
+    result = to_uint8(image, percentiles=(0, 95))
+    assert result[0, 0] == 255
+    assert result[50, 50] > 100
+
+
+def test_per_channel_windows():
+    image = np.stack(
+        [np.linspace(0, 10, 100), np.linspace(0, 1000, 100)], axis=-1
+    ).reshape(10, 10, 2)
+    joint = to_uint8(image)
+    separate = to_uint8(image, per_channel=True)
+    assert joint[..., 0].max() < 5
+    assert separate[..., 0].max() == separate[..., 1].max() == 255
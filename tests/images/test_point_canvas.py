@@ -83,6 +83,8 @@ def test_editing_mode(points: List[Point]):
     # clicking on a point sets drag function:
     point_to_drag = points[0].coordinates
     point_target = (50, 50)
+    # a drag that doesn't move the point isn't recorded:
+    assume(point_to_drag != point_target)
     canvas.on_click(*point_to_drag)
     # check we're in dragging mode:
     assert canvas.dragging is not None
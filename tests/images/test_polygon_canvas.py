@@ -187,6 +187,8 @@ def test_editing_mode(polygon: Polygon, polygons: List[Polygon]):
     # clicking on a point sets drag function:
     point_to_drag = polygon.points[0]
     point_target = (50, 50)
+    # a drag that doesn't move the point isn't recorded:
+    assume(point_to_drag != point_target)
     canvas.on_click(*point_to_drag)
     assert canvas.dragging is not None
 
@@ -254,3 +256,89 @@ def test_undoing():
     callback()
     assert len(canvas.polygons) == 0
     assert canvas.current_polygon.points == coords
+
+
+def test_selecting_moving_and_deleting_polygons():
+    canvas = PolygonAnnotationCanvas()
+    canvas.load_image(IMAGE)
+    square = [(10, 10), (50, 10), (50, 50), (10, 50), (10, 10)]
+    canvas.data = [
+        {"type": "polygon", "label": None, "points": square},
+        {"type": "polygon", "label": None, "points": square[:3] + [(10, 10)]},
+    ]
+    canvas.editing = True
+
+    # the top polygon is the triangle, but it doesn't contain (20, 40):
+    canvas.on_click(20, 40)
+    assert canvas.selected is canvas.polygons[0]
+    canvas.on_drag(25, 45)
+    canvas.on_drag(30, 50)
+    canvas.on_release(30, 50)
+    assert canvas.polygons[0].points[0] == (20, 20)
+    assert len(canvas._undo_queue) == 1
+
+    canvas.on_click(45, 20)
+    assert canvas.selected is canvas.polygons[1]
+    canvas.on_release(45, 20)
+    canvas.delete_selected()
+    assert len(canvas.polygons) == 1 and canvas.selected is None
+
+    canvas._undo_queue.pop()()
+    assert len(canvas.polygons) == 2
+    canvas._undo_queue.pop()()
+    assert canvas.polygons[0].points == square
+
+    canvas.on_click(600, 400)
+    assert canvas.selected is None
+    canvas.editing = False
+    canvas.delete_selected()
+    assert len(canvas.polygons) == 2
+
+
+def test_redoing():
+    canvas = PolygonAnnotationCanvas()
+    canvas.load_image(IMAGE)
+    coords = [(10, 10), (20, 10), (20, 20), (10, 20), (10, 10)]
+    for coord in coords:
+        canvas.on_click(*coord)
+    assert len(canvas.polygons) == 1
+
+    canvas._undo_queue.undo()
+    canvas._undo_queue.undo()
+    assert canvas.polygons == []
+    assert canvas.current_polygon.points == coords[:3]
+
+    canvas._undo_queue.redo()
+    canvas._undo_queue.redo()
+    assert canvas.polygons[0].points == coords
+    assert canvas.current_polygon.points == []
+
+
+def test_a_drag_is_undone_in_one_go():
+    canvas = PolygonAnnotationCanvas()
+    canvas.load_image(IMAGE)
+    points = [(10, 10), (20, 10), (20, 20), (10, 10)]
+    canvas.polygons = [Polygon(list(points))]
+    canvas.editing = True
+
+    # clicking a point without dragging it changes nothing:
+    canvas.on_click(20, 20)
+    canvas.on_release(20, 20)
+    assert len(canvas._undo_queue) == 0
+
+    canvas.on_click(20, 20)
+    for x in range(21, 31):
+        canvas.on_drag(x, x)
+    canvas.on_release(30, 30)
+    assert len(canvas._undo_queue) == 1
+
+    canvas._undo_queue.undo()
+    assert canvas.polygons[0].points == points
+    canvas._undo_queue.redo()
+    assert canvas.polygons[0].points[2] == (30, 30)
+
+    # a second drag is undone separately:
+    canvas.on_click(30, 30)
+    canvas.on_drag(40, 40)
+    canvas.on_release(40, 40)
+    assert len(canvas._undo_queue) == 2
@@ -0,0 +1,92 @@
+import numpy as np
+
+from ipyannotations.images.canvases import (
+    BoundingBoxAnnotationCanvas,
+    PolygonAnnotationCanvas,
+)
+from ipyannotations.images.canvases.recording import CanvasRecorder
+
+IMAGE = np.random.randint(0, 256, size=(500, 700, 3), dtype=np.uint8)
+
+
+def test_recorder_captures_draw_commands():
+    canvas = PolygonAnnotationCanvas(classes=["a"])
+    canvas.load_image(IMAGE)
+    canvas.data = [
+        {
+            "type": "polygon",
+            "label": "a",
+            "points": [(0, 0), (10, 0), (10, 10), (0, 0)],
+        }
+    ]
+
+    with CanvasRecorder(canvas) as recording:
+        canvas.re_draw()
+
+    counts = recording.counts()
+    assert counts["clear"] == 1
+    assert counts["lineTo"] == 3
+    assert counts["set:fill_style"] >= 1
+    assert all(command.layer == 1 for command in recording.commands)
+    assert all(command.nbytes > 0 for command in recording.commands)
+    # hold_canvas batches all commands into one message:
+    assert recording.n_messages == 1
+    assert recording.nbytes > 0
+
+
+def test_recorder_scales_with_annotations():
+    canvas = BoundingBoxAnnotationCanvas(classes=["a", "b"])
+    canvas.load_image(IMAGE)
+
+    with CanvasRecorder(canvas) as recording:
+        canvas.data = [{"type": "box", "label": "a", "xyxy": (0, 0, 5, 5)}]
+    one_box = recording.n_commands, recording.nbytes
+
+    # boxes of one class are drawn in one go, so use both classes:
+    with CanvasRecorder(canvas) as recording:
+        canvas.data = [
+            {"type": "box", "label": label, "xyxy": (0, 0, 5, 5)}
+            for label in ["a", "b"] * 5
+        ]
+    ten_boxes = recording.n_commands, recording.nbytes
+
+    assert ten_boxes[0] > one_box[0]
+    assert ten_boxes[1] > one_box[1]
+
+
+def test_recorder_ignores_other_canvases_and_restores():
+    canvas = PolygonAnnotationCanvas()
+    other_canvas = PolygonAnnotationCanvas()
+    manager = canvas[0]._canvas_manager
+
+    with CanvasRecorder(canvas) as recording:
+        other_canvas.re_draw()
+
+    assert recording.n_commands == 0
+    assert recording.nbytes == 0
+    assert recording.n_messages == 0
+    assert "send_command" not in manager.__dict__
+    assert "_send_custom" not in manager.__dict__
+
+
+def test_recorder_can_be_cleared():
+    canvas = PolygonAnnotationCanvas()
+
+    with CanvasRecorder(canvas) as recording:
+        canvas.re_draw()
+        assert recording.n_commands > 0
+        recording.clear()
+        assert recording.n_commands == 0
+        assert recording.nbytes == 0
+
+
+def test_recorder_only_counts_messages_of_the_canvas():
+    canvas = PolygonAnnotationCanvas()
+    other_canvas = PolygonAnnotationCanvas()
+
+    with CanvasRecorder(canvas) as recording:
+        canvas.re_draw()
+        other_canvas.re_draw()
+        canvas.re_draw()
+
+    assert recording.n_messages == 2
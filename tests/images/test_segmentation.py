@@ -0,0 +1,116 @@
+import io
+
+import ipywidgets as widgets
+import numpy as np
+from PIL import Image
+
+from ipyannotations.images import PolygonAnnotator
+from ipyannotations.images.canvases.segmentation import (
+    SegmentationAssistant,
+    connected_region,
+    grow_region,
+    segment_box,
+    simplify,
+    trace_outline,
+)
+
+HEIGHT, WIDTH = 500, 700
+ROWS, COLUMNS = np.ogrid[:HEIGHT, :WIDTH]
+DISC = (ROWS - 250) ** 2 + (COLUMNS - 350) ** 2 < 100**2
+IMAGE = np.full((HEIGHT, WIDTH, 3), 40, dtype=np.uint8)
+IMAGE[DISC] = (200, 50, 50)
+
+
+def _image_widget(array: np.ndarray) -> widgets.Image:
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, "PNG")
+    return widgets.Image(value=buffer.getvalue())
+
+
+def test_trace_outline_follows_the_boundary_clockwise():
+    mask = np.zeros((6, 6), dtype=bool)
+    mask[1:4, 2:5] = True
+    assert trace_outline(mask) == [
+        (1, 2),
+        (1, 3),
+        (1, 4),
+        (2, 4),
+        (3, 4),
+        (3, 3),
+        (3, 2),
+        (2, 2),
+    ]
+    assert trace_outline(np.zeros((3, 3), dtype=bool)) == []
+
+
+def test_simplify_keeps_corners():
+    mask = np.zeros((10, 10), dtype=bool)
+    mask[2:8, 1:9] = True
+    corners = simplify(trace_outline(mask), 0.5)
+    assert sorted(corners) == [(2, 1), (2, 8), (7, 1), (7, 8)]
+
+
+def test_grow_region_and_segment_box():
+    image = IMAGE / 255
+    np.testing.assert_array_equal(grow_region(image, (250, 350), 0.1), DISC)
+    np.testing.assert_array_equal(
+        segment_box(image, (130, 230, 370, 470)), DISC
+    )
+
+
+def test_connected_region_follows_winding_regions():
+    # a comb, whose teeth are only connected through its spine:
+    mask = np.zeros((9, 9), dtype=bool)
+    mask[0, :] = True
+    mask[:, ::2] = True
+    mask[4, 1] = True
+    region = connected_region(mask, (8, 8))
+    np.testing.assert_array_equal(region, mask)
+
+    # diagonal neighbours aren't connected:
+    mask = np.eye(4, dtype=bool)
+    region = connected_region(mask, (1, 1))
+    assert region.sum() == 1 and region[1, 1]
+    assert not connected_region(mask, (0, 1)).any()
+
+
+def test_assistant_scales_and_caches_outlines():
+    assistant = SegmentationAssistant(_image_widget(IMAGE))
+    assert max(assistant.proxy.shape) == 256
+    outline = assistant.from_click(350, 250)
+    assert outline[0] == outline[-1]
+    # the smaller copy is smoothed, and the outline simplified, so it is
+    # accurate to a few of its pixels:
+    tolerance = 3 * max(assistant.scale)
+    xs, ys = np.array(outline).T
+    assert abs(xs.min() - 250) < tolerance and abs(xs.max() - 450) < tolerance
+    assert abs(ys.min() - 150) < tolerance and abs(ys.max() - 350) < tolerance
+    assert assistant.from_click(351, 251) is outline
+    assert assistant.from_box(240, 140, 460, 360)
+
+
+def test_assisted_polygons(mocker):
+    widget = PolygonAnnotator(options=["a"])
+    widget.display(IMAGE)
+    widget.assist_button.value = True
+    canvas = widget.canvas
+
+    canvas.on_click(350, 250)
+    canvas.on_release(350, 250)
+    assert len(canvas.data) == 1
+    assert canvas.polygons[0].closed
+
+    canvas.on_click(230, 130)
+    canvas.on_drag(470, 370)
+    assert canvas._assist_box == [(230, 130), (470, 370)]
+    canvas.on_release(470, 370)
+    assert len(canvas.data) == 2
+
+    widget.undo()
+    assert len(canvas.data) == 1
+
+    # the segmentation of an image is only prepared once:
+    init = mocker.spy(SegmentationAssistant, "__init__")
+    canvas.on_click(100, 100)
+    canvas.on_release(100, 100)
+    init.assert_not_called()
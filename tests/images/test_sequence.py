@@ -0,0 +1,187 @@
+import io
+
+import numpy as np
+import pytest
+import traitlets
+from PIL import Image
+
+from ipyannotations.images import (
+    BoxSequenceAnnotator,
+    FrameSequence,
+    PointSequenceAnnotator,
+)
+from ipyannotations.images.canvases import PolygonAnnotationCanvas
+from ipyannotations.images.sequence import SequenceAnnotator
+
+FRAMES = np.random.randint(0, 256, size=(10, 50, 70, 3), dtype=np.uint8)
+
+
+def test_frames_are_cached_and_read_ahead():
+    frames = FrameSequence(FRAMES, cache_size=5, read_ahead=2)
+    assert len(frames) == 10
+    first = frames[4]
+    assert all(index in frames for index in (2, 3, 4, 5, 6))
+    assert frames[4] is first
+    assert frames[-6] is first
+    with pytest.raises(IndexError):
+        frames[10]
+    frames.close()
+
+
+def test_least_recently_used_frames_are_dropped():
+    frames = FrameSequence(FRAMES, cache_size=3, read_ahead=0)
+    first = frames[0]
+    frames[1], frames[2], frames[3]
+    assert 0 not in frames
+    assert first.comm is None
+    assert frames[0] is not first
+
+
+def test_cache_needs_space_for_read_ahead():
+    with pytest.raises(ValueError):
+        FrameSequence(FRAMES, cache_size=4, read_ahead=2)
+
+
+def test_multi_frame_image_file(tmp_path):
+    path = tmp_path / "frames.gif"
+    images = [Image.fromarray(frame) for frame in FRAMES[:4]]
+    images[0].save(path, save_all=True, append_images=images[1:])
+    frames = FrameSequence(path, read_ahead=1)
+    assert len(frames) == 4
+    assert Image.open(io.BytesIO(frames[3].value)).size == (70, 50)
+    frames.close()
+
+
+def test_image_paths_are_sent_without_decoding(tmp_path):
+    path = tmp_path / "frame.png"
+    Image.fromarray(FRAMES[0]).save(path)
+    frames = FrameSequence([path, path], read_ahead=0)
+    assert bytes(frames[1].value) == path.read_bytes()
+
+
+def test_frames_can_be_windowed_by_percentiles():
+    stack = np.linspace(0, 1, 2 * 50 * 70).reshape(2, 50, 70)
+    stack[:, 0, 0] = 1000
+    annotator = PointSequenceAnnotator(read_ahead=0)
+    annotator.display(stack, percentiles=(0, 95))
+    frame = Image.open(io.BytesIO(annotator.frames[0].value))
+    assert np.array(frame)[25, 35] > 100
+
+
+def test_annotations_are_kept_per_frame():
+    widget = BoxSequenceAnnotator(options=["a"])
+    widget.display(FRAMES)
+    assert widget.frame_slider.max == 9
+    box = {"type": "box", "label": "a", "xyxy": (1, 2, 3, 4)}
+    widget.canvas.data = [box]
+    widget.step(1)
+    assert widget.frame == 1
+    assert widget.canvas.data == []
+    widget.step(-1)
+    assert widget.canvas.data == [box]
+    assert widget.data == {0: [box]}
+
+
+@pytest.mark.parametrize("interpolation", ["none", "linear"])
+def test_undo_after_changing_frames(interpolation):
+    annotator = PointSequenceAnnotator(
+        options=["a"], interpolation=interpolation
+    )
+    annotator.display(FRAMES)
+    annotator.canvas.current_class = "a"
+    # the frames are shown in the middle of the canvas:
+    annotator.canvas.on_click(330, 240)
+    annotator.canvas.on_click(350, 250)
+    annotator.step(1)
+    shown = annotator.canvas.data
+
+    annotator.undo()
+    assert annotator.canvas.data == shown
+    assert list(annotator.keyframes) == [0]
+
+    annotator.step(-1)
+    assert len(annotator.canvas.data) == 2
+
+
+def test_scrubbing_reuses_frames(mocker):
+    widget = PointSequenceAnnotator(options=["a"])
+    widget.display(FRAMES)
+    shown = widget.canvas.current_image
+    widget.frame = 5
+    load_image = mocker.spy(widget.canvas, "load_image")
+    widget.frame = 0
+    assert load_image.call_args[0][0] is shown
+
+
+def test_arrow_keys_change_frame():
+    widget = PointSequenceAnnotator(options=["a"])
+    widget.display(FRAMES)
+    widget._handle_keystroke({"type": "keyup", "key": "ArrowRight"})
+    widget._handle_keystroke({"type": "keyup", "key": "ArrowRight"})
+    widget._handle_keystroke({"type": "keyup", "key": "ArrowLeft"})
+    assert widget.frame == 1
+    widget._handle_keystroke({"type": "keyup", "key": "ArrowLeft"})
+    widget._handle_keystroke({"type": "keyup", "key": "ArrowLeft"})
+    assert widget.frame == 0
+
+
+def test_setting_data_and_submitting(mocker):
+    widget = PointSequenceAnnotator(options=["a"])
+    widget.display(FRAMES)
+    point = {"type": "point", "label": "a", "coordinates": (5, 5)}
+    widget.data = {3: [point]}
+    assert widget.canvas.data == []
+    widget.frame = 3
+    assert widget.canvas.data == [point]
+    submission_function = mocker.MagicMock()
+    widget.on_submit(submission_function)
+    widget.submit()
+    submission_function.assert_called_once_with({3: [point]})
+
+
+def test_boxes_are_interpolated_between_keyframes():
+    widget = BoxSequenceAnnotator(options=["a", "b"], interpolation="linear")
+    widget.display(FRAMES)
+    widget.canvas.data = [
+        {"type": "box", "label": "a", "xyxy": (0, 0, 10, 10)},
+        {"type": "box", "label": "b", "xyxy": (5, 5, 6, 6)},
+    ]
+    widget.frame = 4
+    # after the last keyframe, it is shown as a starting point:
+    assert len(widget.canvas.data) == 2
+    widget.canvas.data = [
+        {"type": "box", "label": "a", "xyxy": (4, 8, 14, 18)},
+    ]
+    widget.frame = 2
+    assert widget.canvas.data == [
+        {"type": "box", "label": "a", "xyxy": (2, 4, 12, 14)}
+    ]
+    widget.frame = 5
+    assert list(widget.keyframes) == [0, 4]
+
+    data = widget.data
+    assert list(data) == [0, 1, 2, 3, 4]
+    assert data[1] == [{"type": "box", "label": "a", "xyxy": (1, 2, 11, 12)}]
+    # the second box has no shape to move to, so its track ends:
+    assert [box["label"] for box in data[0]] == ["a", "b"]
+
+
+def test_points_are_interpolated_with_splines():
+    widget = PointSequenceAnnotator(options=["a"], interpolation="spline")
+    widget.display(FRAMES)
+    widget.data = {
+        frame: [{"type": "point", "label": "a", "coordinates": (x, 0)}]
+        for frame, x in [(0, 0), (4, 4), (8, 4)]
+    }
+    assert widget.data[4][0]["coordinates"] == (4, 0)
+    assert len(widget.data) == 9
+    widget.interpolation = "none"
+    assert list(widget.data) == [0, 4, 8]
+
+
+def test_generic_annotations_can_not_be_interpolated():
+    class TestSequenceAnnotator(SequenceAnnotator):
+        CanvasClass = PolygonAnnotationCanvas
+
+    with pytest.raises(traitlets.TraitError):
+        TestSequenceAnnotator(interpolation="linear")
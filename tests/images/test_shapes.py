@@ -44,6 +44,13 @@ def test_moving_individual_points(poly: Polygon):
     assert poly.points[0] == (25, 25)
 
 
+@given(poly=infer, dx=strategies.integers(-50, 50))
+def test_translating_polygons(poly: Polygon, dx: int):
+    previous_points = list(poly.points)
+    poly.translate(dx, -dx)
+    assert poly.points == [(x + dx, y - dx) for x, y in previous_points]
+
+
 @given(poly=infer)
 def test_that_adding_point_close_by_closes(poly: Polygon):
 
@@ -107,6 +114,12 @@ def test_point_move(p: Point, q: Point):
     assert p.coordinates == q.coordinates
 
 
+def test_point_translate():
+    p = Point((1, 2))
+    p.translate(3, -4)
+    assert p.coordinates == (4, -2)
+
+
 @given(box=infer, poly=infer)
 def test_point_does_not_accept_other_shapes(box: BoundingBox, poly: Polygon):
     with pytest.raises(ValueError):
@@ -153,3 +166,9 @@ def test_box_does_not_accept_other_shapes(point: Point, poly: Polygon):
         BoundingBox.from_data(point.data)
     with pytest.raises(ValueError):
         BoundingBox.from_data(poly.data)
+
+
+def test_box_translate():
+    box = BoundingBox((10, 20, 0, 5))
+    box.translate(1.4, -5)
+    assert box.xyxy == (11, 15, 1, 0)
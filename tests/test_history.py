@@ -0,0 +1,119 @@
+from ipyannotations.history import UndoHistory
+
+
+def _recorder(history: UndoHistory, state: list):
+    """Record setting a value, so it can be undone and redone."""
+
+    def set_value(value):
+        before = list(state)
+        state.append(value)
+        after = list(state)
+        history.append(
+            lambda: state.__setitem__(slice(None), before),
+            lambda: state.__setitem__(slice(None), after),
+        )
+
+    return set_value
+
+
+def test_undo_and_redo():
+    history, state = UndoHistory(), []
+    set_value = _recorder(history, state)
+    set_value(1)
+    set_value(2)
+
+    assert history.undo()
+    assert state == [1]
+    assert history.undo()
+    assert state == []
+    assert not history.undo()
+
+    assert history.redo()
+    assert history.redo()
+    assert state == [1, 2]
+    assert not history.redo()
+
+
+def test_new_changes_clear_redo():
+    history, state = UndoHistory(), []
+    set_value = _recorder(history, state)
+    set_value(1)
+    history.undo()
+    assert history.can_redo
+    set_value(2)
+    assert not history.can_redo
+    assert not history.redo()
+    assert state == [2]
+
+
+def test_popped_functions_undo_and_allow_redo():
+    history, state = UndoHistory(), []
+    _recorder(history, state)(1)
+    history.pop()()
+    assert state == []
+    assert len(history) == 0
+    history.redo()
+    assert state == [1]
+
+
+def test_changes_without_redo_clear_redo():
+    history, state = UndoHistory(), []
+    history.append(lambda: None)
+    _recorder(history, state)(1)
+    history.undo()
+    assert history.can_redo
+    # later changes can't be redone once one before them can't:
+    history.undo()
+    assert not history.can_redo
+
+
+def test_changes_with_the_same_key_are_merged():
+    history, position = UndoHistory(), [0]
+
+    def move(x):
+        before, after = position[0], x
+        position[0] = x
+        history.append(
+            lambda: position.__setitem__(0, before),
+            lambda: position.__setitem__(0, after),
+            key="drag",
+        )
+
+    for x in range(1, 11):
+        move(x)
+    assert len(history) == 1
+    history.undo()
+    assert position == [0]
+    history.redo()
+    assert position == [10]
+
+    # sealing the history stops changes from being merged:
+    history.seal()
+    move(20)
+    history.seal()
+    move(30)
+    assert len(history) == 3
+
+
+def test_depth_is_limited():
+    history = UndoHistory(max_depth=3)
+    for _ in range(10):
+        history.append(lambda: None)
+    assert len(history) == 3
+
+
+def test_memory_is_limited():
+    history = UndoHistory(max_bytes=100)
+    for _ in range(10):
+        history.append(lambda: None, nbytes=30)
+    assert len(history) == 3
+    assert history.nbytes == 90
+
+    # the last change is always kept:
+    history.append(lambda: None, nbytes=1000)
+    assert len(history) == 1
+    assert history.nbytes == 1000
+
+    history.clear()
+    assert len(history) == 0
+    assert history.nbytes == 0
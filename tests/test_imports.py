@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = {"numpy", "PIL", "ipycanvas", "palettable", "requests"}
+
+
+def imported_modules(statement: str) -> set:
+    """The top-level modules imported by a statement, using -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        name = line.rsplit("|", 1)[1].strip()
+        modules.add(name.split(".")[0])
+    return modules
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import ipyannotations",
+        "import ipyannotations.images",
+        "import ipyannotations.images.canvases",
+        "import ipyannotations.images.canvases.shapes",
+        "import ipyannotations.text",
+        "import ipyannotations.generic",
+    ],
+)
+def test_imports_dont_load_heavy_dependencies(statement):
+    assert not HEAVY_MODULES & imported_modules(statement)
+
+
+def test_heavy_dependencies_are_loaded_on_access():
+    modules = imported_modules(
+        "import ipyannotations.images; ipyannotations.images.BoxAnnotator"
+    )
+    assert {"numpy", "PIL", "ipycanvas"} <= modules
+
+
+def test_lazy_attributes():
+    import ipyannotations.images
+    from ipyannotations.images import annotator, canvases
+    from ipyannotations.images.canvases import polygon
+
+    assert ipyannotations.images.PolygonAnnotator is annotator.PolygonAnnotator
+    assert "PolygonAnnotator" in dir(ipyannotations.images)
+    assert canvases.PolygonAnnotationCanvas is polygon.PolygonAnnotationCanvas
+    with pytest.raises(AttributeError):
+        ipyannotations.images.NotAWidget
@@ -0,0 +1,100 @@
+import ipywidgets as widgets
+import pytest
+
+from ipyannotations import traffic
+from ipyannotations.generic import ClassLabeller
+
+
+def test_monitor_counts_state_updates():
+    button = widgets.Button(description="a")
+
+    with traffic.CommTrafficMonitor() as monitor:
+        button.description = "a much longer description"
+
+    rows = monitor.summary()
+    assert rows == [
+        {
+            "widget": "Button",
+            "trait": "description",
+            "direction": traffic.SENT,
+            "messages": 1,
+            "bytes": len('"a much longer description"'),
+        }
+    ]
+    assert monitor.total(traffic.SENT).messages == 1
+    assert monitor.total(traffic.RECEIVED).messages == 0
+
+
+def test_monitor_counts_new_widgets_and_custom_messages():
+    with traffic.CommTrafficMonitor() as monitor:
+        button = widgets.Button()
+        button.send({"hello": "world"})
+
+    traits = {(row["widget"], row["trait"]) for row in monitor.summary()}
+    assert ("Button", traffic.OPEN) in traits
+    assert ("Button", traffic.CUSTOM) in traits
+
+
+def test_monitor_counts_received_messages():
+    text = widgets.Text()
+
+    with traffic.CommTrafficMonitor() as monitor:
+        text.set_state({"value": "typed"})
+        text._handle_custom_msg({"event": "submit"}, [])
+
+    received = [
+        row for row in monitor.summary() if row["direction"] == "received"
+    ]
+    assert {row["trait"] for row in received} == {"value", traffic.CUSTOM}
+    assert monitor.total(traffic.RECEIVED).messages == 2
+
+
+def test_monitor_can_be_restricted_to_a_widget():
+    widget = ClassLabeller(options=["a", "b"])
+    other_widget = widgets.Button()
+
+    with traffic.CommTrafficMonitor(root=widget) as monitor:
+        other_widget.description = "not counted"
+        widget.options = ["a", "b", "c"]
+
+    other_label = "Button({})".format(other_widget.model_id[:8])
+    counted_widgets = {row["widget"] for row in monitor.summary(by="widget")}
+    assert counted_widgets
+    assert other_label not in counted_widgets
+    assert "ButtonGroup" in monitor.report()
+
+
+def test_monitor_restores_widget_methods():
+    send = widgets.Widget._send
+    with traffic.CommTrafficMonitor():
+        with traffic.CommTrafficMonitor():
+            assert widgets.Widget._send is not send
+        assert widgets.Widget._send is not send
+    assert widgets.Widget._send is send
+
+
+def test_summary_rejects_unknown_grouping():
+    with pytest.raises(ValueError):
+        traffic.CommTrafficMonitor().summary(by="nonsense")
+
+
+def test_monitor_finds_members_again_when_children_change(mocker):
+    button = widgets.Button()
+    box = widgets.VBox([button])
+    new_button = widgets.Button()
+    walk = mocker.spy(traffic, "_walk")
+
+    with traffic.CommTrafficMonitor(root=box) as monitor:
+        for i in range(5):
+            button.description = str(i)
+            new_button.description = str(i)
+        assert walk.call_count == 1
+        box.children = [button, new_button]
+        new_button.description = "counted"
+
+    new_label = "Button({})".format(new_button.model_id[:8])
+    counted = {
+        row["widget"]: row["messages"] for row in monitor.summary(by="widget")
+    }
+    assert counted[new_label] == 1
+    assert walk.call_count == 2
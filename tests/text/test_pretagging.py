@@ -0,0 +1,82 @@
+import re
+
+import pytest
+from hypothesis import given, strategies
+
+from ipyannotations import text
+
+WORDS = strategies.text(alphabet="ab ", min_size=1, max_size=4)
+
+
+@given(
+    terms=strategies.lists(WORDS, max_size=10),
+    document=strategies.text(alphabet="ab ", max_size=40),
+)
+def test_gazetteer_finds_all_occurrences(terms, document):
+    gazetteer = text.Gazetteer((term, term) for term in terms)
+    expected = {
+        (start, start + len(term), term)
+        for term in set(terms)
+        for start in range(len(document))
+        if document.startswith(term, start)
+    }
+    assert sorted(gazetteer.finditer(document)) == sorted(expected)
+
+
+def test_gazetteer_options():
+    gazetteer = text.Gazetteer(
+        [("London", "LOC"), ("london", "PER")], case_sensitive=False
+    )
+    assert len(gazetteer) == 1
+    assert list(gazetteer.finditer("LONDON")) == [(0, 6, "PER")]
+    with pytest.raises(ValueError):
+        gazetteer.add("", "LOC")
+
+
+def test_regex_set():
+    regexes = text.RegexSet(
+        {r"\d+": "NUM", r"(?P<word>[A-Z]\w*)": "NAME", r"x*": "EMPTY"},
+        flags=re.ASCII,
+    )
+    assert list(regexes.finditer("Call 911 Now")) == [
+        (0, 4, "NAME"),
+        (5, 8, "NUM"),
+        (9, 12, "NAME"),
+    ]
+    assert list(text.RegexSet({}).finditer("Call")) == []
+    # groups inside the patterns don't change their classes:
+    nested = text.RegexSet(
+        [(r"(?P<_1>a)(b)", "AB"), (r"((?P<x>c)d)", "CD"), ("e", "E")]
+    )
+    assert list(nested.finditer("ab cd e")) == [
+        (0, 2, "AB"),
+        (3, 5, "CD"),
+        (6, 7, "E"),
+    ]
+
+
+def test_pretagger_keeps_the_first_and_longest_matches():
+    tagger = text.PreTagger(
+        text.Gazetteer({"cat": "ANIMAL", "big cat": "ANIMAL", "at": "MISC"}),
+        text.RegexSet({r"\d+": "NUM"}),
+    )
+    document = "concatenate the big cat 42"
+    assert tagger(document) == [(16, 23, "ANIMAL"), (24, 26, "NUM")]
+    # without word boundaries, matches inside words are kept:
+    tagger.snap_to_word_boundary = False
+    assert tagger(document) == [
+        (3, 6, "ANIMAL"),
+        (8, 10, "MISC"),
+        (16, 23, "ANIMAL"),
+        (24, 26, "NUM"),
+    ]
+    widget = text.TextTagger(overlap="reject")
+    widget.data = tagger(document)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_tagging_a_corpus(processes):
+    tagger = text.PreTagger(text.Gazetteer({"London": "LOC"}))
+    corpus = ["London", "Not here", "From London to London"] * 5
+    spans = text.tag_corpus(corpus, tagger, processes=processes, chunksize=2)
+    assert spans == [tagger(document) for document in corpus]
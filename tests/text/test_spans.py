@@ -0,0 +1,79 @@
+import pytest
+from hypothesis import given, strategies
+
+from ipyannotations.text import SpanStore
+
+SPANS = strategies.lists(
+    strategies.tuples(
+        strategies.integers(0, 50),
+        strategies.integers(1, 20),
+        strategies.sampled_from(["PER", "LOC"]),
+    ).map(lambda span: (span[0], span[0] + span[1], span[2])),
+    max_size=50,
+)
+
+
+def test_spans_are_sorted_and_deduplicated():
+    store = SpanStore([(5, 6, "LOC"), (0, 2, "PER"), (5, 6, "LOC")])
+    assert list(store) == [(0, 2, "PER"), (5, 6, "LOC")]
+    assert len(store) == 2
+    assert (0, 2, "PER") in store
+    store.remove((0, 2, "PER"))
+    assert list(store) == [(5, 6, "LOC")]
+    with pytest.raises(KeyError):
+        store.remove((0, 2, "PER"))
+
+
+@given(spans=SPANS, start=strategies.integers(0, 70), length=SPANS.map(len))
+def test_overlapping_matches_brute_force(spans, start, length):
+    store = SpanStore(spans)
+    end = start + length
+    assert store.overlapping(start, end) == sorted(
+        {span for span in spans if span[0] < end and span[1] > start}
+    )
+    assert store.at(start) == store.overlapping(start, start + 1)
+
+
+@given(old=SPANS, new=SPANS)
+def test_assigning_spans(old, new):
+    store = SpanStore(old)
+    assert store.assign(new) == sorted(set(new))
+    assert store.overlapping(0, 100) == sorted(
+        span for span in set(new) if span[1] > 0
+    )
+
+
+def test_rejecting_overlaps():
+    store = SpanStore([(0, 4, "PER")], overlap="reject")
+    with pytest.raises(ValueError):
+        store.add((2, 6, "LOC"))
+    # touching spans don't overlap:
+    store.add((4, 6, "LOC"))
+
+    # the store is unchanged if any new span overlaps:
+    with pytest.raises(ValueError):
+        store.assign([(0, 4, "PER"), (7, 9, "PER"), (8, 10, "LOC")])
+    assert list(store) == [(0, 4, "PER"), (4, 6, "LOC")]
+    assert store.overlapping(0, 10) == list(store)
+
+
+def test_merging_overlaps():
+    store = SpanStore([(0, 4, "PER"), (6, 8, "PER")], overlap="merge")
+    assert store.add((3, 7, "PER")) == (0, 8, "PER")
+    assert list(store) == [(0, 8, "PER")]
+    with pytest.raises(ValueError):
+        store.add((2, 3, "LOC"))
+
+
+def test_empty_spans_are_rejected():
+    store = SpanStore()
+    with pytest.raises(ValueError):
+        store.add((5, 5, "PER"))
+    with pytest.raises(ValueError):
+        store.add((5, 4, "PER"))
+    assert len(store) == 0
+
+
+def test_unknown_policies_are_rejected():
+    with pytest.raises(ValueError):
+        SpanStore(overlap="ignore")
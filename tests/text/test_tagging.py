@@ -1,4 +1,21 @@
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, strategies
+from traitlets import TraitError
+
 from ipyannotations import text
+from ipyannotations.text.tagging import (
+    TextTaggerCore,
+    apply_span_operations,
+    span_operations,
+)
+
+SPANS = strategies.tuples(
+    strategies.integers(0, 5),
+    strategies.integers(5, 10),
+    strategies.sampled_from(["PER", "LOC"]),
+)
 
 
 def test_displaying_text_clears_data():
@@ -34,3 +51,145 @@ def test_keystroke_handling():
     assert widget.class_selector.value == "MISC"
     widget._handle_keystroke({"type": "keyup", "key": "2"})
     assert widget.class_selector.value == "PER"
+
+
+def test_undo_only_keeps_changed_spans():
+
+    widget = text.TextTagger()
+    widget.display("Start text.")
+    spans = [(i, i + 1, "MISC") for i in range(100)]
+    widget.data = spans
+    widget.data = spans[:50] + [(50, 51, "LOC")] + spans[51:]
+
+    assert widget._undo_queue._undo[-1].nbytes < 1000
+    widget.undo()
+    assert widget.data == spans
+    widget.redo()
+    assert widget.data[50] == (50, 51, "LOC")
+    assert widget.data[:50] + widget.data[51:] == spans[:50] + spans[51:]
+
+
+@given(
+    old=strategies.lists(SPANS, max_size=8),
+    new=strategies.lists(SPANS, max_size=8),
+)
+def test_span_operations_round_trip(old, new):
+    ops = span_operations(old, new)
+    assert apply_span_operations(old, ops) == new
+
+
+def test_span_changes_are_sent_as_operations():
+    widget = TextTaggerCore(text="Some text here.")
+    spans = [(i, i + 1, "MISC") for i in range(100)]
+    widget.entity_spans = spans
+    with patch.object(widget, "send") as send:
+        widget.entity_spans = spans + [(200, 201, "LOC")]
+    message = send.call_args[0][0]
+    assert message["type"] == "spans"
+    assert message["seq"] == widget._spans_seq
+    assert message["ops"] == [
+        {"op": "add", "index": 100, "span": [200, 201, "LOC"]}
+    ]
+
+
+def test_span_changes_from_the_frontend():
+    widget = TextTaggerCore(text="Some text here.")
+    seq = widget._spans_seq
+    with patch.object(widget, "send") as send:
+        widget._handle_custom_msg(
+            {
+                "type": "spans",
+                "seq": seq + 1,
+                "ops": [{"op": "add", "index": 0, "span": [0, 4, "PER"]}],
+            },
+            [],
+        )
+        send.assert_not_called()
+        assert widget.entity_spans == [(0, 4, "PER")]
+        assert widget._spans_seq == seq + 1
+
+        # a change that doesn't follow the last one is rejected:
+        widget._handle_custom_msg(
+            {"type": "spans", "seq": seq + 1, "ops": [{"op": "remove"}]}, []
+        )
+        assert widget.entity_spans == [(0, 4, "PER")]
+        message = send.call_args[0][0]
+        assert message["type"] == "reset"
+        assert message["spans"] == [[0, 4, "PER"]]
+        assert message["seq"] == widget._spans_seq
+
+        # so is an invalid change:
+        widget._handle_custom_msg(
+            {
+                "type": "spans",
+                "seq": widget._spans_seq + 1,
+                "ops": [{"op": "remove", "index": 3}],
+            },
+            [],
+        )
+        assert widget.entity_spans == [(0, 4, "PER")]
+        assert send.call_args[0][0]["type"] == "reset"
+
+
+def test_spans_are_validated():
+    widget = text.TextTagger()
+    widget.data = [[0, 2, "MISC"]]
+    assert widget.data == [(0, 2, "MISC")]
+    with pytest.raises(TraitError):
+        widget.data = [(0, "2", "MISC")]
+    with pytest.raises(TraitError):
+        widget.data = [(0, 2)]
+
+
+def test_spans_are_stored_in_order():
+    widget = text.TextTagger(overlap="reject")
+    widget.data = [(5, 9, "LOC"), (0, 4, "PER"), (0, 4, "PER")]
+    assert widget.data == [(0, 4, "PER"), (5, 9, "LOC")]
+    assert widget.text_widget.entity_spans == widget.data
+    assert widget.spans.at(6) == [(5, 9, "LOC")]
+
+    with pytest.raises(TraitError):
+        widget.data = widget.data + [(3, 6, "MISC")]
+    assert widget.text_widget.entity_spans == widget.data
+    assert list(widget.spans) == widget.data
+
+
+def test_normalized_frontend_changes_are_sent_back():
+    widget = TextTaggerCore(text="Some text here.", overlap="merge")
+    widget.entity_spans = [(0, 4, "PER"), (10, 12, "LOC"), (13, 14, "LOC")]
+    seq = widget._spans_seq
+    with patch.object(widget, "send") as send:
+        widget._handle_custom_msg(
+            {
+                "type": "spans",
+                "seq": seq + 1,
+                "ops": [{"op": "add", "index": 1, "span": [2, 9, "PER"]}],
+            },
+            [],
+        )
+    assert widget.entity_spans == [
+        (0, 9, "PER"),
+        (10, 12, "LOC"),
+        (13, 14, "LOC"),
+    ]
+    # the frontend is sent how its spans were merged:
+    message = send.call_args[0][0]
+    assert message["type"] == "spans"
+    assert message["seq"] == widget._spans_seq == seq + 2
+    frontend_spans = apply_span_operations(
+        [(0, 4, "PER"), (2, 9, "PER"), (10, 12, "LOC"), (13, 14, "LOC")],
+        message["ops"],
+    )
+    assert frontend_spans == widget.entity_spans
+
+
+def test_spans_are_validated_once():
+    widget = text.TextTagger()
+    with patch.object(
+        widget.spans, "assign", wraps=widget.spans.assign
+    ) as assign:
+        widget.data = [(0, 4, "PER")]
+    assert assign.call_count == 1
+    assert widget.data == widget.text_widget.entity_spans == [(0, 4, "PER")]
+    widget.clear()
+    assert widget.data == []
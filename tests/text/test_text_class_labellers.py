@@ -67,3 +67,12 @@ def test_that_sentiment_labeller_handles_keystrokes(mocker):
     submission_function.reset_mock()
     widget._handle_keystroke({"type": "keyup", "key": "Enter"})
     submission_function.assert_not_called()
+
+
+def test_that_batch_labeller_submits_pages_with_enter(mocker):
+    widget = text.BatchClassLabeller(options=["spam", "ham"])
+    widget.display(["hello.", "buy now!"], predictions=["ham", "spam"])
+    submission_function: MagicMock = mocker.MagicMock()
+    widget.on_submit(submission_function)
+    widget._handle_keystroke({"type": "keyup", "key": "Enter"})
+    submission_function.assert_called_once_with(["ham", "spam"])